@@ -5,17 +5,29 @@ AI Product Manager endpoints for intelligent requirement gathering
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-from typing import List, Dict, Any
+from sqlalchemy.orm.exc import StaleDataError
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
+import time
 
-from app.core.database import get_db
+from app.core.concurrency import KeyedLock
+from app.core.config import settings
+from app.core.database import get_db, persist
+from app.core.tracing import traced
+from app.api.serialization import ORMResponseModel, orm_response, to_json
 from app.models.session import RequirementSession, SessionStatus
 from app.models.rsd import RSDDocument
 from app.services.ai_service import ai_service
+from app.services.conversation_summary import fold_turn, summarize_history
+from app.services.job_service import ProgressCallback, job_service
 from pydantic import BaseModel
 
 router = APIRouter()
 
+# Serializes interactions on the same session within this worker;
+# the session version column guards against other workers
+session_locks = KeyedLock()
+
 # Pydantic models
 class InteractionRequest(BaseModel):
     session_id: str
@@ -32,7 +44,7 @@ class InteractionResponse(BaseModel):
 class RSDGenerationRequest(BaseModel):
     session_id: str
 
-class RSDResponse(BaseModel):
+class RSDResponse(ORMResponseModel):
     id: str
     session_id: str
     project_id: str
@@ -41,7 +53,72 @@ class RSDResponse(BaseModel):
     constraints: Dict[str, Any]
     success_criteria: Dict[str, Any]
     completeness_score: float
-    created_at: str
+    created_at: datetime
+
+def _merge_turn(
+    session: RequirementSession,
+    dialogue_entry: Dict[str, Any],
+    intent_analysis: Dict[str, Any]
+) -> Tuple[Dict[str, Any], List[Dict[str, Any]], Dict[str, Any]]:
+    """Fold one interaction into a session's context, dialogue history and summary"""
+    
+    # Update context with new information
+    updated_context = dict(session.context or {})
+    if "extracted_info" in intent_analysis:
+        updated_context.update(intent_analysis["extracted_info"])
+    
+    dialogue_history = list(session.dialogue_history or [])
+    updated_summary = fold_turn(summarize_history(dialogue_history, session.conversation_summary), dialogue_entry)
+    
+    dialogue_history.append(dialogue_entry)
+    
+    return updated_context, dialogue_history, updated_summary
+
+@traced("ai_pm.commit_turn")
+async def _commit_turn(
+    db: AsyncSession,
+    session: RequirementSession,
+    dialogue_entry: Dict[str, Any],
+    intent_analysis: Dict[str, Any]
+) -> float:
+    """
+    Commit one turn with compare-and-swap on the session version
+    
+    If another worker committed a turn first, the session is reloaded and
+    this turn is merged onto the fresh state instead of overwriting it.
+    Returns the completeness score that was stored.
+    """
+    
+    for _ in range(settings.SESSION_COMMIT_RETRIES):
+        updated_context, updated_dialogue_history, updated_summary = _merge_turn(
+            session, dialogue_entry, intent_analysis
+        )
+        
+        # Calculate completeness score (simple heuristic for MVP)
+        completeness_score = min(len(updated_dialogue_history) * 0.1, 1.0)
+        
+        session.context = updated_context
+        session.dialogue_history = updated_dialogue_history
+        session.conversation_summary = updated_summary
+        session.completeness_score = completeness_score
+        
+        try:
+            await db.commit()
+            return completeness_score
+        except StaleDataError:
+            await db.rollback()
+            await db.refresh(session)
+            
+            if session.status != SessionStatus.ACTIVE:
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail="Session is no longer active"
+                )
+    
+    raise HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail="Session was modified concurrently, please retry"
+    )
 
 @router.post("/interact", response_model=InteractionResponse)
 async def interact_with_ai_pm(
@@ -50,6 +127,12 @@ async def interact_with_ai_pm(
 ):
     """Interact with AI Product Manager for requirement gathering"""
     
+    async with session_locks.acquire(request.session_id):
+        return await _interact(request, db)
+
+async def _interact(request: InteractionRequest, db: AsyncSession) -> InteractionResponse:
+    """Process one interaction while holding the session lock"""
+    
     # Get session
     result = await db.execute(select(RequirementSession).where(RequirementSession.id == request.session_id))
     session = result.scalar_one_or_none()
@@ -67,13 +150,11 @@ async def interact_with_ai_pm(
         )
     
     try:
-        # Analyze user intent
-        intent_analysis = await ai_service.analyze_intent(request.message, session.context)
+        # Both LLM calls of the turn share one latency budget
+        deadline = time.monotonic() + settings.AI_INTERACT_DEADLINE
         
-        # Update context with new information
-        updated_context = session.context.copy()
-        if "extracted_info" in intent_analysis:
-            updated_context.update(intent_analysis["extracted_info"])
+        # Analyze user intent
+        intent_analysis = await ai_service.analyze_intent(request.message, session.context, deadline=deadline)
         
         # Add interaction to dialogue history
         dialogue_entry = {
@@ -83,14 +164,17 @@ async def interact_with_ai_pm(
             "metadata": request.metadata
         }
         
-        updated_dialogue_history = session.dialogue_history.copy()
-        updated_dialogue_history.append(dialogue_entry)
+        updated_context, updated_dialogue_history, updated_summary = _merge_turn(
+            session, dialogue_entry, intent_analysis
+        )
         
         # Generate follow-up questions
-        questions = await ai_service.generate_socratic_questions(updated_context, updated_dialogue_history)
+        questions = await ai_service.generate_socratic_questions(
+            updated_context, updated_dialogue_history, updated_summary, deadline=deadline
+        )
         
-        # Calculate completeness score (simple heuristic for MVP)
-        completeness_score = min(len(updated_dialogue_history) * 0.1, 1.0)
+        # Update session in database, merging with concurrent turns
+        completeness_score = await _commit_turn(db, session, dialogue_entry, intent_analysis)
         
         # Generate AI response
         if completeness_score >= 0.8:
@@ -100,13 +184,6 @@ async def interact_with_ai_pm(
             ai_response = f"Thank you for that information! I understand you want to {intent_analysis.get('extracted_info', {}).get('summary', 'build something great')}. Let me ask a few more questions to ensure we capture all your requirements."
             next_steps = ["Continue Dialogue", "Review Progress"]
         
-        # Update session in database
-        session.context = updated_context
-        session.dialogue_history = updated_dialogue_history
-        session.completeness_score = completeness_score
-        
-        await db.commit()
-        
         return InteractionResponse(
             response=ai_response,
             questions=questions,
@@ -115,6 +192,8 @@ async def interact_with_ai_pm(
             session_updated=True
         )
         
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"AI-PM interaction error: {e}")
         raise HTTPException(
@@ -129,6 +208,17 @@ async def generate_rsd(
 ):
     """Generate Requirements Specification Document from session"""
     
+    return orm_response(RSDResponse, await _generate_rsd(request, db))
+
+async def _generate_rsd(
+    request: RSDGenerationRequest,
+    db: AsyncSession,
+    progress: Optional[ProgressCallback] = None
+) -> RSDDocument:
+    """Generate and store the RSD of a sufficiently complete session"""
+    
+    report = progress or (lambda fraction, message: None)
+    
     # Get session
     result = await db.execute(select(RequirementSession).where(RequirementSession.id == request.session_id))
     session = result.scalar_one_or_none()
@@ -147,7 +237,11 @@ async def generate_rsd(
     
     try:
         # Generate RSD using AI
-        rsd_content = await ai_service.generate_rsd(session.context, session.dialogue_history)
+        report(0.0, "Generating RSD document")
+        rsd_content = await ai_service.generate_rsd(
+            session.context, session.dialogue_history, session.conversation_summary,
+            deadline=time.monotonic() + settings.AI_RSD_DEADLINE
+        )
         
         # Create RSD document
         rsd_document = RSDDocument(
@@ -161,27 +255,23 @@ async def generate_rsd(
             validation_results={"generated_by": "ai_pm", "timestamp": datetime.now().isoformat()}
         )
         
-        db.add(rsd_document)
-        
         # Update session status
         session.status = SessionStatus.COMPLETED
         session.completed_at = datetime.now()
         
-        await db.commit()
-        await db.refresh(rsd_document)
-        
-        return RSDResponse(
-            id=rsd_document.id,
-            session_id=rsd_document.session_id,
-            project_id=rsd_document.project_id,
-            functional_requirements=rsd_document.functional_requirements,
-            non_functional_requirements=rsd_document.non_functional_requirements,
-            constraints=rsd_document.constraints,
-            success_criteria=rsd_document.success_criteria,
-            completeness_score=rsd_document.completeness_score,
-            created_at=rsd_document.created_at.isoformat()
-        )
+        report(0.9, "Storing RSD document")
+        await persist(db, rsd_document)
+        
+        return rsd_document
         
+    except HTTPException:
+        raise
+    except StaleDataError:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Session was modified concurrently, please retry"
+        )
     except Exception as e:
         print(f"RSD generation error: {e}")
         raise HTTPException(
@@ -189,6 +279,17 @@ async def generate_rsd(
             detail="Failed to generate RSD document"
         )
 
+async def generate_rsd_job(
+    request: RSDGenerationRequest,
+    db: AsyncSession,
+    progress: ProgressCallback
+) -> Dict[str, Any]:
+    """Job handler for ``ai-pm.generate-rsd``"""
+    
+    return to_json(RSDResponse, await _generate_rsd(request, db, progress))
+
+job_service.register("ai-pm.generate-rsd", RSDGenerationRequest, generate_rsd_job)
+
 @router.get("/session/{session_id}/status")
 async def get_session_status(
     session_id: str,
@@ -212,4 +313,19 @@ async def get_session_status(
         "interaction_count": len(session.dialogue_history),
         "ready_for_rsd": session.completeness_score >= 0.7,
         "last_updated": session.updated_at.isoformat() if session.updated_at else session.created_at.isoformat()
+    }
+
+@router.get("/token-usage")
+async def get_token_usage():
+    """Get prompt budgets, token counts, coalesced calls, latencies and model routing per AI task in this process"""
+    
+    return {
+        "budgets": ai_service.prompt_budgets,
+        "tasks": ai_service.token_usage.snapshot(),
+        "coalescing": {
+            "in_flight": ai_service.single_flight.in_flight(),
+            "tasks": {task: dict(stats) for task, stats in ai_service.single_flight.stats.items()}
+        },
+        "latency": ai_service.latency_report(),
+        "routing": ai_service.router.report()
     }
\ No newline at end of file
@@ -5,14 +5,16 @@ BITCUP Modeling Language endpoints for semantic modeling
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from datetime import datetime
 
-from app.core.database import get_db
+from app.core.database import get_db, persist
+from app.api.serialization import ORMResponseModel, orm_response, to_json
 from app.models.rsd import RSDDocument
-from app.models.bitcup_model import BitcupModel
+from app.models.bitcup_model import BitcupModel, ModelStatus
 from app.services.bitcup_service import bitcup_service
-from pydantic import BaseModel
+from app.services.job_service import ProgressCallback, job_service
+from pydantic import BaseModel, Field
 
 router = APIRouter()
 
@@ -23,14 +25,16 @@ class BitcupGenerationRequest(BaseModel):
 class RSDGenerationRequest(BaseModel):
     bitcup_id: str
 
-class BitcupResponse(BaseModel):
+class BitcupResponse(ORMResponseModel):
     id: str
+    rsd_id: str
     project_id: str
     business_model: Dict[str, Any]
-    implementation_model: Dict[str, Any]
-    created_at: str
+    implementation_model: Optional[Dict[str, Any]] = Field(None, validation_alias="implementation_spec")
+    semantic_hash: Optional[str]
+    created_at: datetime
 
-class RSDResponse(BaseModel):
+class RSDResponse(ORMResponseModel):
     id: str
     session_id: str
     project_id: str
@@ -39,7 +43,7 @@ class RSDResponse(BaseModel):
     constraints: Dict[str, Any]
     success_criteria: Dict[str, Any]
     completeness_score: float
-    created_at: str
+    created_at: datetime
 
 @router.post("/generate-model", response_model=BitcupResponse)
 async def generate_bitcup_model(
@@ -48,6 +52,17 @@ async def generate_bitcup_model(
 ):
     """Generate BITCUP model from RSD document"""
     
+    return orm_response(BitcupResponse, await _generate_model(request, db))
+
+async def _generate_model(
+    request: BitcupGenerationRequest,
+    db: AsyncSession,
+    progress: Optional[ProgressCallback] = None
+) -> BitcupModel:
+    """Generate and store the BITCUP model of an RSD document"""
+    
+    report = progress or (lambda fraction, message: None)
+    
     # Get RSD document
     result = await db.execute(select(RSDDocument).where(RSDDocument.id == request.rsd_id))
     rsd_document = result.scalar_one_or_none()
@@ -67,27 +82,24 @@ async def generate_bitcup_model(
             "success_criteria": rsd_document.success_criteria
         }
         
+        report(0.0, "Analyzing RSD semantics")
         bitcup_model_content = await bitcup_service.generate_bitcup_model(rsd_content)
         
-        # Create BITCUP model in database
+        # Create BITCUP model in database, with its implementation spec
+        report(0.7, "Deriving implementation specification")
         bitcup_model = BitcupModel(
+            rsd_id=rsd_document.id,
             project_id=rsd_document.project_id,
-            business_model=bitcup_model_content,
-            implementation_model=await bitcup_service.transform_to_implementation_spec(bitcup_model_content)
+            status=ModelStatus.READY
         )
+        await bitcup_service.materialize_model(bitcup_model, bitcup_model_content)
         
-        db.add(bitcup_model)
-        await db.commit()
-        await db.refresh(bitcup_model)
+        await persist(db, bitcup_model)
         
-        return BitcupResponse(
-            id=bitcup_model.id,
-            project_id=bitcup_model.project_id,
-            business_model=bitcup_model.business_model,
-            implementation_model=bitcup_model.implementation_model,
-            created_at=bitcup_model.created_at.isoformat()
-        )
+        return bitcup_model
         
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"BITCUP model generation error: {e}")
         raise HTTPException(
@@ -95,6 +107,17 @@ async def generate_bitcup_model(
             detail="Failed to generate BITCUP model"
         )
 
+async def generate_model_job(
+    request: BitcupGenerationRequest,
+    db: AsyncSession,
+    progress: ProgressCallback
+) -> Dict[str, Any]:
+    """Job handler for ``bitcup.generate-model``"""
+    
+    return to_json(BitcupResponse, await _generate_model(request, db, progress))
+
+job_service.register("bitcup.generate-model", BitcupGenerationRequest, generate_model_job)
+
 @router.post("/generate-rsd", response_model=RSDResponse)
 async def generate_rsd_from_bitcup(
     request: RSDGenerationRequest,
@@ -128,21 +151,9 @@ async def generate_rsd_from_bitcup(
             validation_results={"generated_by": "bitcup", "timestamp": datetime.now().isoformat()}
         )
         
-        db.add(rsd_document)
-        await db.commit()
-        await db.refresh(rsd_document)
+        await persist(db, rsd_document)
         
-        return RSDResponse(
-            id=rsd_document.id,
-            session_id=rsd_document.session_id,
-            project_id=rsd_document.project_id,
-            functional_requirements=rsd_document.functional_requirements,
-            non_functional_requirements=rsd_document.non_functional_requirements,
-            constraints=rsd_document.constraints,
-            success_criteria=rsd_document.success_criteria,
-            completeness_score=rsd_document.completeness_score,
-            created_at=rsd_document.created_at.isoformat()
-        )
+        return orm_response(RSDResponse, rsd_document)
         
     except Exception as e:
         print(f"RSD generation error: {e}")
@@ -161,16 +172,7 @@ async def get_project_models(
     result = await db.execute(select(BitcupModel).where(BitcupModel.project_id == project_id))
     models = result.scalars().all()
     
-    return [
-        BitcupResponse(
-            id=model.id,
-            project_id=model.project_id,
-            business_model=model.business_model,
-            implementation_model=model.implementation_model,
-            created_at=model.created_at.isoformat()
-        )
-        for model in models
-    ]
+    return orm_response(BitcupResponse, models)
 
 @router.get("/model/{model_id}", response_model=BitcupResponse)
 async def get_model(
@@ -188,10 +190,4 @@ async def get_model(
             detail="BITCUP model not found"
         )
     
-    return BitcupResponse(
-        id=model.id,
-        project_id=model.project_id,
-        business_model=model.business_model,
-        implementation_model=model.implementation_model,
-        created_at=model.created_at.isoformat()
-    )
\ No newline at end of file
+    return orm_response(BitcupResponse, model)
\ No newline at end of file
@@ -0,0 +1,131 @@
+"""
+Background job endpoints for long-running generations
+"""
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Any, Dict, List, Optional
+from datetime import datetime
+import orjson
+
+from app.core.database import get_db
+from app.api.serialization import ORMResponseModel, orm_response
+from app.models.job import Job, JobStatus
+from app.services.job_service import job_service
+from pydantic import BaseModel, ValidationError
+
+router = APIRouter()
+
+# Pydantic models
+class JobSubmit(BaseModel):
+    kind: str
+    payload: Dict[str, Any] = {}
+
+class JobResponse(ORMResponseModel):
+    id: str
+    kind: str
+    status: JobStatus
+    progress: float
+    message: Optional[str]
+    error: Optional[str]
+    attempts: int
+    created_at: datetime
+    started_at: Optional[datetime]
+    finished_at: Optional[datetime]
+
+async def _get_job(db: AsyncSession, job_id: str) -> Job:
+    job = await db.get(Job, job_id)
+
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found"
+        )
+
+    return job
+
+@router.get("/kinds", response_model=List[str])
+async def get_job_kinds():
+    """List the job kinds that can be submitted"""
+
+    return sorted(job_service.kinds)
+
+@router.post("/", response_model=JobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def submit_job(
+    request: JobSubmit,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Submit a long-running generation
+
+    ``payload`` is the request body of the matching synchronous endpoint.
+    The job is queued and its id returned immediately.
+    """
+
+    if request.kind not in job_service.kinds:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown job kind. Available kinds: {', '.join(sorted(job_service.kinds))}"
+        )
+
+    try:
+        job = await job_service.submit(db, request.kind, request.payload)
+    except ValidationError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=e.errors(include_url=False)
+        )
+
+    return orm_response(JobResponse, job, status_code=status.HTTP_202_ACCEPTED)
+
+@router.get("/{job_id}", response_model=JobResponse)
+async def get_job(
+    job_id: str,
+    db: AsyncSession = Depends(get_db)
+):
+    """Get job status and progress"""
+
+    return orm_response(JobResponse, await _get_job(db, job_id))
+
+@router.get("/{job_id}/result")
+async def get_job_result(
+    job_id: str,
+    db: AsyncSession = Depends(get_db)
+):
+    """Get the response body of a succeeded job"""
+
+    job = await _get_job(db, job_id)
+
+    if job.status == JobStatus.FAILED:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Job failed: {job.error}"
+        )
+
+    if job.status != JobStatus.SUCCEEDED:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Job is {job.status.value}, result not available yet"
+        )
+
+    return await job_service.load_result(db, job)
+
+@router.get("/{job_id}/events")
+async def stream_job_events(
+    job_id: str,
+    db: AsyncSession = Depends(get_db)
+):
+    """Stream job progress as server-sent events until the job finishes"""
+
+    await _get_job(db, job_id)
+
+    async def event_stream():
+        async for event in job_service.events(job_id):
+            yield b"event: " + event["status"].encode() + b"\ndata: " + orjson.dumps(event) + b"\n\n"
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
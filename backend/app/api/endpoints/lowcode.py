@@ -2,17 +2,23 @@
 AI Low-Code Platform endpoints for code generation and deployment
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import ORJSONResponse, PlainTextResponse, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Literal, Optional, Tuple
 from datetime import datetime
 
-from app.core.database import get_db
+from app.core.database import get_db, persist
+from app.api.serialization import ORMResponseModel, json_compatible, orm_response, to_payload
 from app.models.bitcup_model import BitcupModel
 from app.models.lowcode import GeneratedCode, Deployment
+from app.services.artifact_store import LAYER_COLUMNS, artifact_store
+from app.services.bitcup_service import bitcup_service
+from app.services.code_archive import ARCHIVE_MEDIA_TYPES, stream_archive_batches
+from app.services.job_service import ProgressCallback, job_service
 from app.services.lowcode_service import lowcode_service
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 router = APIRouter()
 
@@ -28,7 +34,7 @@ class DeploymentRequest(BaseModel):
     code_id: str
     environment: str = "development"
 
-class CodeResponse(BaseModel):
+class CodeResponse(ORMResponseModel):
     id: str
     bitcup_id: str
     tech_stack: Dict[str, str]
@@ -36,19 +42,37 @@ class CodeResponse(BaseModel):
     backend: Dict[str, Any]
     database: Dict[str, Any]
     deployment: Dict[str, Any]
-    created_at: str
+    rebuild_manifest: Optional[Dict[str, List[str]]] = None
+    created_at: datetime
 
 class PreviewResponse(BaseModel):
     preview_url: str
     screenshots: List[Dict[str, str]]
     expiration: float
 
-class DeploymentResponse(BaseModel):
-    deployment_id: str
+class DeploymentResponse(ORMResponseModel):
+    deployment_id: str = Field(validation_alias="id")
     environment: str
     status: str
     url: str
-    deployed_at: str
+    deployed_at: datetime
+
+def _code_payload(code_record: GeneratedCode, layers: Dict[str, Any]) -> Dict[str, Any]:
+    """Response body of a generation with its materialized layers"""
+    
+    return to_payload(CodeResponse, code_record, **layers)
+
+async def _get_code(db: AsyncSession, code_id: str) -> GeneratedCode:
+    result = await db.execute(select(GeneratedCode).where(GeneratedCode.id == code_id))
+    code_record = result.scalar_one_or_none()
+    
+    if not code_record:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Generated code not found"
+        )
+    
+    return code_record
 
 @router.post("/generate-code", response_model=CodeResponse)
 async def generate_code(
@@ -57,6 +81,23 @@ async def generate_code(
 ):
     """Generate code from BITCUP model"""
     
+    code_record, layers = await _generate_code(request, db)
+    return ORJSONResponse(content=_code_payload(code_record, layers))
+
+async def _generate_code(
+    request: CodeGenerationRequest,
+    db: AsyncSession,
+    progress: Optional[ProgressCallback] = None
+) -> Tuple[GeneratedCode, Dict[str, Any]]:
+    """
+    Generate and store code for a BITCUP model, reporting progress per artifact
+    
+    File bodies go to the artifact store; the row keeps the path -> hash
+    manifest. Returns the row and the generated layers.
+    """
+    
+    report = progress or (lambda fraction, message: None)
+    
     # Get BITCUP model
     result = await db.execute(select(BitcupModel).where(BitcupModel.id == request.bitcup_id))
     bitcup_model = result.scalar_one_or_none()
@@ -68,44 +109,41 @@ async def generate_code(
         )
     
     try:
-        # Generate code using service
-        implementation_model = bitcup_model.implementation_model
+        # Generate code from the spec materialized with the model
+        implementation_model = await bitcup_service.get_implementation_spec(bitcup_model)
         tech_stack = request.tech_stack or {
             "frontend": "vue",
             "backend": "fastapi",
             "database": "postgresql"
         }
         
+        report(0.0, "Generating code")
+        
+        # total is the number of artifacts that have to be rendered; cached ones are not reported
+        def artifact_done(completed: int, total: int, path: str):
+            report(0.95 * completed / total, f"Generated {path} ({completed}/{total})")
+        
         generated_code_content = await lowcode_service.generate_code_from_model(
             implementation_model,
-            tech_stack
+            tech_stack,
+            on_progress=artifact_done
         )
         
         # Store the generated code in the database
+        layers = {layer: generated_code_content[layer] for layer in LAYER_COLUMNS}
         code_record = GeneratedCode(
             bitcup_id=bitcup_model.id,
             tech_stack=tech_stack,
-            frontend_code=generated_code_content["frontend"],
-            backend_code=generated_code_content["backend"],
-            database_code=generated_code_content["database"],
-            deployment_config=generated_code_content["deployment"]
+            file_manifest=await artifact_store.store(db, layers),
+            rebuild_manifest=generated_code_content["metadata"]["manifest"]
         )
         
-        db.add(code_record)
-        await db.commit()
-        await db.refresh(code_record)
+        await persist(db, code_record)
         
-        return {
-            "id": code_record.id,
-            "bitcup_id": code_record.bitcup_id,
-            "tech_stack": code_record.tech_stack,
-            "frontend": code_record.frontend_code,
-            "backend": code_record.backend_code,
-            "database": code_record.database_code,
-            "deployment": code_record.deployment_config,
-            "created_at": code_record.created_at.isoformat()
-        }
+        return code_record, layers
         
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"Code generation error: {e}")
         raise HTTPException(
@@ -113,6 +151,33 @@ async def generate_code(
             detail="Failed to generate code from BITCUP model"
         )
 
+async def generate_code_job(
+    request: CodeGenerationRequest,
+    db: AsyncSession,
+    progress: ProgressCallback
+) -> Dict[str, Any]:
+    """
+    Job handler for ``lowcode.generate-code``
+    
+    File bodies are already in the artifact store, so the job result only
+    references the generation; ``load_code_job_result`` materializes it.
+    """
+    
+    code_record, _ = await _generate_code(request, db, progress)
+    return {"code_id": code_record.id, "file_manifest": code_record.file_manifest}
+
+async def load_code_job_result(result: Dict[str, Any], db: AsyncSession) -> Dict[str, Any]:
+    """Response body of a finished ``lowcode.generate-code`` job"""
+    
+    if "code_id" not in result:
+        # Stored in full by jobs that finished before results were referenced
+        return result
+    
+    code_record = await _get_code(db, result["code_id"])
+    return json_compatible(_code_payload(code_record, await artifact_store.load_layers(db, code_record)))
+
+job_service.register("lowcode.generate-code", CodeGenerationRequest, generate_code_job, load_code_job_result)
+
 @router.post("/preview", response_model=PreviewResponse)
 async def generate_preview(
     request: PreviewRequest,
@@ -132,12 +197,7 @@ async def generate_preview(
             )
         
         # Generate preview
-        code_content = {
-            "frontend": code_record.frontend_code,
-            "backend": code_record.backend_code,
-            "database": code_record.database_code,
-            "deployment": code_record.deployment_config
-        }
+        code_content = await artifact_store.load_layers(db, code_record)
         
         preview = await lowcode_service.generate_preview(code_content)
         
@@ -169,12 +229,7 @@ async def deploy_application(
             )
         
         # Deploy the application
-        code_content = {
-            "frontend": code_record.frontend_code,
-            "backend": code_record.backend_code,
-            "database": code_record.database_code,
-            "deployment": code_record.deployment_config
-        }
+        code_content = await artifact_store.load_layers(db, code_record)
         
         deployment_result = await lowcode_service.deploy_application(code_content, request.environment)
         
@@ -186,17 +241,9 @@ async def deploy_application(
             url=deployment_result["url"]
         )
         
-        db.add(deployment_record)
-        await db.commit()
-        await db.refresh(deployment_record)
+        await persist(db, deployment_record)
         
-        return {
-            "deployment_id": deployment_record.id,
-            "environment": deployment_record.environment,
-            "status": deployment_record.status,
-            "url": deployment_record.url,
-            "deployed_at": deployment_record.deployed_at.isoformat()
-        }
+        return orm_response(DeploymentResponse, deployment_record)
         
     except Exception as e:
         print(f"Deployment error: {e}")
@@ -218,25 +265,46 @@ async def get_generated_code(
 ):
     """Get generated code by ID"""
     
-    result = await db.execute(select(GeneratedCode).where(GeneratedCode.id == code_id))
-    code_record = result.scalar_one_or_none()
+    code_record = await _get_code(db, code_id)
+    layers = await artifact_store.load_layers(db, code_record)
     
-    if not code_record:
+    return ORJSONResponse(content=_code_payload(code_record, layers))
+
+@router.get("/code/{code_id}/files/{path:path}", response_class=PlainTextResponse)
+async def get_generated_file(
+    code_id: str,
+    path: str,
+    db: AsyncSession = Depends(get_db)
+):
+    """Read a single generated file, e.g. ``backend/models/user.py``"""
+    
+    content = await artifact_store.read_file(db, await _get_code(db, code_id), path)
+    
+    if content is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
-            detail="Generated code not found"
+            detail="File not found in generated code"
         )
     
-    return {
-        "id": code_record.id,
-        "bitcup_id": code_record.bitcup_id,
-        "tech_stack": code_record.tech_stack,
-        "frontend": code_record.frontend_code,
-        "backend": code_record.backend_code,
-        "database": code_record.database_code,
-        "deployment": code_record.deployment_config,
-        "created_at": code_record.created_at.isoformat()
-    }
+    return PlainTextResponse(content)
+
+@router.get("/code/{code_id}/archive")
+async def download_code_archive(
+    code_id: str,
+    format: Literal["zip", "tar.gz"] = Query("zip"),
+    db: AsyncSession = Depends(get_db)
+):
+    """Download the generated project as a streamed ZIP or tar.gz archive"""
+    
+    code_record = await _get_code(db, code_id)
+    root = f"generated-{code_record.id}"
+    
+    # File bodies are read in batches and compressed as they are sent
+    return StreamingResponse(
+        stream_archive_batches(artifact_store.iter_project_batches(code_record), format, root),
+        media_type=ARCHIVE_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{root}.{format}"'}
+    )
 
 @router.get("/codes/{bitcup_id}", response_model=List[CodeResponse])
 async def get_codes_by_bitcup(
@@ -247,17 +315,9 @@ async def get_codes_by_bitcup(
     
     result = await db.execute(select(GeneratedCode).where(GeneratedCode.bitcup_id == bitcup_id))
     code_records = result.scalars().all()
+    all_layers = await artifact_store.load_many(db, code_records)
     
-    return [
-        {
-            "id": record.id,
-            "bitcup_id": record.bitcup_id,
-            "tech_stack": record.tech_stack,
-            "frontend": record.frontend_code,
-            "backend": record.backend_code,
-            "database": record.database_code,
-            "deployment": record.deployment_config,
-            "created_at": record.created_at.isoformat()
-        }
-        for record in code_records
-    ]
\ No newline at end of file
+    return ORJSONResponse(content=[
+        _code_payload(code_record, layers)
+        for code_record, layers in zip(code_records, all_layers)
+    ])
\ No newline at end of file
@@ -4,50 +4,50 @@ Project management endpoints
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, insert
 from typing import List
+from datetime import datetime
 import uuid
 
-from app.core.database import get_db
+from app.core.config import settings
+from app.core.database import get_db, persist
+from app.api.serialization import ORMResponseModel, orm_response
 from app.models.project import Project, ProjectStatus
 from app.models.user import User
 from pydantic import BaseModel
 
 router = APIRouter()
 
+# Batch routes use the `/projects:batch` form and are mounted without prefix
+batch_router = APIRouter()
+
 # Pydantic models for request/response
 class ProjectCreate(BaseModel):
     name: str
     description: str = ""
 
-class ProjectResponse(BaseModel):
+class ProjectResponse(ORMResponseModel):
     id: str
     name: str
     description: str
     status: ProjectStatus
     owner_id: str
-    created_at: str
-    updated_at: str
+    created_at: datetime
+    updated_at: datetime
 
-    class Config:
-        from_attributes = True
+class ProjectBatchCreate(BaseModel):
+    projects: List[ProjectCreate]
 
 class ProjectUpdate(BaseModel):
     name: str = None
     description: str = None
     status: ProjectStatus = None
 
-@router.post("/", response_model=ProjectResponse)
-async def create_project(
-    project_data: ProjectCreate,
-    db: AsyncSession = Depends(get_db)
-):
-    """Create a new project"""
+async def get_or_create_demo_user(db: AsyncSession) -> User:
+    """Get the demo owner, flushing it into the current transaction if missing"""
     
     # For MVP, we'll use a default user
     # In production, this would come from authentication
-    
-    # Check if demo user exists
     user_result = await db.execute(select(User).where(User.email == "demo@uplus.ai"))
     user = user_result.scalar_one_or_none()
     
@@ -58,8 +58,19 @@ async def create_project(
             hashed_password="demo_password"
         )
         db.add(user)
-        await db.commit()
-        await db.refresh(user)
+        await db.flush()
+    
+    return user
+
+@router.post("/", response_model=ProjectResponse)
+async def create_project(
+    project_data: ProjectCreate,
+    db: AsyncSession = Depends(get_db)
+):
+    """Create a new project"""
+    
+    # Demo user and project are written in the same transaction
+    user = await get_or_create_demo_user(db)
     
     # Create project
     project = Project(
@@ -69,19 +80,46 @@ async def create_project(
         status=ProjectStatus.DRAFT
     )
     
-    db.add(project)
-    await db.commit()
-    await db.refresh(project)
-    
-    return ProjectResponse(
-        id=project.id,
-        name=project.name,
-        description=project.description,
-        status=project.status,
-        owner_id=project.owner_id,
-        created_at=project.created_at.isoformat(),
-        updated_at=project.updated_at.isoformat() if project.updated_at else project.created_at.isoformat()
+    await persist(db, project)
+    
+    return orm_response(ProjectResponse, project)
+
+@batch_router.post("/projects:batch", response_model=List[ProjectResponse])
+async def create_projects_batch(
+    batch: ProjectBatchCreate,
+    db: AsyncSession = Depends(get_db)
+):
+    """Create many projects in a single transaction"""
+    
+    if len(batch.projects) > settings.BATCH_MAX_SIZE:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Batch exceeds {settings.BATCH_MAX_SIZE} projects"
+        )
+    
+    if not batch.projects:
+        return []
+    
+    user = await get_or_create_demo_user(db)
+    
+    # One multi-row INSERT ... RETURNING; server defaults come back with the rows
+    result = await db.scalars(
+        insert(Project).returning(Project, sort_by_parameter_order=True),
+        [
+            {
+                "name": project_data.name,
+                "description": project_data.description,
+                "owner_id": user.id,
+                "status": ProjectStatus.DRAFT
+            }
+            for project_data in batch.projects
+        ]
     )
+    projects = result.all()
+    
+    await db.commit()
+    
+    return orm_response(ProjectResponse, projects)
 
 @router.get("/", response_model=List[ProjectResponse])
 async def list_projects(
@@ -92,18 +130,7 @@ async def list_projects(
     result = await db.execute(select(Project).order_by(Project.created_at.desc()))
     projects = result.scalars().all()
     
-    return [
-        ProjectResponse(
-            id=project.id,
-            name=project.name,
-            description=project.description,
-            status=project.status,
-            owner_id=project.owner_id,
-            created_at=project.created_at.isoformat(),
-            updated_at=project.updated_at.isoformat() if project.updated_at else project.created_at.isoformat()
-        )
-        for project in projects
-    ]
+    return orm_response(ProjectResponse, projects)
 
 @router.get("/{project_id}", response_model=ProjectResponse)
 async def get_project(
@@ -121,15 +148,7 @@ async def get_project(
             detail="Project not found"
         )
     
-    return ProjectResponse(
-        id=project.id,
-        name=project.name,
-        description=project.description,
-        status=project.status,
-        owner_id=project.owner_id,
-        created_at=project.created_at.isoformat(),
-        updated_at=project.updated_at.isoformat() if project.updated_at else project.created_at.isoformat()
-    )
+    return orm_response(ProjectResponse, project)
 
 @router.put("/{project_id}", response_model=ProjectResponse)
 async def update_project(
@@ -156,18 +175,9 @@ async def update_project(
     if project_data.status is not None:
         project.status = project_data.status
     
-    await db.commit()
-    await db.refresh(project)
-    
-    return ProjectResponse(
-        id=project.id,
-        name=project.name,
-        description=project.description,
-        status=project.status,
-        owner_id=project.owner_id,
-        created_at=project.created_at.isoformat(),
-        updated_at=project.updated_at.isoformat() if project.updated_at else project.created_at.isoformat()
-    )
+    await persist(db)
+    
+    return orm_response(ProjectResponse, project)
 
 @router.delete("/{project_id}")
 async def delete_project(
@@ -4,10 +4,14 @@ Requirement gathering session endpoints
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from typing import List, Dict, Any
+from sqlalchemy import select, insert, update, bindparam
+from sqlalchemy.orm.exc import StaleDataError
+from typing import List, Dict, Any, Optional
+from datetime import datetime
 
-from app.core.database import get_db
+from app.core.config import settings
+from app.core.database import get_db, persist
+from app.api.serialization import ORMResponseModel, orm_response
 from app.models.session import RequirementSession, SessionStatus
 from app.models.project import Project
 from app.models.user import User
@@ -15,11 +19,14 @@ from pydantic import BaseModel
 
 router = APIRouter()
 
+# Batch routes use the `/sessions:batch` form and are mounted without prefix
+batch_router = APIRouter()
+
 # Pydantic models
 class SessionCreate(BaseModel):
     project_id: str
 
-class SessionResponse(BaseModel):
+class SessionResponse(ORMResponseModel):
     id: str
     project_id: str
     user_id: str
@@ -27,17 +34,48 @@ class SessionResponse(BaseModel):
     context: Dict[str, Any]
     dialogue_history: List[Dict[str, Any]]
     completeness_score: float
-    created_at: str
-    updated_at: str
-
-    class Config:
-        from_attributes = True
+    version: int
+    created_at: datetime
+    updated_at: datetime
 
 class SessionUpdate(BaseModel):
     status: SessionStatus = None
     context: Dict[str, Any] = None
     dialogue_history: List[Dict[str, Any]] = None
     completeness_score: float = None
+    version: Optional[int] = None  # Expected version for compare-and-swap updates
+
+class SessionBatchItem(BaseModel):
+    project_id: str
+    status: SessionStatus = SessionStatus.ACTIVE
+    context: Optional[Dict[str, Any]] = None
+    dialogue_history: List[Dict[str, Any]] = []
+    completeness_score: float = 0.0
+
+class SessionBatchCreate(BaseModel):
+    sessions: List[SessionBatchItem]
+
+class InteractionImport(BaseModel):
+    session_id: str
+    user_message: str
+    timestamp: Optional[str] = None
+    intent_analysis: Dict[str, Any] = {}
+    metadata: Dict[str, Any] = {}
+
+class InteractionBatchImport(BaseModel):
+    interactions: List[InteractionImport]
+
+class InteractionBatchResponse(BaseModel):
+    imported: int
+    sessions: Dict[str, int]
+
+def _check_batch_size(size: int, kind: str):
+    """Reject batches larger than the configured limit"""
+    if size > settings.BATCH_MAX_SIZE:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Batch exceeds {settings.BATCH_MAX_SIZE} {kind}"
+        )
 
 @router.post("/", response_model=SessionResponse)
 async def create_session(
@@ -70,22 +108,161 @@ async def create_session(
         completeness_score=0.0
     )
     
-    db.add(session)
+    await persist(db, session)
+    
+    return orm_response(SessionResponse, session)
+
+@batch_router.post("/sessions:batch", response_model=List[SessionResponse])
+async def create_sessions_batch(
+    batch: SessionBatchCreate,
+    db: AsyncSession = Depends(get_db)
+):
+    """Create many requirement gathering sessions in a single transaction"""
+    
+    _check_batch_size(len(batch.sessions), "sessions")
+    
+    if not batch.sessions:
+        return []
+    
+    # Resolve all referenced projects with one query
+    project_ids = {item.project_id for item in batch.sessions}
+    project_result = await db.execute(select(Project).where(Project.id.in_(project_ids)))
+    projects = {project.id: project for project in project_result.scalars().all()}
+    
+    missing = sorted(project_ids - projects.keys())
+    if missing:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Projects not found: {', '.join(missing)}"
+        )
+    
+    rows = []
+    for item in batch.sessions:
+        project = projects[item.project_id]
+        rows.append({
+            "project_id": project.id,
+            "user_id": project.owner_id,
+            "status": item.status,
+            "context": item.context if item.context is not None else {
+                "project_name": project.name,
+                "project_description": project.description,
+                "session_started": True
+            },
+            "dialogue_history": item.dialogue_history,
+            "completeness_score": item.completeness_score
+        })
+    
+    # One multi-row INSERT ... RETURNING; server defaults come back with the rows
+    result = await db.scalars(
+        insert(RequirementSession).returning(RequirementSession, sort_by_parameter_order=True),
+        rows
+    )
+    sessions = result.all()
+    
     await db.commit()
-    await db.refresh(session)
-    
-    return SessionResponse(
-        id=str(session.id),
-        project_id=str(session.project_id),
-        user_id=str(session.user_id),
-        status=session.status,
-        context=session.context,
-        dialogue_history=session.dialogue_history,
-        completeness_score=session.completeness_score,
-        created_at=session.created_at.isoformat(),
-        updated_at=session.updated_at.isoformat() if session.updated_at else session.created_at.isoformat()
+    
+    return orm_response(SessionResponse, sessions)
+
+@router.post("/interactions:batch", response_model=InteractionBatchResponse)
+async def import_interactions_batch(
+    batch: InteractionBatchImport,
+    db: AsyncSession = Depends(get_db)
+):
+    """Append historical interactions to their sessions in a single transaction"""
+    
+    _check_batch_size(len(batch.interactions), "interactions")
+    
+    # Group entries per session, preserving their order
+    entries_by_session: Dict[str, List[Dict[str, Any]]] = {}
+    for interaction in batch.interactions:
+        entries_by_session.setdefault(interaction.session_id, []).append({
+            "timestamp": interaction.timestamp or datetime.now().isoformat(),
+            "user_message": interaction.user_message,
+            "intent_analysis": interaction.intent_analysis,
+            "metadata": {**interaction.metadata, "imported": True}
+        })
+    
+    if not entries_by_session:
+        return InteractionBatchResponse(imported=0, sessions={})
+    
+    result = await db.execute(
+        select(
+            RequirementSession.id,
+            RequirementSession.dialogue_history,
+            RequirementSession.completeness_score,
+            RequirementSession.version
+        ).where(RequirementSession.id.in_(entries_by_session.keys()))
+    )
+    existing = {row.id: row for row in result.all()}
+    
+    missing = sorted(entries_by_session.keys() - existing.keys())
+    if missing:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Sessions not found: {', '.join(missing)}"
+        )
+    
+    params = []
+    for session_id, entries in entries_by_session.items():
+        history = list(existing[session_id].dialogue_history or []) + entries
+        params.append({
+            "session_id": session_id,
+            "expected_version": existing[session_id].version,
+            "dialogue_history": history,
+            # Same heuristic as live AI-PM interactions, never lowering the score
+            "completeness_score": max(
+                existing[session_id].completeness_score or 0.0,
+                min(len(history) * 0.1, 1.0)
+            )
+        })
+    
+    if not await _swap_session_histories(db, params):
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Sessions were modified concurrently, please retry"
+        )
+    
+    await db.commit()
+    
+    return InteractionBatchResponse(
+        imported=len(batch.interactions),
+        sessions={session_id: len(entries) for session_id, entries in entries_by_session.items()}
     )
 
+async def _swap_session_histories(db: AsyncSession, params: List[Dict[str, Any]]) -> bool:
+    """
+    Compare-and-swap the history of each session on its version
+    
+    Uses one executemany UPDATE where the driver reports per-statement
+    row counts; otherwise (asyncpg reports -1) each session is updated
+    with ``RETURNING id`` and the returned ids are checked. Returns
+    whether every session was updated.
+    """
+    
+    sessions_table = RequirementSession.__table__
+    statement = (
+        update(sessions_table)
+        .where(sessions_table.c.id == bindparam("session_id"))
+        .where(sessions_table.c.version == bindparam("expected_version"))
+        .values(
+            dialogue_history=bindparam("dialogue_history"),
+            completeness_score=bindparam("completeness_score"),
+            version=sessions_table.c.version + 1
+        )
+    )
+    
+    if len(params) == 1 or db.bind.dialect.supports_sane_multi_rowcount:
+        result = await db.execute(statement, params)
+        return result.rowcount == len(params)
+    
+    updated = set()
+    for row in params:
+        result = await db.execute(statement.returning(sessions_table.c.id), row)
+        updated.update(result.scalars().all())
+    
+    return updated == {row["session_id"] for row in params}
+
 @router.get("/", response_model=List[SessionResponse])
 async def list_sessions(
     project_id: str = None,
@@ -102,20 +279,7 @@ async def list_sessions(
     result = await db.execute(query)
     sessions = result.scalars().all()
     
-    return [
-        SessionResponse(
-            id=session.id,
-            project_id=session.project_id,
-            user_id=session.user_id,
-            status=session.status,
-            context=session.context,
-            dialogue_history=session.dialogue_history,
-            completeness_score=session.completeness_score,
-            created_at=session.created_at.isoformat(),
-            updated_at=session.updated_at.isoformat() if session.updated_at else session.created_at.isoformat()
-        )
-        for session in sessions
-    ]
+    return orm_response(SessionResponse, sessions)
 
 @router.get("/{session_id}", response_model=SessionResponse)
 async def get_session(
@@ -133,17 +297,7 @@ async def get_session(
             detail="Session not found"
         )
     
-    return SessionResponse(
-        id=str(session.id),
-        project_id=str(session.project_id),
-        user_id=str(session.user_id),
-        status=session.status,
-        context=session.context,
-        dialogue_history=session.dialogue_history,
-        completeness_score=session.completeness_score,
-        created_at=session.created_at.isoformat(),
-        updated_at=session.updated_at.isoformat() if session.updated_at else session.created_at.isoformat()
-    )
+    return orm_response(SessionResponse, session)
 
 @router.put("/{session_id}", response_model=SessionResponse)
 async def update_session(
@@ -162,6 +316,12 @@ async def update_session(
             detail="Session not found"
         )
     
+    if session_data.version is not None and session_data.version != session.version:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Session version is {session.version}, expected {session_data.version}"
+        )
+    
     # Update fields
     if session_data.status is not None:
         session.status = session_data.status
@@ -172,17 +332,13 @@ async def update_session(
     if session_data.completeness_score is not None:
         session.completeness_score = session_data.completeness_score
     
-    await db.commit()
-    await db.refresh(session)
-    
-    return SessionResponse(
-        id=str(session.id),
-        project_id=str(session.project_id),
-        user_id=str(session.user_id),
-        status=session.status,
-        context=session.context,
-        dialogue_history=session.dialogue_history,
-        completeness_score=session.completeness_score,
-        created_at=session.created_at.isoformat(),
-        updated_at=session.updated_at.isoformat() if session.updated_at else session.created_at.isoformat()
-    )
\ No newline at end of file
+    try:
+        await persist(db)
+    except StaleDataError:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Session was modified concurrently, please retry"
+        )
+    
+    return orm_response(SessionResponse, session)
\ No newline at end of file
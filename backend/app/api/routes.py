@@ -3,7 +3,7 @@ Main API router for 一键升级-uplus platform
 """
 
 from fastapi import APIRouter
-from app.api.endpoints import projects, sessions, ai_pm, bitcup, lowcode
+from app.api.endpoints import projects, sessions, ai_pm, bitcup, lowcode, jobs
 
 # Create main API router
 api_router = APIRouter()
@@ -13,4 +13,9 @@ api_router.include_router(projects.router, prefix="/projects", tags=["projects"]
 api_router.include_router(sessions.router, prefix="/sessions", tags=["sessions"])
 api_router.include_router(ai_pm.router, prefix="/ai-pm", tags=["ai-pm"])
 api_router.include_router(bitcup.router, prefix="/bitcup", tags=["bitcup"])
-api_router.include_router(lowcode.router, prefix="/lowcode", tags=["lowcode"])
\ No newline at end of file
+api_router.include_router(lowcode.router, prefix="/lowcode", tags=["lowcode"])
+api_router.include_router(jobs.router, prefix="/jobs", tags=["jobs"])
+
+# Batch endpoints (`/projects:batch`, `/sessions:batch`)
+api_router.include_router(projects.batch_router, tags=["projects"])
+api_router.include_router(sessions.batch_router, tags=["sessions"])
\ No newline at end of file
@@ -0,0 +1,83 @@
+"""
+Shared response mapping for API endpoints
+
+Endpoints return ORM rows through ``orm_response``. The payload is built
+straight from model attributes and rendered with orjson; returning a
+``Response`` also stops FastAPI from validating the output a second time
+against ``response_model``, which only documents the shape.
+"""
+
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Tuple, Type, Union
+
+from fastapi import status
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, ConfigDict
+import orjson
+
+# Fields that fall back to another field when the row has no value yet
+FIELD_FALLBACKS = {"updated_at": "created_at"}
+
+_MISSING = object()
+
+class ORMResponseModel(BaseModel):
+    """Base class for response models built from ORM rows"""
+
+    model_config = ConfigDict(from_attributes=True, populate_by_name=True)
+
+@lru_cache(maxsize=None)
+def _field_map(schema: Type[BaseModel]) -> Tuple[Tuple[str, str], ...]:
+    """Precompute (response field, ORM attribute) pairs for a schema"""
+    pairs = []
+    for name, field in schema.model_fields.items():
+        attribute = field.validation_alias if isinstance(field.validation_alias, str) else name
+        pairs.append((name, attribute))
+    return tuple(pairs)
+
+def to_payload(schema: Type[BaseModel], obj: Any, **values: Any) -> Dict[str, Any]:
+    """
+    Map a trusted ORM object onto a plain dict following ``schema``
+
+    Fields passed in ``values`` are taken from there, e.g. content that is
+    not stored on the row. Any other field the object lacks raises
+    ``AttributeError`` instead of silently rendering as null.
+    """
+    payload = {}
+    for name, attribute in _field_map(schema):
+        if name in values:
+            payload[name] = values[name]
+            continue
+
+        value = getattr(obj, attribute, _MISSING)
+        if value is _MISSING:
+            raise AttributeError(
+                f"{type(obj).__name__} has no attribute {attribute!r} for {schema.__name__}.{name}"
+            )
+        payload[name] = value
+
+    for field, fallback in FIELD_FALLBACKS.items():
+        if field in payload and payload[field] is None:
+            payload[field] = payload.get(fallback)
+
+    return payload
+
+def json_compatible(content: Any) -> Any:
+    """Reduce a payload to plain JSON types, for storing in JSON columns"""
+    return orjson.loads(orjson.dumps(content))
+
+def to_json(schema: Type[BaseModel], obj: Any) -> Dict[str, Any]:
+    """Like ``to_payload`` but reduced to JSON types"""
+    return json_compatible(to_payload(schema, obj))
+
+def orm_response(
+    schema: Type[BaseModel],
+    data: Union[Any, Iterable[Any]],
+    status_code: int = status.HTTP_200_OK
+) -> ORJSONResponse:
+    """Render one ORM object or a list of them as an orjson response"""
+    if isinstance(data, (list, tuple)):
+        content = [to_payload(schema, item) for item in data]
+    else:
+        content = to_payload(schema, data)
+
+    return ORJSONResponse(content=content, status_code=status_code)
@@ -0,0 +1,191 @@
+"""
+Concurrency primitives shared across the 一键升级-uplus platform
+"""
+
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Awaitable, Callable, Dict, Hashable, List, Optional, TypeVar
+import asyncio
+import math
+
+T = TypeVar("T")
+
+class KeyedLock:
+    """
+    Per-key asyncio locks for serializing work on one resource
+
+    Locks are created on first use and dropped once no task holds or
+    waits on them, so the registry only grows with in-flight keys.
+    """
+
+    def __init__(self):
+        self._locks: Dict[Hashable, asyncio.Lock] = {}
+        self._waiters: Dict[Hashable, int] = {}
+
+    @asynccontextmanager
+    async def acquire(self, key: Hashable):
+        """Hold the lock for ``key`` for the duration of the block"""
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        self._waiters[key] = self._waiters.get(key, 0) + 1
+
+        try:
+            async with lock:
+                yield
+        finally:
+            self._waiters[key] -= 1
+            if self._waiters[key] == 0:
+                del self._waiters[key]
+                del self._locks[key]
+
+    def locked(self, key: Hashable) -> bool:
+        """Check whether ``key`` is currently held"""
+        lock = self._locks.get(key)
+        return lock is not None and lock.locked()
+
+class GenerationScheduler:
+    """
+    Bounded fan-out for independent generation tasks
+
+    At most ``max_concurrency`` tasks run at once; callers gather the
+    ``run`` coroutines to get results back in submission order. The
+    optional ``on_progress(completed, total, key)`` callback fires as each
+    task finishes, against the ``total`` number of tasks the caller is
+    about to run.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int,
+        total: int,
+        on_progress: Optional[Callable[[int, int, str], None]] = None
+    ):
+        self._semaphore = asyncio.Semaphore(max(1, max_concurrency))
+        self._on_progress = on_progress
+        self.total = total
+        self.completed = 0
+
+    async def run(self, key: str, task: Callable[[], Awaitable[T]]) -> T:
+        """Run one task once a slot is free"""
+        async with self._semaphore:
+            result = await task()
+
+        self.completed += 1
+        if self._on_progress is not None:
+            self._on_progress(self.completed, self.total, key)
+
+        return result
+
+class SingleFlight:
+    """
+    Coalesces concurrent identical calls
+
+    The first caller for a key starts the work; callers arriving while it
+    is in flight await the same result or exception instead of repeating
+    it. Nothing is kept once the work completes. The work runs in its own
+    task, so a cancelled caller does not cancel it for the others.
+
+    Calls are counted per ``group`` (e.g. the task type): ``calls`` made,
+    ``executions`` actually run and ``coalesced`` calls that joined one.
+    """
+
+    def __init__(self):
+        self._in_flight: Dict[Hashable, asyncio.Task] = {}
+        self.stats: Dict[str, Dict[str, int]] = {}
+
+    async def run(self, group: str, key: Hashable, work: Callable[[], Awaitable[T]]) -> T:
+        """Run ``work`` unless a call with the same ``key`` is in flight, then share its outcome"""
+        stats = self.stats.setdefault(group, {"calls": 0, "executions": 0, "coalesced": 0})
+        stats["calls"] += 1
+
+        task = self._in_flight.get(key)
+        if task is None:
+            stats["executions"] += 1
+            task = asyncio.ensure_future(work())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda done: self._finish(key, done))
+        else:
+            stats["coalesced"] += 1
+
+        return await asyncio.shield(task)
+
+    def _finish(self, key: Hashable, task: asyncio.Task):
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        # Retrieve the exception so it is not reported when every caller left
+        if not task.cancelled():
+            task.exception()
+
+    def in_flight(self) -> int:
+        """Number of distinct calls currently running"""
+        return len(self._in_flight)
+
+class LatencyWindow:
+    """Rolling window of recent latencies, in seconds, with quantile estimates"""
+
+    def __init__(self, size: int):
+        self._samples = deque(maxlen=max(1, size))
+
+    def record(self, seconds: float):
+        self._samples.append(seconds)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Nearest-rank quantile of the window, or None while it is empty"""
+        if not self._samples:
+            return None
+
+        ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, max(0, math.ceil(q * len(ordered)) - 1))]
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+async def hedged(
+    call: Callable[[int], Awaitable[T]],
+    delay: Optional[float],
+    attempts: int = 2,
+    on_hedge: Optional[Callable[[int], None]] = None
+) -> T:
+    """
+    Run ``call`` and race a duplicate against it when it is slow
+
+    ``call`` receives the attempt number. When no attempt has finished
+    ``delay`` seconds after the last one started, another is started, up to
+    ``attempts``; when every running attempt has failed the next one starts
+    right away. The
+    first successful result wins and the attempts still running are
+    cancelled. Without a ``delay`` only failures start another attempt.
+    """
+    pending: List[asyncio.Future] = []
+    started = 0
+    error: Optional[BaseException] = None
+
+    def start():
+        nonlocal started
+        if started and on_hedge is not None:
+            on_hedge(started)
+        pending.append(asyncio.ensure_future(call(started)))
+        started += 1
+
+    start()
+    try:
+        while pending:
+            timeout = delay if started < attempts else None
+            done, _ = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+
+            if not done:
+                start()
+                continue
+
+            for future in done:
+                pending.remove(future)
+                if future.exception() is None:
+                    return future.result()
+                error = future.exception()
+
+            if not pending and started < attempts:
+                start()
+
+        raise error
+    finally:
+        for future in pending:
+            future.cancel()
@@ -3,7 +3,7 @@ Configuration settings for 一键升级-uplus platform
 """
 
 from pydantic_settings import BaseSettings
-from typing import List
+from typing import Dict, List
 import os
 
 class Settings(BaseSettings):
@@ -16,6 +16,40 @@ class Settings(BaseSettings):
     
     # Database
     DATABASE_URL: str = "sqlite:///./uplus.db"  # Default to SQLite for development
+    BATCH_MAX_SIZE: int = 10000  # Maximum rows accepted by a single batch endpoint call
+    SESSION_COMMIT_RETRIES: int = 3  # Merge attempts when a session was updated concurrently
+    
+    # Requirement sessions
+    SESSION_RECENT_TURNS: int = 4  # Turns sent verbatim to the LLM next to the rolling summary
+    SESSION_SUMMARY_MAX_ITEMS: int = 30  # Entries kept per summary list (features, user types, ...)
+    SESSION_SUMMARY_MAX_STATEMENTS: int = 10  # Requirement statements quoted in the summary
+    
+    # BITCUP analysis
+    BITCUP_PARALLEL_THRESHOLD: int = 500  # RSD elements above which analysis runs in a process pool
+    BITCUP_WORKERS: int = 0  # Analysis worker processes (0 = one per CPU)
+    BITCUP_ANALYSIS_CACHE_SIZE: int = 50000  # RSD element analyses kept across model generations
+    
+    # Code generation
+    CODEGEN_ARTIFACT_CACHE_SIZE: int = 20000  # Rendered files reused across generations
+    CODEGEN_MAX_CONCURRENCY: int = 8  # Artifacts rendered at the same time per generation
+    CODEGEN_TEMPLATE_BYTECODE_CACHE: bool = True  # Share compiled templates across processes via the temp dir
+    
+    # Background jobs
+    JOB_WORKERS: int = 2  # Jobs executed concurrently by this process
+    JOB_MAX_ATTEMPTS: int = 3  # Starts allowed before an interrupted job is failed
+    JOB_PROGRESS_INTERVAL: float = 1.0  # Seconds between persisted progress updates
+    JOB_EVENT_POLL_INTERVAL: float = 2.0  # Seconds between database polls in job event streams
+    JOB_LEASE_SECONDS: float = 60.0  # Running jobs whose owner stops renewing for this long are requeued
+    JOB_HEARTBEAT_INTERVAL: float = 15.0  # Seconds between lease renewals and expired-lease checks
+    
+    # Observability
+    METRICS_ENABLED: bool = True  # Time requests, LLM calls and queries and serve them at /metrics
+    TRACING_ENABLED: bool = True  # Record per-stage spans of each request (Server-Timing header in DEBUG)
+    TRACING_EXPORTER: str = "none"  # none, jsonl or otlp
+    TRACING_JSONL_PATH: str = "./traces.jsonl"  # Span log written by the jsonl exporter
+    TRACING_OTLP_ENDPOINT: str = "http://127.0.0.1:4318"  # OTLP/HTTP collector receiving /v1/traces
+    TRACING_SERVICE_NAME: str = "uplus-backend"  # service.name reported to the collector
+    TRACING_QUEUE_SIZE: int = 1000  # Traces waiting for export before new ones are dropped
     
     # Redis
     REDIS_URL: str = "redis://localhost:6379"
@@ -32,6 +66,46 @@ class Settings(BaseSettings):
     DEEPSEEK_API_KEY: str = os.getenv("DEEPSEEK_API_KEY", "sk-46ac4ed1f2144dd4844876880e5c3eca")
     LITELLM_MODEL: str = "deepseek/deepseek-chat"
     LITELLM_API_BASE: str = "https://api.deepseek.com"
+    LITELLM_JSON_MODE: bool = True  # Request response_format JSON mode from models that support it
+    AI_SINGLE_FLIGHT: bool = True  # Share one LLM call between concurrent identical requests
+    
+    # LLM latency
+    AI_CALL_TIMEOUT: float = 30.0  # Seconds allowed per LLM call when the caller sets no deadline
+    AI_INTERACT_DEADLINE: float = 20.0  # Seconds /ai-pm/interact may spend on its LLM calls
+    AI_RSD_DEADLINE: float = 90.0  # Seconds RSD generation may spend on its LLM call
+    AI_HEDGING: bool = True  # Race a duplicate request against calls slower than the usual tail
+    AI_HEDGE_QUANTILE: float = 0.95  # Latency quantile after which a call is hedged
+    AI_HEDGE_MIN_DELAY: float = 0.5  # Lower bound of the hedge delay, in seconds
+    AI_HEDGE_MIN_SAMPLES: int = 20  # Latencies observed per task before hedging starts
+    AI_LATENCY_WINDOW: int = 200  # Recent latencies kept per task
+    
+    # Model routing: tasks map to named profiles; empty model/API base use LITELLM_MODEL/LITELLM_API_BASE
+    AI_TASK_PROFILES: Dict[str, str] = {
+        "analyze_intent": "fast",
+        "generate_socratic_questions": "fast",
+        "generate_rsd": "strong"
+    }
+    AI_DEFAULT_PROFILE: str = "balanced"  # Profile of tasks not listed in AI_TASK_PROFILES
+    AI_PROFILE_FAST_MODEL: str = ""  # Small, quick model for frequent short calls
+    AI_PROFILE_FAST_API_BASE: str = ""
+    AI_PROFILE_FAST_TIMEOUT: float = 10.0  # Seconds per call before the fallback profile is tried
+    AI_PROFILE_FAST_CONCURRENCY: int = 16  # Calls in flight at once
+    AI_PROFILE_FAST_FALLBACKS: List[str] = ["balanced"]  # Profiles tried in order when a call fails
+    AI_PROFILE_BALANCED_MODEL: str = ""
+    AI_PROFILE_BALANCED_API_BASE: str = ""
+    AI_PROFILE_BALANCED_TIMEOUT: float = 30.0
+    AI_PROFILE_BALANCED_CONCURRENCY: int = 8
+    AI_PROFILE_BALANCED_FALLBACKS: List[str] = []
+    AI_PROFILE_STRONG_MODEL: str = ""  # Most capable model, for long structured documents
+    AI_PROFILE_STRONG_API_BASE: str = ""
+    AI_PROFILE_STRONG_TIMEOUT: float = 90.0
+    AI_PROFILE_STRONG_CONCURRENCY: int = 4
+    AI_PROFILE_STRONG_FALLBACKS: List[str] = ["balanced"]
+    
+    # Prompt budgets, in estimated prompt tokens per call
+    PROMPT_BUDGET_ANALYZE_INTENT: int = 1200  # Intent analysis of one user message
+    PROMPT_BUDGET_SOCRATIC_QUESTIONS: int = 1600  # Follow-up question generation
+    PROMPT_BUDGET_GENERATE_RSD: int = 3500  # RSD generation, including the output schema
     
     class Config:
         env_file = ".env"
@@ -2,22 +2,55 @@
 Database configuration and session management
 """
 
-from sqlalchemy import create_engine, MetaData
+from sqlalchemy import create_engine, event, MetaData
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 import asyncio
+import time
 from app.core.config import settings
+from app.core.metrics import metrics
+from app.core.tracing import record_span, span
+
+def get_async_database_url(database_url: str) -> str:
+    """Map a sync DATABASE_URL onto the matching async driver"""
+    if database_url.startswith("sqlite:///"):
+        return database_url.replace("sqlite:///", "sqlite+aiosqlite:///", 1)
+    if database_url.startswith("postgresql://"):
+        return database_url.replace("postgresql://", "postgresql+asyncpg://", 1)
+    return database_url
 
 # Create async engine for database operations
-# Use SQLite for development
-async_database_url = "sqlite+aiosqlite:///./uplus.db"
+# Defaults to SQLite for development
+async_database_url = get_async_database_url(settings.DATABASE_URL)
 engine = create_async_engine(async_database_url, echo=settings.DEBUG)
 
+DB_QUERY_SECONDS = metrics.histogram(
+    "uplus_db_query_duration_seconds",
+    "Database statement execution time by statement type",
+    ("operation",)
+)
+
+QUERY_OPERATIONS = {"SELECT", "INSERT", "UPDATE", "DELETE"}
+
+if settings.METRICS_ENABLED or settings.TRACING_ENABLED:
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def _start_query_timer(conn, cursor, statement, parameters, context, executemany):
+        # Kept on the statement's execution context, so failed statements leave nothing behind
+        context._query_start = time.perf_counter()
+    
+    @event.listens_for(engine.sync_engine, "after_cursor_execute")
+    def _record_query_time(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - context._query_start
+        operation = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else ""
+        operation = operation if operation in QUERY_OPERATIONS else "OTHER"
+        DB_QUERY_SECONDS.observe(elapsed, operation=operation)
+        record_span(f"db.{operation.lower()}", elapsed, statement=statement[:200])
+
 # Create async session maker
 AsyncSessionLocal = async_sessionmaker(
-    engine, 
-    class_=AsyncSession, 
+    engine,
+    class_=AsyncSession,
     expire_on_commit=False
 )
 
@@ -27,6 +60,10 @@ Base = declarative_base()
 # Metadata for table creation
 metadata = MetaData()
 
+def import_models():
+    """Import all models so they are registered on Base.metadata"""
+    from app.models import user, project, session, rsd, bitcup_model, lowcode, job
+
 async def get_db():
     """Dependency to get database session"""
     async with AsyncSessionLocal() as session:
@@ -35,12 +72,27 @@ async def get_db():
         finally:
             await session.close()
 
+async def persist(db: AsyncSession, *instances) -> None:
+    """
+    Add instances (if any) and commit the current transaction
+
+    Models declare ``eager_defaults`` so server-generated values such as
+    ``created_at``/``updated_at`` are read back through ``RETURNING`` during
+    the flush; no ``refresh()`` round trip is needed after the commit.
+    """
+    with span("db.commit"):
+        if instances:
+            db.add_all(instances)
+        await db.commit()
+
 async def init_db():
-    """Initialize database tables"""
-    async with engine.begin() as conn:
-        # Import all models here to ensure they are registered
-        from app.models import user, project, session, rsd, bitcup_model
-        
-        # Create all tables
-        await conn.run_sync(Base.metadata.create_all)
-        print("✅ Database tables created successfully")
\ No newline at end of file
+    """
+    Verify the database schema is at the latest migration revision
+
+    Tables are created and altered by Alembic migrations, run once per
+    deploy with ``python -m app.core.migrations upgrade``.
+    """
+    from app.core.migrations import verify_schema_revision
+
+    revision = await verify_schema_revision(engine)
+    print(f"✅ Database schema at revision {revision}")
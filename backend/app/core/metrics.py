@@ -0,0 +1,252 @@
+"""
+In-process metrics for the 一键升级-uplus platform
+
+A small registry of counters, gauges and histograms rendered in the
+Prometheus text exposition format at ``/metrics``, without any external
+dependency. Metrics are defined next to the code they measure, e.g.
+``LLM_CALL_SECONDS = metrics.histogram(...)`` at the top of a service.
+"""
+
+from typing import Any, Dict, Iterator, List, Sequence, Tuple
+import math
+import threading
+import time
+
+# Latency buckets in seconds, from fast queries to slow LLM calls
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4"
+
+LabelValues = Tuple[str, ...]
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values)) + "}"
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+class Metric:
+    """A named family of samples keyed by label values"""
+    kind = "untyped"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str], lock: threading.Lock):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._lock = lock
+
+    def _key(self, labels: Dict[str, Any]) -> LabelValues:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def samples(self) -> Iterator[Tuple[str, Sequence[str], LabelValues, float]]:
+        """Yield (suffix, label names, label values, value)"""
+        raise NotImplementedError
+
+class Counter(Metric):
+    kind = "counter"
+
+    def __init__(self, *args):
+        super().__init__(*args)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def samples(self):
+        for key, value in sorted(self._values.items()):
+            yield "", self.labelnames, key, value
+
+class Gauge(Metric):
+    kind = "gauge"
+
+    def __init__(self, *args):
+        super().__init__(*args)
+        self._values: Dict[LabelValues, float] = {}
+
+    def set(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def samples(self):
+        for key, value in sorted(self._values.items()):
+            yield "", self.labelnames, key, value
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, *args, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(*args)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> [count per bucket..., sum, count]
+        self._values: Dict[LabelValues, List[float]] = {}
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.setdefault(key, [0.0] * (len(self.buckets) + 2))
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[i] += 1
+                    break
+            state[-2] += value
+            state[-1] += 1
+
+    def time(self, **labels) -> "_Timer":
+        """Context manager observing the duration of its block"""
+        return _Timer(self, labels)
+
+    def samples(self):
+        names = self.labelnames + ("le",)
+        for key, state in sorted(self._values.items()):
+            cumulative = 0.0
+            for bound, count in zip(self.buckets, state):
+                cumulative += count
+                yield "_bucket", names, key + (_format_value(bound),), cumulative
+            yield "_bucket", names, key + ("+Inf",), state[-1]
+            yield "_sum", self.labelnames, key, state[-2]
+            yield "_count", self.labelnames, key, state[-1]
+
+class _Timer:
+    def __init__(self, histogram: Histogram, labels: Dict[str, Any]):
+        self._histogram = histogram
+        self._labels = labels
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._histogram.observe(time.perf_counter() - self._start, **self._labels)
+
+class MetricsRegistry:
+    """
+    Metrics of this process
+
+    Defining a metric twice returns the existing one, so modules can be
+    reloaded. LRU caches are tracked by reference and read at scrape time.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics: Dict[str, Metric] = {}
+        self._caches: Dict[str, Any] = {}
+
+    def _define(self, cls, name: str, help: str, labelnames: Sequence[str], **options) -> Metric:
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, help, labelnames, self._lock, **options)
+        if not isinstance(metric, cls):
+            raise ValueError(f"Metric {name} is already defined as a {metric.kind}")
+        return metric
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._define(Counter, name, help, labelnames)
+
+    def gauge(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._define(Gauge, name, help, labelnames)
+
+    def histogram(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ) -> Histogram:
+        return self._define(Histogram, name, help, labelnames, buckets=buckets)
+
+    def track_cache(self, name: str, cache: Any):
+        """Report the ``hits``, ``misses`` and size of ``cache`` under ``name``"""
+        self._caches[name] = cache
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format"""
+        lines: List[str] = []
+
+        with self._lock:
+            families = [(metric.name, metric.help, metric.kind, list(metric.samples())) for metric in self._metrics.values()]
+        families += self._cache_families()
+
+        for name, help, kind, samples in families:
+            lines.append(f"# HELP {name} {help}")
+            lines.append(f"# TYPE {name} {kind}")
+            for suffix, labelnames, values, value in samples:
+                lines.append(f"{name}{suffix}{_format_labels(labelnames, values)} {_format_value(value)}")
+
+        return "\n".join(lines) + "\n"
+
+    def _cache_families(self) -> List[Tuple[str, str, str, list]]:
+        caches = sorted(self._caches.items())
+        label = ("cache",)
+
+        def family(name, help, kind, value):
+            return name, help, kind, [("", label, (cache_name,), value(cache)) for cache_name, cache in caches]
+
+        def ratio(cache):
+            lookups = cache.hits + cache.misses
+            return cache.hits / lookups if lookups else 0.0
+
+        return [
+            family("uplus_cache_hits_total", "Cache lookups that found an entry", "counter", lambda cache: cache.hits),
+            family("uplus_cache_misses_total", "Cache lookups that missed", "counter", lambda cache: cache.misses),
+            family("uplus_cache_entries", "Entries currently cached", "gauge", len),
+            family("uplus_cache_hit_ratio", "Hits per lookup since the cache was created or cleared", "gauge", ratio)
+        ]
+
+# Create singleton instance
+metrics = MetricsRegistry()
+
+HTTP_REQUEST_SECONDS = metrics.histogram(
+    "uplus_http_request_duration_seconds",
+    "HTTP request latency by route template, until the last body byte is sent",
+    ("method", "route", "status")
+)
+
+class MetricsMiddleware:
+    """
+    ASGI middleware timing every HTTP request
+
+    Requests are labelled with the route template (``/api/v1/sessions/{session_id}``)
+    rather than the raw path, so labels stay bounded.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = {"code": 500}
+
+        async def send_with_status(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = scope.get("route")
+            HTTP_REQUEST_SECONDS.observe(
+                time.perf_counter() - start,
+                method=scope.get("method", ""),
+                route=getattr(route, "path", None) or "unmatched",
+                status=status["code"]
+            )
@@ -0,0 +1,102 @@
+"""
+Schema migrations for 一键升级-uplus platform
+
+Thin wrapper around Alembic. The application only verifies the schema
+revision at startup; migrations are applied once per deploy with:
+
+    python -m app.core.migrations upgrade
+"""
+
+from pathlib import Path
+from typing import Optional
+import argparse
+
+from alembic import command
+from alembic.config import Config
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+ALEMBIC_INI = Path(__file__).resolve().parents[2] / "alembic.ini"
+
+# Schema of databases created by ``create_all`` before migrations existed
+BASELINE_REVISION = "008d7ed9c7f0"
+
+class SchemaRevisionError(RuntimeError):
+    """Raised when the database schema does not match the migration head"""
+
+def get_alembic_config() -> Config:
+    """Load the Alembic configuration shipped with the backend"""
+    return Config(str(ALEMBIC_INI))
+
+def get_head_revision() -> Optional[str]:
+    """Get the head revision from the migration scripts"""
+    return ScriptDirectory.from_config(get_alembic_config()).get_current_head()
+
+async def get_current_revision(engine: AsyncEngine) -> Optional[str]:
+    """Get the revision currently stamped in the database"""
+    async with engine.connect() as conn:
+        return await conn.run_sync(
+            lambda sync_conn: MigrationContext.configure(sync_conn).get_current_revision()
+        )
+
+async def verify_schema_revision(engine: AsyncEngine) -> str:
+    """Ensure the database is migrated to head without touching the schema"""
+    current = await get_current_revision(engine)
+    head = get_head_revision()
+
+    if current != head:
+        raise SchemaRevisionError(
+            f"Database schema is at revision {current or 'none'}, expected {head}. "
+            "Run `python -m app.core.migrations upgrade` before starting the server. "
+            "A database created before migrations existed must first be marked as the baseline "
+            f"with `python -m app.core.migrations stamp {BASELINE_REVISION}`, then upgraded."
+        )
+
+    return current
+
+def main(argv=None):
+    """Command line entry point for running migrations"""
+    parser = argparse.ArgumentParser(
+        prog="python -m app.core.migrations",
+        description="Manage 一键升级-uplus database migrations"
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    upgrade_parser = subparsers.add_parser("upgrade", help="Upgrade the schema to a revision")
+    upgrade_parser.add_argument("revision", nargs="?", default="head")
+
+    downgrade_parser = subparsers.add_parser("downgrade", help="Downgrade the schema to a revision")
+    downgrade_parser.add_argument("revision")
+
+    stamp_parser = subparsers.add_parser("stamp", help="Mark the schema as a revision without migrating")
+    stamp_parser.add_argument(
+        "revision",
+        help=f"revision the schema already matches, e.g. {BASELINE_REVISION} for a pre-migration database"
+    )
+
+    subparsers.add_parser("current", help="Show the current schema revision")
+    subparsers.add_parser("history", help="Show the migration history")
+
+    revision_parser = subparsers.add_parser("revision", help="Create a new migration script")
+    revision_parser.add_argument("-m", "--message", required=True)
+    revision_parser.add_argument("--autogenerate", action="store_true")
+
+    args = parser.parse_args(argv)
+    config = get_alembic_config()
+
+    if args.command == "upgrade":
+        command.upgrade(config, args.revision)
+    elif args.command == "downgrade":
+        command.downgrade(config, args.revision)
+    elif args.command == "stamp":
+        command.stamp(config, args.revision)
+    elif args.command == "current":
+        command.current(config, verbose=True)
+    elif args.command == "history":
+        command.history(config)
+    elif args.command == "revision":
+        command.revision(config, message=args.message, autogenerate=args.autogenerate)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,363 @@
+"""
+Request tracing for the 一键升级-uplus platform
+
+Every HTTP request opens a trace; spans around endpoint stages, service
+methods, LLM calls and SQL statements attach to it through a context
+variable, so concurrent requests and ``asyncio.gather`` branches keep
+their own parents without passing anything around. Finished traces go
+to an exporter on a background thread: a JSONL file, or an OTLP/HTTP
+collector such as ``benchmarks.otlp_collector``. In debug mode the stage
+durations are also returned in a ``Server-Timing`` header.
+
+Spans opened outside a trace (startup, module imports) are not recorded.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional
+import functools
+import inspect
+import json
+import os
+import queue
+import threading
+import time
+
+from app.core.config import settings
+
+@dataclass
+class Span:
+    """One timed stage of a trace"""
+    name: str
+    trace: "Trace"
+    span_id: str
+    parent_id: Optional[str]
+    start_ns: int
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    duration_ns: Optional[int] = None
+    error: Optional[str] = None
+
+    def set(self, **attributes):
+        """Add attributes known only once the stage has run, e.g. token counts"""
+        self.attributes.update(attributes)
+
+    @property
+    def duration_ms(self) -> float:
+        return (self.duration_ns or 0) / 1e6
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "trace_id": self.trace.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start_time_ns": self.start_ns,
+            "duration_ms": round(self.duration_ms, 3),
+            "attributes": self.attributes,
+            "error": self.error
+        }
+
+class Trace:
+    """The spans of one request, exported together when its root span ends"""
+
+    def __init__(self, trace_id: Optional[str] = None):
+        self.trace_id = trace_id or os.urandom(16).hex()
+        self.spans: List[Span] = []
+        self.finished = False
+
+    def timings(self) -> Dict[str, Dict[str, float]]:
+        """Total milliseconds and count per span name, excluding the root"""
+        totals: Dict[str, Dict[str, float]] = {}
+        for span in self.spans:
+            if span.parent_id is None or span.duration_ns is None:
+                continue
+            entry = totals.setdefault(span.name, {"duration_ms": 0.0, "count": 0})
+            entry["duration_ms"] += span.duration_ms
+            entry["count"] += 1
+        return totals
+
+_current_span: ContextVar[Optional[Span]] = ContextVar("uplus_current_span", default=None)
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+def _start(name: str, trace: Trace, parent: Optional[Span], attributes: Dict[str, Any]) -> Span:
+    span = Span(
+        name=name,
+        trace=trace,
+        span_id=os.urandom(8).hex(),
+        parent_id=parent.span_id if parent else None,
+        start_ns=time.time_ns(),
+        attributes=attributes
+    )
+    trace.spans.append(span)
+    return span
+
+def _end(span: Span, started: int, error: Optional[BaseException] = None):
+    span.duration_ns = time.perf_counter_ns() - started
+    if error is not None:
+        span.error = f"{type(error).__name__}: {error}"
+
+    if span.parent_id is None:
+        span.trace.finished = True
+        tracer.export(span.trace.spans)
+    elif span.trace.finished:
+        # Outlived its request, e.g. a task spawned without being awaited
+        tracer.export([span])
+
+@contextmanager
+def trace(name: str, trace_id: Optional[str] = None, **attributes) -> Iterator[Optional[Span]]:
+    """Open a new trace whose root span covers the block"""
+    if not settings.TRACING_ENABLED:
+        yield None
+        return
+
+    span = _start(name, Trace(trace_id), None, attributes)
+    token = _current_span.set(span)
+    started = time.perf_counter_ns()
+    try:
+        yield span
+    except BaseException as e:
+        _end(span, started, e)
+        raise
+    else:
+        _end(span, started)
+    finally:
+        _current_span.reset(token)
+
+@contextmanager
+def span(name: str, **attributes) -> Iterator[Optional[Span]]:
+    """Time the block as a child of the current span; a no-op outside a trace"""
+    parent = _current_span.get()
+    if parent is None:
+        yield None
+        return
+
+    child = _start(name, parent.trace, parent, attributes)
+    token = _current_span.set(child)
+    started = time.perf_counter_ns()
+    try:
+        yield child
+    except BaseException as e:
+        _end(child, started, e)
+        raise
+    else:
+        _end(child, started)
+    finally:
+        _current_span.reset(token)
+
+def record_span(name: str, duration: float, **attributes):
+    """Record a stage that just ended after ``duration`` seconds, for callbacks that cannot wrap it"""
+    parent = _current_span.get()
+    if parent is None:
+        return
+
+    duration_ns = int(duration * 1e9)
+    child = _start(name, parent.trace, parent, attributes)
+    child.start_ns -= duration_ns
+    child.duration_ns = duration_ns
+
+def traced(name: Optional[str] = None):
+    """Decorator running a function or coroutine function inside a span, named after it by default"""
+
+    def decorator(func: Callable) -> Callable:
+        span_name = name or func.__qualname__
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with span(span_name):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(span_name):
+                return func(*args, **kwargs)
+        return wrapper
+
+    return decorator
+
+def server_timing(trace: Trace) -> str:
+    """``Server-Timing`` header value with the total duration per stage"""
+    metrics = []
+    for name, entry in trace.timings().items():
+        metric = f"{name};dur={entry['duration_ms']:.1f}"
+        if entry["count"] > 1:
+            metric += f';desc="x{entry["count"]}"'
+        metrics.append(metric)
+    return ", ".join(metrics)
+
+class JsonlExporter:
+    """Append one JSON line per span to a local file"""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def export(self, spans: List[Span]):
+        with open(self.path, "a", encoding="utf-8") as file:
+            for span in spans:
+                file.write(json.dumps(span.to_dict(), ensure_ascii=False, default=str) + "\n")
+
+class OtlpExporter:
+    """POST spans to an OTLP/HTTP collector in its JSON encoding"""
+
+    def __init__(self, endpoint: str, service_name: str):
+        import httpx
+
+        self.url = endpoint.rstrip("/") + "/v1/traces"
+        self.service_name = service_name
+        self.client = httpx.Client(timeout=5.0)
+
+    def export(self, spans: List[Span]):
+        response = self.client.post(self.url, json=self.encode(spans))
+        response.raise_for_status()
+
+    def encode(self, spans: List[Span]) -> Dict[str, Any]:
+        return {
+            "resourceSpans": [{
+                "resource": {"attributes": [_otlp_attribute("service.name", self.service_name)]},
+                "scopeSpans": [{
+                    "scope": {"name": "uplus"},
+                    "spans": [self._encode_span(span) for span in spans]
+                }]
+            }]
+        }
+
+    def _encode_span(self, span: Span) -> Dict[str, Any]:
+        encoded = {
+            "traceId": span.trace.trace_id,
+            "spanId": span.span_id,
+            "name": span.name,
+            "kind": 2 if span.parent_id is None else 1,  # SERVER for the request, INTERNAL below it
+            "startTimeUnixNano": str(span.start_ns),
+            "endTimeUnixNano": str(span.start_ns + (span.duration_ns or 0)),
+            "attributes": [_otlp_attribute(key, value) for key, value in span.attributes.items()],
+            "status": {"code": 2, "message": span.error} if span.error else {"code": 1}
+        }
+        if span.parent_id:
+            encoded["parentSpanId"] = span.parent_id
+        return encoded
+
+def _otlp_attribute(key: str, value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        encoded = {"boolValue": value}
+    elif isinstance(value, int):
+        encoded = {"intValue": str(value)}
+    elif isinstance(value, float):
+        encoded = {"doubleValue": value}
+    else:
+        encoded = {"stringValue": str(value)}
+    return {"key": key, "value": encoded}
+
+class Tracer:
+    """
+    Hands finished spans to the configured exporter
+
+    Exporting happens on a daemon thread behind a bounded queue, so file
+    writes and collector round trips stay off the event loop; spans are
+    dropped and counted when the exporter falls behind.
+    """
+
+    def __init__(self):
+        self.exporter = self._create_exporter()
+        self.dropped = 0
+        self._queue: "queue.Queue[List[Span]]" = queue.Queue(maxsize=settings.TRACING_QUEUE_SIZE)
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def _create_exporter(self):
+        kind = settings.TRACING_EXPORTER
+        if kind == "jsonl":
+            return JsonlExporter(settings.TRACING_JSONL_PATH)
+        if kind == "otlp":
+            return OtlpExporter(settings.TRACING_OTLP_ENDPOINT, settings.TRACING_SERVICE_NAME)
+        if kind not in ("", "none"):
+            print(f"Tracing: unknown exporter {kind!r}, spans will not be exported")
+        return None
+
+    def export(self, spans: List[Span]):
+        if self.exporter is None:
+            return
+
+        self._ensure_worker()
+        try:
+            self._queue.put_nowait(spans)
+        except queue.Full:
+            self.dropped += len(spans)
+
+    def flush(self, timeout: float = 5.0):
+        """Wait until the queued spans have been exported"""
+        deadline = time.monotonic() + timeout
+        while self._queue.unfinished_tasks and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+    def _ensure_worker(self):
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._work, name="uplus-tracing", daemon=True)
+                self._thread.start()
+
+    def _work(self):
+        while True:
+            spans = self._queue.get()
+            try:
+                self.exporter.export(spans)
+            except Exception as e:
+                print(f"Tracing export error: {e}")
+            finally:
+                self._queue.task_done()
+
+# Create singleton instance
+tracer = Tracer()
+
+class TracingMiddleware:
+    """
+    ASGI middleware opening a trace per HTTP request
+
+    The root span is named after the route template once routing has run.
+    An incoming W3C ``traceparent`` header is continued rather than
+    starting a new trace id. With ``DEBUG`` on, the response carries a
+    ``Server-Timing`` header with the duration of every stage.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.TRACING_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        method = scope.get("method", "")
+        with trace(f"{method} {scope.get('path', '')}", trace_id=_parent_trace_id(scope), method=method) as root:
+
+            async def send_with_timing(message):
+                if message["type"] == "http.response.start":
+                    root.set(status=message["status"])
+                    if settings.DEBUG:
+                        timing = server_timing(root.trace)
+                        if timing:
+                            message = {**message, "headers": list(message.get("headers", [])) + [
+                                (b"server-timing", timing.encode("latin-1"))
+                            ]}
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_timing)
+            finally:
+                route = getattr(scope.get("route"), "path", None)
+                if route:
+                    root.name = f"{method} {route}"
+                    root.set(route=route)
+
+def _parent_trace_id(scope) -> Optional[str]:
+    for name, value in scope.get("headers", []):
+        if name == b"traceparent":
+            parts = value.decode("latin-1").split("-")
+            if len(parts) == 4 and len(parts[1]) == 32:
+                return parts[1]
+    return None
@@ -6,6 +6,7 @@ Revolutionary AI-native software engineering platform
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
+from fastapi.responses import ORJSONResponse, PlainTextResponse
 from contextlib import asynccontextmanager
 import uvicorn
 import os
@@ -14,6 +15,10 @@ from dotenv import load_dotenv
 from app.core.config import settings
 from app.api.routes import api_router
 from app.core.database import init_db
+from app.core.metrics import CONTENT_TYPE, MetricsMiddleware, metrics
+from app.core.tracing import TracingMiddleware
+from app.services.bitcup_service import bitcup_service
+from app.services.job_service import job_service
 
 # Load environment variables
 load_dotenv()
@@ -24,10 +29,13 @@ async def lifespan(app: FastAPI):
     # Startup
     print("🚀 Starting 一键升级-uplus platform...")
     await init_db()
-    print("✅ Database initialized")
+    print("✅ Database schema verified")
+    await job_service.start()
     yield
     # Shutdown
     print("🛑 Shutting down 一键升级-uplus platform...")
+    await job_service.stop()
+    bitcup_service.shutdown()
 
 # Create FastAPI application
 app = FastAPI(
@@ -36,6 +44,7 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
@@ -53,6 +62,12 @@ app.add_middleware(
     allowed_hosts=["*"]  # Configure properly in production
 )
 
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
+if settings.TRACING_ENABLED:
+    app.add_middleware(TracingMiddleware)
+
 # Include API routes
 app.include_router(api_router, prefix="/api/v1")
 
@@ -67,6 +82,11 @@ async def root():
         "docs": "/docs"
     }
 
+@app.get("/metrics", include_in_schema=False)
+async def get_metrics():
+    """Process metrics in the Prometheus text exposition format"""
+    return PlainTextResponse(metrics.render(), media_type=CONTENT_TYPE)  # Starlette appends the charset
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
@@ -22,6 +22,7 @@ class BitcupModel(Base):
     """BITCUP semantic model"""
     
     __tablename__ = "bitcup_models"
+    __mapper_args__ = {"eager_defaults": True}
     
     id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()), index=True)
     rsd_id = Column(String(36), ForeignKey("rsd_documents.id"), nullable=False)
@@ -45,15 +46,39 @@ class BitcupModel(Base):
     # Generation Metadata
     generation_metadata = Column(JSON, default=dict)
     
+    # Implementation Spec, materialized from the model content and
+    # rebuilt only when the semantic hash or the spec version changes
+    semantic_hash = Column(String(64), nullable=True)
+    implementation_spec = Column(JSON, nullable=True)
+    implementation_spec_key = Column(String(64), nullable=True)
+    
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    updated_at = Column(DateTime(timezone=True), default=func.now(), onupdate=func.now())
     
     # Relationships
     rsd_document = relationship("RSDDocument", back_populates="bitcup_model")
     project = relationship("Project", back_populates="bitcup_models")
     generated_code = relationship("GeneratedCode", back_populates="bitcup_model")
     
+    @property
+    def business_model(self):
+        """The BITCUP model document, as produced by the BITCUP service"""
+        metadata = self.generation_metadata or {}
+        return {
+            "metadata": metadata.get("metadata", {}),
+            "business_context": metadata.get("business_context", {}),
+            "entities": self.entities or [],
+            "behaviors": self.behaviors or [],
+            "rules": self.rules or [],
+            "flows": self.flows or [],
+            "events": self.events or [],
+            "views": self.views or [],
+            "constraints": metadata.get("constraints", {}),
+            "success_criteria": metadata.get("success_criteria", []),
+            "validation": self.validation_results or {}
+        }
+    
     def __repr__(self):
         return f"<BitcupModel(id={self.id}, project_id={self.project_id}, status={self.status})>"
 
@@ -0,0 +1,45 @@
+"""
+Background job model
+"""
+
+from sqlalchemy import Column, String, DateTime, Text, Enum, JSON, Float, Integer
+from sqlalchemy.sql import func
+import uuid
+import enum
+from app.core.database import Base
+
+class JobStatus(str, enum.Enum):
+    """Job status enumeration"""
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+class Job(Base):
+    """Long-running generation executed by the background job workers"""
+
+    __tablename__ = "jobs"
+    __mapper_args__ = {"eager_defaults": True}
+
+    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()), index=True)
+    kind = Column(String(100), nullable=False)
+    status = Column(Enum(JobStatus), nullable=False, default=JobStatus.QUEUED, index=True)
+    payload = Column(JSON, default=dict)  # Validated request body of the job kind
+    result = Column(JSON, nullable=True)  # Response body once the job succeeded
+    error = Column(Text, nullable=True)
+    progress = Column(Float, default=0.0)
+    message = Column(String(255), nullable=True)  # Latest progress message
+    attempts = Column(Integer, default=0)
+    owner = Column(String(100), nullable=True)  # Process running the job
+    lease_expires_at = Column(DateTime(timezone=True), nullable=True, index=True)  # Renewed by the owner's heartbeat
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), default=func.now(), onupdate=func.now())
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in (JobStatus.SUCCEEDED, JobStatus.FAILED)
+
+    def __repr__(self):
+        return f"<Job(id={self.id}, kind={self.kind}, status={self.status})>"
@@ -2,7 +2,7 @@
 Models for AI Low-Code Platform
 """
 
-from sqlalchemy import Column, String, JSON, ForeignKey, DateTime
+from sqlalchemy import Column, String, JSON, ForeignKey, DateTime, Integer, Text
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 
@@ -18,26 +18,50 @@ class GeneratedCode(Base):
     """
     
     __tablename__ = "generated_code"
+    __mapper_args__ = {"eager_defaults": True}
     
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     bitcup_id = Column(String, ForeignKey("bitcup_models.id"))
     tech_stack = Column(JSON, nullable=False)
-    frontend_code = Column(JSON, nullable=False)
-    backend_code = Column(JSON, nullable=False)
-    database_code = Column(JSON, nullable=False)
-    deployment_config = Column(JSON, nullable=False)
+    
+    # Layer -> nested path -> SHA-256 of the file body in artifact_blobs
+    file_manifest = Column(JSON, nullable=True)
+    
+    # Inline layer contents, only set on rows generated before file_manifest
+    frontend_code = Column(JSON, nullable=True)
+    backend_code = Column(JSON, nullable=True)
+    database_code = Column(JSON, nullable=True)
+    deployment_config = Column(JSON, nullable=True)
+    rebuild_manifest = Column(JSON, nullable=True)  # Files reused from / rebuilt into the artifact cache
     created_at = Column(DateTime, server_default=func.now())
     
     # Relationships
     bitcup_model = relationship("BitcupModel", back_populates="generated_code")
     deployments = relationship("Deployment", back_populates="generated_code")
 
+class ArtifactBlob(Base):
+    """
+    Content-addressed body of a generated file
+    
+    Each distinct file body is stored once, keyed by its SHA-256, and
+    shared by every generation that produced it.
+    """
+    
+    __tablename__ = "artifact_blobs"
+    __mapper_args__ = {"eager_defaults": True}
+    
+    sha256 = Column(String(64), primary_key=True)
+    content = Column(Text, nullable=False)
+    size = Column(Integer, nullable=False)
+    created_at = Column(DateTime, server_default=func.now())
+
 class Deployment(Base):
     """
     Model for storing deployment information
     """
     
     __tablename__ = "deployments"
+    __mapper_args__ = {"eager_defaults": True}
     
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     code_id = Column(String, ForeignKey("generated_code.id"))
@@ -24,6 +24,7 @@ class Project(Base):
     """Project model for user projects"""
     
     __tablename__ = "projects"
+    __mapper_args__ = {"eager_defaults": True}
     
     id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()), index=True)
     name = Column(String(255), nullable=False)
@@ -31,7 +32,7 @@ class Project(Base):
     status = Column(Enum(ProjectStatus), default=ProjectStatus.DRAFT)
     owner_id = Column(String(36), ForeignKey("users.id"), nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    updated_at = Column(DateTime(timezone=True), default=func.now(), onupdate=func.now())
     
     # Relationships
     owner = relationship("User", back_populates="projects")
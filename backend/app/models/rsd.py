@@ -12,6 +12,7 @@ class RSDDocument(Base):
     """Requirements Specification Document model"""
     
     __tablename__ = "rsd_documents"
+    __mapper_args__ = {"eager_defaults": True}
     
     id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()), index=True)
     session_id = Column(String(36), ForeignKey("requirement_sessions.id"), nullable=False)
@@ -30,7 +31,7 @@ class RSDDocument(Base):
     
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    updated_at = Column(DateTime(timezone=True), default=func.now(), onupdate=func.now())
     
     # Relationships
     session = relationship("RequirementSession", back_populates="rsd_document")
@@ -2,7 +2,7 @@
 Requirement gathering session model
 """
 
-from sqlalchemy import Column, String, DateTime, Text, ForeignKey, Enum, JSON, Float
+from sqlalchemy import Column, String, DateTime, Text, ForeignKey, Enum, JSON, Float, Integer
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 import uuid
@@ -27,11 +27,17 @@ class RequirementSession(Base):
     status = Column(Enum(SessionStatus), default=SessionStatus.ACTIVE)
     context = Column(JSON, default=dict)  # Store conversation context
     dialogue_history = Column(JSON, default=list)  # Store conversation history
+    conversation_summary = Column(JSON, nullable=True)  # Rolling summary of dialogue_history
     completeness_score = Column(Float, default=0.0)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    updated_at = Column(DateTime(timezone=True), default=func.now(), onupdate=func.now())
     completed_at = Column(DateTime(timezone=True), nullable=True)
     
+    # Optimistic concurrency: every UPDATE compares and bumps this counter
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+    
+    __mapper_args__ = {"eager_defaults": True, "version_id_col": version}
+    
     # Relationships
     project = relationship("Project", back_populates="sessions")
     user = relationship("User", back_populates="sessions")
@@ -11,6 +11,7 @@ class User(Base):
     """User model for platform authentication"""
     
     __tablename__ = "users"
+    __mapper_args__ = {"eager_defaults": True}
     
     id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()), index=True)
     email = Column(String(255), unique=True, index=True, nullable=False)
@@ -20,7 +21,7 @@ class User(Base):
     is_verified = Column(Boolean, default=False)
     avatar_url = Column(Text, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    updated_at = Column(DateTime(timezone=True), default=func.now(), onupdate=func.now())
     
     def __repr__(self):
         return f"<User(id={self.id}, email={self.email}, name={self.name})>"
\ No newline at end of file
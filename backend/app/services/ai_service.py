@@ -8,8 +8,41 @@ from typing import Dict, List, Any, Optional
 import json
 import asyncio
 import re
+import time
 from datetime import datetime
+from app.core.cache import content_hash
+from app.core.concurrency import LatencyWindow, SingleFlight, hedged
 from app.core.config import settings
+from app.core.metrics import metrics
+from app.core.tracing import span, traced
+from app.services.conversation_summary import COVERAGE_KEYWORDS, render_summary, summarize_history
+from app.services.model_router import ModelProfile, model_router
+from app.services.prompt_budget import BudgetedPrompt, PromptSection, TokenUsage, estimate_tokens, fit_prompt
+from app.services.structured_output import IntentAnalysis, RSDContent, SocraticQuestions, parse_structured
+
+LLM_CALL_SECONDS = metrics.histogram(
+    "uplus_llm_call_duration_seconds",
+    "LLM call latency per task and model, including hedged duplicates",
+    ("task", "model", "outcome")
+)
+LLM_TOKENS = metrics.counter(
+    "uplus_llm_tokens_total",
+    "Tokens reported by the provider per task and model",
+    ("task", "model", "kind")
+)
+LLM_ERRORS = metrics.counter(
+    "uplus_llm_errors_total",
+    "LLM calls that failed or timed out per task and model",
+    ("task", "model", "reason")
+)
+LLM_FALLBACKS = metrics.counter(
+    "uplus_llm_fallback_responses_total",
+    "Calls answered by the canned fallback instead of a model",
+    ("task",)
+)
+
+class FallbackResponse(str):
+    """Text written by the canned fallback generator rather than a model"""
 
 class AIService:
     """
@@ -27,6 +60,27 @@ class AIService:
         self.model = settings.LITELLM_MODEL
         self.api_available = True
         
+        # Tasks are routed to model profiles (fast, balanced, strong)
+        self.router = model_router
+        
+        # Prompt token budget per task, and token counts of every call
+        self.prompt_budgets = {
+            "analyze_intent": settings.PROMPT_BUDGET_ANALYZE_INTENT,
+            "generate_socratic_questions": settings.PROMPT_BUDGET_SOCRATIC_QUESTIONS,
+            "generate_rsd": settings.PROMPT_BUDGET_GENERATE_RSD
+        }
+        self.token_usage = TokenUsage()
+        
+        # Whether each model accepts response_format JSON mode, learned on first use
+        self.json_mode_support: Dict[str, bool] = {}
+        
+        # Identical calls in flight at the same time share one LLM request
+        self.single_flight = SingleFlight()
+        
+        # Recent call latencies per task, which set when a slow call is hedged
+        self.latencies: Dict[str, LatencyWindow] = {}
+        self.tail_stats: Dict[str, Dict[str, int]] = {}
+        
         # Test API availability on initialization
         self._test_api_connection()
         
@@ -56,6 +110,12 @@ class AIService:
         
         Remember: You're not just gathering requirements - you're helping users discover what they truly need.
         """
+        
+        # Stand-in for the persona when a prompt runs over its budget
+        self.ai_pm_persona_compact = """
+        You are the AI Product Manager for 一键升级-uplus. Turn vague needs into precise, executable
+        specifications through progressive Socratic questioning, in business language.
+        """
     
     def _test_api_connection(self):
         """Test API connection and set availability flag"""
@@ -86,7 +146,8 @@ class AIService:
                 model=self.model,
                 messages=[{"role": "user", "content": "Hello"}],
                 max_tokens=10,
-                timeout=5
+                timeout=5,
+                api_base=settings.LITELLM_API_BASE or None
             )
             return response.choices[0].message.content
         except Exception:
@@ -97,42 +158,304 @@ class AIService:
         messages: List[Dict[str, str]], 
         system_prompt: Optional[str] = None,
         temperature: float = 0.7,
-        max_tokens: int = 1000
+        max_tokens: int = 1000,
+        task: str = "chat",
+        json_mode: bool = False,
+        deadline: Optional[float] = None
     ) -> str:
-        """Generate AI response using LiteLLM with intelligent fallback"""
+        """
+        Generate AI response using LiteLLM with intelligent fallback
+        
+        Token counts are recorded under ``task``. With ``json_mode`` the
+        model is asked for a JSON object through ``response_format`` when it
+        supports it. Concurrent calls with the same request are coalesced
+        into one, e.g. a double-clicked RSD generation, and share the
+        deadline of the first caller.
+        
+        ``deadline`` is a ``time.monotonic()`` instant; without one the call
+        gets ``AI_CALL_TIMEOUT`` seconds. A call still running past the
+        usual tail latency of its task is hedged with a duplicate request,
+        and the fallback answers only when the deadline would be missed.
+        """
         
         # Use fallback if API is not available
         if not self.api_available:
-            return self._generate_intelligent_fallback(messages, system_prompt)
+            return self._fallback_response(task, messages, system_prompt)
         
-        try:
-            # Prepare messages
-            formatted_messages = []
+        remaining = (deadline - time.monotonic()) if deadline is not None else settings.AI_CALL_TIMEOUT
+        if remaining <= 0:
+            return self._deadline_missed(task, messages, system_prompt)
+        
+        if not settings.AI_SINGLE_FLIGHT:
+            return await self._generate(messages, system_prompt, temperature, max_tokens, task, json_mode, remaining)
+        
+        key = content_hash([self.router.profile_for(task).model, system_prompt, messages, temperature, max_tokens, json_mode])
+        return await self.single_flight.run(
+            task,
+            key,
+            lambda: self._generate(messages, system_prompt, temperature, max_tokens, task, json_mode, remaining)
+        )
+    
+    async def _generate(
+        self,
+        messages: List[Dict[str, str]],
+        system_prompt: Optional[str],
+        temperature: float,
+        max_tokens: int,
+        task: str,
+        json_mode: bool,
+        remaining: float
+    ) -> str:
+        """
+        Make one LLM call within ``remaining`` seconds, falling back to canned responses on error
+        
+        The call goes to the profile ``task`` is routed to. When it fails or
+        exceeds the profile timeout, the profile's fallbacks are tried in
+        order with whatever time is left.
+        """
+        
+        # Prepare messages
+        formatted_messages = []
+        
+        if system_prompt:
+            formatted_messages.append({
+                "role": "system",
+                "content": system_prompt
+            })
+        
+        formatted_messages.extend(messages)
+        
+        deadline = time.monotonic() + remaining
+        error: Optional[Exception] = None
+        
+        for index, profile in enumerate(self.router.chain(task)):
+            left = deadline - time.monotonic()
+            if left <= 0:
+                break
             
-            if system_prompt:
-                formatted_messages.append({
-                    "role": "system",
-                    "content": system_prompt
-                })
+            if index:
+                print(f"AI Service: {task} falling back to the {profile.name} profile ({profile.model})")
+                self.router.record_fallback(profile)
             
-            formatted_messages.extend(messages)
+            started = time.monotonic()
+            with span(f"llm.{task}", model=profile.model, profile=profile.name) as call_span:
+                try:
+                    response = await self._call_profile(
+                        profile, formatted_messages, temperature, max_tokens, task, json_mode,
+                        min(left, profile.timeout), hedge=index == 0
+                    )
+                    content = response.choices[0].message.content
+                except asyncio.TimeoutError as e:
+                    self._record_outcome(task, profile, "timed_out", started, call_span)
+                    error = e
+                    continue
+                except Exception as e:
+                    print(f"AI Service Error ({profile.name}): {e}")
+                    self._record_outcome(task, profile, "failed", started, call_span)
+                    error = e
+                    continue
+                
+                self._record_outcome(task, profile, "succeeded", started, call_span)
+                usage = getattr(response, "usage", None)
+                prompt_tokens = getattr(usage, "prompt_tokens", None) or self._estimate_prompt_tokens(formatted_messages)
+                completion_tokens = getattr(usage, "completion_tokens", None) or estimate_tokens(content or "")
+                self.token_usage.record_call(task, prompt_tokens, completion_tokens)
+                LLM_TOKENS.inc(prompt_tokens, task=task, model=profile.model, kind="prompt")
+                LLM_TOKENS.inc(completion_tokens, task=task, model=profile.model, kind="completion")
+                if call_span:
+                    call_span.set(prompt_tokens=prompt_tokens, completion_tokens=completion_tokens)
+                
+                return content
+        
+        if error is None or isinstance(error, asyncio.TimeoutError):
+            return self._deadline_missed(task, messages, system_prompt)
+        
+        # Mark API as unavailable and use fallback
+        self.api_available = False
+        return self._fallback_response(task, messages, system_prompt)
+    
+    def _record_outcome(self, task: str, profile: ModelProfile, outcome: str, started: float, call_span=None):
+        """Count a call of ``profile`` in the router stats, the LLM metrics and its trace span"""
+        
+        self.router.record(profile, outcome)
+        if call_span:
+            call_span.set(outcome=outcome)
+        LLM_CALL_SECONDS.observe(time.monotonic() - started, task=task, model=profile.model, outcome=outcome)
+        if outcome != "succeeded":
+            LLM_ERRORS.inc(task=task, model=profile.model, reason=outcome)
+    
+    async def _call_profile(
+        self,
+        profile: ModelProfile,
+        messages: List[Dict[str, str]],
+        temperature: float,
+        max_tokens: int,
+        task: str,
+        json_mode: bool,
+        timeout: float,
+        hedge: bool
+    ):
+        """Call the model of ``profile`` within ``timeout`` seconds, hedging a slow call when time allows"""
+        
+        async def attempt(number: int):
+            with span("llm.attempt", attempt=number):
+                async with self.router.slot(profile):
+                    started = time.monotonic()
+                    # The provider timeout is a backstop; the wait below fires first
+                    response = await self._acompletion(
+                        profile, messages, temperature, max_tokens, json_mode, timeout=timeout + 1
+                    )
             
-            # Generate response using LiteLLM
-            response = await litellm.acompletion(
-                model=self.model,
-                messages=formatted_messages,
+            # Latencies of the primary profile drive its hedge delay
+            if hedge:
+                self.latencies.setdefault(task, LatencyWindow(settings.AI_LATENCY_WINDOW)).record(
+                    time.monotonic() - started
+                )
+            if number:
+                self._tail_stats(task)["hedge_wins"] += 1
+            return response
+        
+        delay = self._hedge_delay(task) if hedge else None
+        hedging = delay is not None and delay < timeout
+        return await asyncio.wait_for(
+            hedged(
+                attempt,
+                delay if hedging else None,
+                attempts=2 if hedging else 1,
+                on_hedge=lambda number: self._record_hedge(task)
+            ),
+            timeout
+        )
+    
+    async def _acompletion(
+        self,
+        profile: ModelProfile,
+        messages: List[Dict[str, str]],
+        temperature: float,
+        max_tokens: int,
+        json_mode: bool,
+        timeout: float
+    ):
+        """Call the model of ``profile``, retrying without JSON mode if the provider rejects it"""
+        
+        options = {}
+        if json_mode and self._supports_json_mode(profile.model):
+            options["response_format"] = {"type": "json_object"}
+        if profile.api_base:
+            options["api_base"] = profile.api_base
+        
+        try:
+            return await litellm.acompletion(
+                model=profile.model,
+                messages=messages,
                 temperature=temperature,
                 max_tokens=max_tokens,
-                timeout=30
+                timeout=timeout,
+                **options
             )
-            
-            return response.choices[0].message.content
-            
         except Exception as e:
-            print(f"AI Service Error: {e}")
-            # Mark API as unavailable and use fallback
-            self.api_available = False
-            return self._generate_intelligent_fallback(messages, system_prompt)
+            if "response_format" not in options or getattr(e, "status_code", None) != 400:
+                raise
+            print(f"AI Service: JSON mode rejected by {profile.model}, using plain text: {e}")
+            self.json_mode_support[profile.model] = False
+            return await self._acompletion(profile, messages, temperature, max_tokens, False, timeout)
+    
+    def _supports_json_mode(self, model: str) -> bool:
+        """Whether to request JSON mode from ``model``"""
+        
+        if not settings.LITELLM_JSON_MODE:
+            return False
+        
+        if model not in self.json_mode_support:
+            supported = True
+            get_params = getattr(litellm, "get_supported_openai_params", None)
+            if get_params is not None:
+                try:
+                    supported = "response_format" in (get_params(model=model) or [])
+                except Exception:
+                    pass
+            self.json_mode_support[model] = supported
+        
+        return self.json_mode_support[model]
+    
+    def _parse_structured(self, task: str, response: str, schema) -> Optional[Any]:
+        """Parse a JSON response against ``schema``, recording the outcome under ``task``"""
+        
+        if isinstance(response, FallbackResponse):
+            # Fallback prose is never JSON; counting it as a parse failure would hide real model regressions
+            self.token_usage.record_parse(task, "fallback")
+            return None
+        
+        with span(f"parse.{task}") as parse_span:
+            data, outcome = parse_structured(response, schema)
+            if parse_span:
+                parse_span.set(outcome=outcome)
+        self.token_usage.record_parse(task, outcome)
+        return data
+    
+    def _fallback_response(self, task: str, messages: List[Dict[str, str]], system_prompt: Optional[str]) -> str:
+        """Answer from the fallback generator, recording the tokens the call would have used"""
+        
+        content = FallbackResponse(self._generate_intelligent_fallback(messages, system_prompt))
+        LLM_FALLBACKS.inc(task=task)
+        prompt = ([{"role": "system", "content": system_prompt}] if system_prompt else []) + list(messages)
+        self.token_usage.record_call(task, self._estimate_prompt_tokens(prompt), estimate_tokens(content), fallback=True)
+        return content
+    
+    def _deadline_missed(self, task: str, messages: List[Dict[str, str]], system_prompt: Optional[str]) -> str:
+        """Answer from the fallback because the deadline ran out; the API stays enabled"""
+        
+        print(f"AI Service: {task} call missed its deadline, using fallback response")
+        self._tail_stats(task)["deadline_misses"] += 1
+        return self._fallback_response(task, messages, system_prompt)
+    
+    def _hedge_delay(self, task: str) -> Optional[float]:
+        """Seconds after which a call of ``task`` is hedged, or None until enough latencies are known"""
+        
+        window = self.latencies.get(task)
+        if not settings.AI_HEDGING or window is None or len(window) < settings.AI_HEDGE_MIN_SAMPLES:
+            return None
+        
+        return max(window.quantile(settings.AI_HEDGE_QUANTILE), settings.AI_HEDGE_MIN_DELAY)
+    
+    def _tail_stats(self, task: str) -> Dict[str, int]:
+        return self.tail_stats.setdefault(task, {"hedged": 0, "hedge_wins": 0, "deadline_misses": 0})
+    
+    def _record_hedge(self, task: str):
+        print(f"AI Service: {task} call is slow, sending a hedged request")
+        self._tail_stats(task)["hedged"] += 1
+    
+    def latency_report(self) -> Dict[str, Dict[str, Any]]:
+        """Latency quantiles, hedging and deadline counters per task"""
+        
+        report = {}
+        for task in sorted(set(self.latencies) | set(self.tail_stats)):
+            window = self.latencies.get(task)
+            report[task] = {
+                "samples": len(window) if window else 0,
+                "p50": window.quantile(0.5) if window else None,
+                "p95": window.quantile(0.95) if window else None,
+                "hedge_delay": self._hedge_delay(task),
+                **self._tail_stats(task)
+            }
+        return report
+    
+    def _estimate_prompt_tokens(self, messages: List[Dict[str, str]]) -> int:
+        """Estimated prompt tokens of a message list, with per-message overhead"""
+        
+        return sum(estimate_tokens(message.get("content", "")) + 4 for message in messages)
+    
+    def _budget_prompt(self, task: str, sections: List[PromptSection]) -> BudgetedPrompt:
+        """Fit prompt sections to the budget of ``task`` and record the outcome"""
+        
+        prompt = fit_prompt(sections, self.prompt_budgets[task])
+        self.token_usage.record_prompt(task, prompt)
+        return prompt
+    
+    def _persona_section(self) -> PromptSection:
+        """The AI-PM persona, first to be compacted when a prompt is over budget"""
+        
+        return PromptSection("persona", self.ai_pm_persona, priority=10, compact=self.ai_pm_persona_compact)
     
     def _generate_intelligent_fallback(self, messages: List[Dict[str, str]], system_prompt: Optional[str] = None) -> str:
         """Generate intelligent fallback responses based on context"""
@@ -186,7 +509,13 @@ I'll help you prioritize these features based on user value and business impact.
 
 The more details you can share, the better I can help you create a comprehensive specification."""
     
-    async def analyze_intent(self, user_input: str, context: Dict[str, Any]) -> Dict[str, Any]:
+    @traced()
+    async def analyze_intent(
+        self,
+        user_input: str,
+        context: Dict[str, Any],
+        deadline: Optional[float] = None
+    ) -> Dict[str, Any]:
         """
         Advanced intent analysis using the 一键升级-uplus methodology
         
@@ -195,9 +524,7 @@ The more details you can share, the better I can help you create a comprehensive
         """
         
         # Enhanced system prompt with 一键升级-uplus methodology
-        system_prompt = f"""
-        {self.ai_pm_persona}
-        
+        instructions = """
         TASK: Analyze user input for intelligent requirement discovery
         
         You must analyze the user's input and extract structured information using the 一键升级-uplus methodology:
@@ -222,27 +549,27 @@ The more details you can share, the better I can help you create a comprehensive
            - Prioritize next discovery areas
         
         Return a JSON response with this exact structure:
-        {{
+        {
             "intent_type": "one of the types above",
             "confidence": 0.0-1.0,
-            "semantic_analysis": {{
+            "semantic_analysis": {
                 "entities": ["list of business entities mentioned"],
                 "relationships": ["list of relationships between entities"],
                 "success_criteria": ["list of success indicators"],
                 "assumptions": ["list of implicit assumptions"]
-            }},
-            "extracted_info": {{
+            },
+            "extracted_info": {
                 "summary": "concise summary of what user wants",
                 "key_features": ["list of mentioned features"],
                 "user_types": ["list of user types/roles"],
                 "business_value": "why this matters to the business",
                 "constraints": ["any mentioned constraints"]
-            }},
+            },
             "completeness_score": 0.0-1.0,
             "missing_info": ["specific information still needed"],
             "follow_up_questions": ["2-3 intelligent Socratic questions"],
             "next_discovery_areas": ["areas to explore next"]
-        }}
+        }
         
         Be intelligent, insightful, and help users discover what they truly need.
         """
@@ -251,40 +578,43 @@ The more details you can share, the better I can help you create a comprehensive
         context_summary = self._summarize_context(context)
         conversation_stage = self._determine_conversation_stage(context)
         
-        messages = [
-            {
-                "role": "user", 
-                "content": f"""
-                CONTEXT SUMMARY: {context_summary}
-                CONVERSATION STAGE: {conversation_stage}
-                
-                USER INPUT: "{user_input}"
-                
-                Please analyze this input using the 一键升级-uplus methodology and provide structured analysis.
-                """
-            }
-        ]
+        prompt = self._budget_prompt("analyze_intent", [
+            self._persona_section(),
+            PromptSection("instructions", instructions, required=True),
+            PromptSection(
+                "context",
+                f"CONTEXT SUMMARY: {context_summary}\nCONVERSATION STAGE: {conversation_stage}",
+                priority=20,
+                role="user"
+            ),
+            PromptSection(
+                "input",
+                f'USER INPUT: "{user_input}"\n\n'
+                "Please analyze this input using the 一键升级-uplus methodology and provide structured analysis.",
+                role="user",
+                required=True
+            )
+        ])
         
         try:
             response = await self.generate_response(
-                messages=messages,
-                system_prompt=system_prompt,
+                messages=prompt.messages,
+                system_prompt=prompt.system_prompt,
                 temperature=0.3,
-                max_tokens=1500
+                max_tokens=1500,
+                task="analyze_intent",
+                json_mode=True,
+                deadline=deadline
             )
             
-            # Try to parse JSON response
-            try:
-                analysis = json.loads(response)
-                
-                # Validate and enhance the analysis
-                analysis = self._validate_and_enhance_analysis(analysis, user_input, context)
-                
-                return analysis
-                
-            except json.JSONDecodeError:
+            # Parse the JSON response, repairing invalid fields
+            analysis = self._parse_structured("analyze_intent", response, IntentAnalysis)
+            if analysis is None:
                 # Intelligent fallback with pattern recognition
                 return self._create_fallback_analysis(user_input, context)
+            
+            # Validate and enhance the analysis
+            return self._validate_and_enhance_analysis(analysis, user_input, context)
                 
         except Exception as e:
             print(f"Intent analysis error: {e}")
@@ -464,16 +794,22 @@ The more details you can share, the better I can help you create a comprehensive
         }
         return defaults.get(field, None)
     
+    @traced()
     async def generate_socratic_questions(
         self, 
         context: Dict[str, Any], 
-        conversation_history: List[Dict[str, Any]]
+        conversation_history: List[Dict[str, Any]],
+        conversation_summary: Optional[Dict[str, Any]] = None,
+        deadline: Optional[float] = None
     ) -> List[str]:
         """
         Generate intelligent Socratic questions using the 一键升级-uplus methodology
         
         This method implements advanced requirement discovery through strategic questioning
         that guides users toward complete and actionable specifications.
+        
+        Earlier turns reach the prompt through ``conversation_summary``, the
+        session's rolling summary; it is rebuilt from the history if omitted.
         """
         
         # Analyze conversation stage and context
@@ -481,9 +817,7 @@ The more details you can share, the better I can help you create a comprehensive
         missing_areas = self._identify_missing_requirement_areas(context)
         
         # Enhanced system prompt for Socratic questioning
-        system_prompt = f"""
-        {self.ai_pm_persona}
-        
+        instructions = f"""
         TASK: Generate intelligent Socratic questions for requirement discovery
         
         CURRENT CONTEXT:
@@ -525,10 +859,10 @@ The more details you can share, the better I can help you create a comprehensive
            - Business-focused, not technical
            - Progressive - each question builds understanding
         
-        Generate 2-3 intelligent questions as a JSON array.
+        Generate 2-3 intelligent questions as a JSON object.
         Focus on the most critical missing information for the current stage.
         
-        Example format: ["Question 1?", "Question 2?", "Question 3?"]
+        Example format: {{"questions": ["Question 1?", "Question 2?", "Question 3?"]}}
         """
         
         # Prepare context for AI
@@ -540,40 +874,55 @@ The more details you can share, the better I can help you create a comprehensive
             "last_user_input": conversation_history[-1].get("user_message", "") if conversation_history else ""
         }
         
-        messages = [
-            {
-                "role": "user",
-                "content": f"""
-                CONTEXT ANALYSIS: {json.dumps(context_analysis, indent=2)}
-                
-                CONVERSATION HISTORY SUMMARY:
-                {self._summarize_conversation_history(conversation_history)}
-                
-                Generate intelligent Socratic questions for the next phase of requirement discovery.
-                """
-            }
-        ]
+        prompt = self._budget_prompt("generate_socratic_questions", [
+            self._persona_section(),
+            PromptSection("instructions", instructions, required=True),
+            PromptSection(
+                "context",
+                f"CONTEXT ANALYSIS: {json.dumps(context_analysis, ensure_ascii=False)}",
+                priority=20,
+                role="user"
+            ),
+            PromptSection(
+                "summary",
+                self._summarize_earlier_turns(conversation_history, conversation_summary),
+                priority=15,
+                role="user"
+            ),
+            PromptSection(
+                "history",
+                f"CONVERSATION HISTORY SUMMARY:\n{self._summarize_conversation_history(conversation_history)}",
+                priority=5,
+                role="user",
+                keep="tail"
+            ),
+            PromptSection(
+                "request",
+                "Generate intelligent Socratic questions for the next phase of requirement discovery.",
+                role="user",
+                required=True
+            )
+        ])
         
         try:
             response = await self.generate_response(
-                messages=messages,
-                system_prompt=system_prompt,
+                messages=prompt.messages,
+                system_prompt=prompt.system_prompt,
                 temperature=0.6,
-                max_tokens=800
+                max_tokens=800,
+                task="generate_socratic_questions",
+                json_mode=True,
+                deadline=deadline
             )
             
-            # Try to parse JSON response
-            try:
-                questions = json.loads(response)
-                if isinstance(questions, list) and len(questions) > 0:
-                    # Validate and enhance questions
-                    return self._validate_and_enhance_questions(questions, conversation_stage, missing_areas)
-                else:
-                    return self._generate_fallback_questions(conversation_stage, missing_areas)
-                    
-            except json.JSONDecodeError:
-                # Intelligent fallback based on stage
-                return self._generate_fallback_questions(conversation_stage, missing_areas)
+            # Parse the JSON response, accepting an object or a bare array
+            parsed = self._parse_structured("generate_socratic_questions", response, SocraticQuestions)
+            if parsed and parsed.get("questions"):
+                # Validate and enhance questions
+                return self._validate_and_enhance_questions(parsed["questions"], conversation_stage, missing_areas)
+            
+            # Intelligent fallback based on stage
+            return self._generate_fallback_questions(conversation_stage, missing_areas)
                 
         except Exception as e:
             print(f"Question generation error: {e}")
@@ -631,20 +980,34 @@ The more details you can share, the better I can help you create a comprehensive
         return False
     
     def _summarize_conversation_history(self, conversation_history: List[Dict[str, Any]]) -> str:
-        """Create a concise summary of the conversation history"""
+        """Create a concise summary of the most recent turns"""
         
         if not conversation_history:
             return "No previous conversation"
         
         summary_parts = []
+        first_turn = max(len(conversation_history) - settings.SESSION_RECENT_TURNS, 0) + 1
         
-        for i, entry in enumerate(conversation_history[-3:], 1):  # Last 3 interactions
+        for i, entry in enumerate(conversation_history[-settings.SESSION_RECENT_TURNS:], first_turn):
             user_msg = entry.get("user_message", "")[:100]
             intent = entry.get("intent_analysis", {}).get("intent_type", "unknown")
             summary_parts.append(f"{i}. User: {user_msg}... (Intent: {intent})")
         
         return "\n".join(summary_parts)
     
+    def _summarize_earlier_turns(
+        self,
+        conversation_history: List[Dict[str, Any]],
+        conversation_summary: Optional[Dict[str, Any]]
+    ) -> str:
+        """Rolling summary of the session, empty while every turn is sent verbatim"""
+        
+        if len(conversation_history) <= settings.SESSION_RECENT_TURNS:
+            return ""
+        
+        summary = summarize_history(conversation_history, conversation_summary)
+        return f"SESSION SUMMARY (all turns):\n{render_summary(summary)}"
+    
     def _validate_and_enhance_questions(self, questions: List[str], stage: str, missing_areas: List[str]) -> List[str]:
         """Validate and enhance generated questions"""
         
@@ -717,21 +1080,31 @@ The more details you can share, the better I can help you create a comprehensive
             "How can I help you move forward with your requirements?"
         ]
     
-    async def generate_rsd(self, context: Dict[str, Any], conversation_history: List[Dict[str, Any]]) -> Dict[str, Any]:
+    @traced()
+    async def generate_rsd(
+        self,
+        context: Dict[str, Any],
+        conversation_history: List[Dict[str, Any]],
+        conversation_summary: Optional[Dict[str, Any]] = None,
+        deadline: Optional[float] = None
+    ) -> Dict[str, Any]:
         """
         Generate comprehensive Requirements Specification Document using 一键升级-uplus methodology
         
         This method creates a complete, machine-parseable RSD that captures 100% of user intent
         and serves as the foundation for BITCUP model generation.
+        
+        The prompt carries the rolling session summary plus the most recent
+        turns, so its size does not grow with the length of the session.
         """
         
+        summary = summarize_history(conversation_history, conversation_summary)
+        
         # Analyze conversation completeness and extract key insights
-        conversation_analysis = self._analyze_conversation_completeness(context, conversation_history)
+        conversation_analysis = self._analyze_conversation_completeness(context, summary)
         
         # Enhanced system prompt for RSD generation
-        system_prompt = f"""
-        {self.ai_pm_persona}
-        
+        instructions = """
         TASK: Generate a comprehensive Requirements Specification Document (RSD)
         
         You are creating the definitive specification that will be used to generate BITCUP models
@@ -740,32 +1113,32 @@ The more details you can share, the better I can help you create a comprehensive
         CRITICAL SUCCESS FACTOR: The RSD must capture 100% of user intent. This is non-negotiable.
         
         RSD STRUCTURE (JSON format):
-        {{
-            "project_overview": {{
+        {
+            "project_overview": {
                 "name": "Project name",
                 "description": "Comprehensive project description",
                 "business_context": "Why this project matters",
                 "success_vision": "What success looks like"
-            }},
-            "stakeholders": {{
+            },
+            "stakeholders": {
                 "primary_users": ["List of primary user types"],
                 "secondary_users": ["List of secondary user types"],
                 "stakeholders": ["List of business stakeholders"],
                 "decision_makers": ["List of decision makers"]
-            }},
-            "functional_requirements": {{
+            },
+            "functional_requirements": {
                 "user_stories": [
-                    {{
+                    {
                         "id": "US001",
                         "role": "user role",
                         "goal": "what they want to do",
                         "benefit": "why they want it",
                         "acceptance_criteria": ["list of criteria"],
                         "priority": "High/Medium/Low"
-                    }}
+                    }
                 ],
                 "use_cases": [
-                    {{
+                    {
                         "id": "UC001",
                         "name": "Use case name",
                         "description": "Detailed description",
@@ -774,214 +1147,228 @@ The more details you can share, the better I can help you create a comprehensive
                         "main_flow": ["Step-by-step main flow"],
                         "alternative_flows": ["Alternative scenarios"],
                         "postconditions": ["Expected outcomes"]
-                    }}
+                    }
                 ],
                 "business_rules": [
-                    {{
+                    {
                         "id": "BR001",
                         "rule": "Business rule description",
                         "rationale": "Why this rule exists",
                         "impact": "What happens if violated"
-                    }}
+                    }
                 ],
                 "feature_requirements": [
-                    {{
+                    {
                         "feature": "Feature name",
                         "description": "Detailed description",
                         "priority": "High/Medium/Low",
                         "dependencies": ["List of dependencies"],
                         "acceptance_criteria": ["List of criteria"]
-                    }}
+                    }
                 ]
-            }},
-            "non_functional_requirements": {{
-                "performance": {{
+            },
+            "non_functional_requirements": {
+                "performance": {
                     "response_time": "Maximum acceptable response time",
                     "throughput": "Expected transaction volume",
                     "concurrent_users": "Number of simultaneous users",
                     "availability": "Uptime requirements"
-                }},
-                "security": {{
+                },
+                "security": {
                     "authentication": "Authentication requirements",
                     "authorization": "Access control requirements",
                     "data_protection": "Data security requirements",
                     "compliance": "Regulatory compliance needs"
-                }},
-                "usability": {{
+                },
+                "usability": {
                     "user_experience": "UX requirements",
                     "accessibility": "Accessibility standards",
                     "learning_curve": "Training requirements",
                     "error_handling": "Error management approach"
-                }},
-                "reliability": {{
+                },
+                "reliability": {
                     "error_rate": "Acceptable error rate",
                     "recovery_time": "Disaster recovery requirements",
                     "data_integrity": "Data consistency requirements",
                     "backup_requirements": "Backup and restore needs"
-                }},
-                "scalability": {{
+                },
+                "scalability": {
                     "user_growth": "Expected user growth",
                     "data_growth": "Expected data volume growth",
                     "geographic_expansion": "Multi-region requirements",
                     "feature_expansion": "Future feature considerations"
-                }}
-            }},
-            "constraints": {{
+                }
+            },
+            "constraints": {
                 "technical": [
-                    {{
+                    {
                         "constraint": "Technical limitation",
                         "description": "Detailed explanation",
                         "impact": "How it affects the solution",
                         "mitigation": "How to work around it"
-                    }}
+                    }
                 ],
                 "business": [
-                    {{
+                    {
                         "constraint": "Business limitation",
                         "description": "Detailed explanation",
                         "impact": "How it affects the project",
                         "mitigation": "How to manage it"
-                    }}
+                    }
                 ],
                 "regulatory": [
-                    {{
+                    {
                         "regulation": "Regulatory requirement",
                         "description": "What must be complied with",
                         "impact": "How it affects the solution",
                         "compliance_approach": "How to ensure compliance"
-                    }}
+                    }
                 ],
-                "timeline": {{
+                "timeline": {
                     "project_deadline": "Overall project deadline",
                     "milestone_deadlines": ["Key milestone dates"],
                     "critical_path": "Most time-sensitive requirements"
-                }},
-                "budget": {{
+                },
+                "budget": {
                     "total_budget": "Overall budget constraint",
                     "budget_breakdown": "How budget is allocated",
                     "cost_priorities": "What to prioritize if budget is tight"
-                }}
-            }},
-            "success_criteria": {{
+                }
+            },
+            "success_criteria": {
                 "business_metrics": [
-                    {{
+                    {
                         "metric": "Business metric name",
                         "target": "Target value",
                         "measurement": "How to measure",
                         "timeline": "When to achieve"
-                    }}
+                    }
                 ],
                 "user_metrics": [
-                    {{
+                    {
                         "metric": "User satisfaction metric",
                         "target": "Target value",
                         "measurement": "How to measure",
                         "timeline": "When to achieve"
-                    }}
+                    }
                 ],
                 "technical_metrics": [
-                    {{
+                    {
                         "metric": "Technical metric name",
                         "target": "Target value",
                         "measurement": "How to measure",
                         "timeline": "When to achieve"
-                    }}
+                    }
                 ],
                 "acceptance_tests": [
-                    {{
+                    {
                         "test": "Acceptance test description",
                         "criteria": "Pass/fail criteria",
                         "priority": "High/Medium/Low"
-                    }}
+                    }
                 ]
-            }},
+            },
             "assumptions": [
-                {{
+                {
                     "assumption": "What we're assuming",
                     "rationale": "Why we're making this assumption",
                     "risk": "What happens if assumption is wrong",
                     "validation": "How to validate this assumption"
-                }}
+                }
             ],
             "risks": [
-                {{
+                {
                     "risk": "Risk description",
                     "probability": "High/Medium/Low",
                     "impact": "High/Medium/Low",
                     "mitigation": "How to mitigate",
                     "contingency": "Backup plan"
-                }}
+                }
             ],
             "integration_requirements": [
-                {{
+                {
                     "system": "External system name",
                     "type": "Type of integration",
                     "data_exchange": "What data is exchanged",
                     "frequency": "How often",
                     "requirements": "Specific integration requirements"
-                }}
+                }
             ]
-        }}
+        }
         
+        Generate a comprehensive RSD that captures all discussed requirements and fills in reasonable
+        defaults for any missing areas based on industry best practices.
+        """
+        
+        analysis_context = f"""
         ANALYSIS CONTEXT:
         - Conversation Completeness: {conversation_analysis['completeness_score']:.1%}
         - Missing Areas: {conversation_analysis['missing_areas']}
         - Key Insights: {conversation_analysis['key_insights']}
-        
-        Generate a comprehensive RSD that captures all discussed requirements and fills in reasonable
-        defaults for any missing areas based on industry best practices.
         """
         
         # Prepare comprehensive context for AI
         rsd_context = {
             "conversation_analysis": conversation_analysis,
             "context_summary": self._create_detailed_context_summary(context),
-            "conversation_insights": self._extract_conversation_insights(conversation_history),
-            "requirement_coverage": self._assess_requirement_coverage(context, conversation_history)
+            "conversation_insights": self._extract_conversation_insights(summary),
+            "requirement_coverage": self._assess_requirement_coverage(context, summary)
         }
         
-        messages = [
-            {
-                "role": "user",
-                "content": f"""
-                RSD GENERATION CONTEXT:
-                {json.dumps(rsd_context, indent=2)}
-                
-                CONVERSATION HISTORY ANALYSIS:
-                {self._create_detailed_conversation_analysis(conversation_history)}
-                
+        prompt = self._budget_prompt("generate_rsd", [
+            self._persona_section(),
+            PromptSection("instructions", instructions, required=True),
+            PromptSection("analysis", analysis_context, priority=30),
+            PromptSection(
+                "context",
+                f"RSD GENERATION CONTEXT:\n{json.dumps(rsd_context, ensure_ascii=False, indent=1)}",
+                priority=20,
+                role="user"
+            ),
+            PromptSection("summary", f"SESSION SUMMARY:\n{render_summary(summary)}", priority=15, role="user"),
+            PromptSection(
+                "history",
+                f"CONVERSATION HISTORY ANALYSIS:\n{self._create_detailed_conversation_analysis(conversation_history)}",
+                priority=5,
+                role="user",
+                keep="tail"
+            ),
+            PromptSection(
+                "request",
+                """
                 Generate a comprehensive Requirements Specification Document that captures
                 100% of the user's intent and provides a complete foundation for system development.
-                """
-            }
-        ]
+                """,
+                role="user",
+                required=True
+            )
+        ])
         
         try:
             response = await self.generate_response(
-                messages=messages,
-                system_prompt=system_prompt,
+                messages=prompt.messages,
+                system_prompt=prompt.system_prompt,
                 temperature=0.2,
-                max_tokens=4000
+                max_tokens=4000,
+                task="generate_rsd",
+                json_mode=True,
+                deadline=deadline
             )
             
-            # Try to parse JSON response
-            try:
-                rsd = json.loads(response)
-                
-                # Validate and enhance the RSD
-                rsd = self._validate_and_enhance_rsd(rsd, context, conversation_history)
-                
-                return rsd
-                
-            except json.JSONDecodeError:
+            # Parse the JSON response, keeping what survives a truncated answer
+            rsd = self._parse_structured("generate_rsd", response, RSDContent)
+            if rsd is None:
                 # Create intelligent fallback RSD
                 return self._create_comprehensive_fallback_rsd(context, conversation_history)
+            
+            # Validate and enhance the RSD
+            return self._validate_and_enhance_rsd(rsd, context, conversation_history)
                 
         except Exception as e:
             print(f"RSD generation error: {e}")
             return self._create_error_rsd(context, conversation_history)
     
-    def _analyze_conversation_completeness(self, context: Dict[str, Any], conversation_history: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def _analyze_conversation_completeness(self, context: Dict[str, Any], summary: Dict[str, Any]) -> Dict[str, Any]:
         """Analyze how complete the conversation is for RSD generation"""
         
         required_areas = [
@@ -1001,18 +1388,18 @@ The more details you can share, the better I can help you create a comprehensive
         completeness_score = len(covered_areas) / len(required_areas)
         
         # Extract key insights from conversation
-        key_insights = self._extract_key_insights(context, conversation_history)
+        key_insights = self._extract_key_insights(context, summary)
         
         return {
             "completeness_score": completeness_score,
             "covered_areas": covered_areas,
             "missing_areas": missing_areas,
             "key_insights": key_insights,
-            "conversation_depth": len(conversation_history),
+            "conversation_depth": summary["turns"],
             "readiness_for_rsd": completeness_score >= 0.7
         }
     
-    def _extract_key_insights(self, context: Dict[str, Any], conversation_history: List[Dict[str, Any]]) -> List[str]:
+    def _extract_key_insights(self, context: Dict[str, Any], summary: Dict[str, Any]) -> List[str]:
         """Extract key insights from the conversation"""
         
         insights = []
@@ -1028,16 +1415,14 @@ The more details you can share, the better I can help you create a comprehensive
             insights.append(f"Business value: {context['business_value']}")
         
         # Analyze conversation patterns
-        if len(conversation_history) > 5:
+        if summary["turns"] > 5:
             insights.append("Detailed requirements discussion conducted")
         
         # Look for specific patterns in conversation
-        for entry in conversation_history:
-            intent = entry.get("intent_analysis", {}).get("intent_type", "")
-            if intent == "business_constraint":
-                insights.append("Business constraints identified")
-            elif intent == "technical_constraint":
-                insights.append("Technical constraints discussed")
+        if summary["intents"].get("business_constraint"):
+            insights.append("Business constraints identified")
+        if summary["intents"].get("technical_constraint"):
+            insights.append("Technical constraints discussed")
         
         return insights
     
@@ -1055,24 +1440,17 @@ The more details you can share, the better I can help you create a comprehensive
             "context_richness": len([v for v in context.values() if v])
         }
     
-    def _extract_conversation_insights(self, conversation_history: List[Dict[str, Any]]) -> Dict[str, Any]:
-        """Extract insights from conversation history"""
-        
-        insights = {
-            "total_interactions": len(conversation_history),
-            "intent_distribution": {},
-            "key_topics": [],
-            "user_engagement": "high" if len(conversation_history) > 5 else "medium"
-        }
-        
-        # Analyze intent distribution
-        for entry in conversation_history:
-            intent = entry.get("intent_analysis", {}).get("intent_type", "unknown")
-            insights["intent_distribution"][intent] = insights["intent_distribution"].get(intent, 0) + 1
+    def _extract_conversation_insights(self, summary: Dict[str, Any]) -> Dict[str, Any]:
+        """Extract insights from the session summary"""
         
-        return insights
+        return {
+            "total_interactions": summary["turns"],
+            "intent_distribution": dict(summary["intents"]),
+            "key_topics": summary["features"][:10],
+            "user_engagement": "high" if summary["turns"] > 5 else "medium"
+        }
     
-    def _assess_requirement_coverage(self, context: Dict[str, Any], conversation_history: List[Dict[str, Any]]) -> Dict[str, float]:
+    def _assess_requirement_coverage(self, context: Dict[str, Any], summary: Dict[str, Any]) -> Dict[str, float]:
         """Assess how well different requirement areas are covered"""
         
         coverage = {}
@@ -1083,25 +1461,17 @@ The more details you can share, the better I can help you create a comprehensive
         ]
         
         for area in requirement_areas:
-            coverage[area] = self._calculate_area_coverage(area, context, conversation_history)
+            coverage[area] = self._calculate_area_coverage(area, context, summary)
         
         return coverage
     
-    def _calculate_area_coverage(self, area: str, context: Dict[str, Any], conversation_history: List[Dict[str, Any]]) -> float:
+    def _calculate_area_coverage(self, area: str, context: Dict[str, Any], summary: Dict[str, Any]) -> float:
         """Calculate coverage score for a specific requirement area"""
         
         # This is a simplified calculation - in a real implementation,
         # this would be more sophisticated
         
-        area_keywords = {
-            "functional_requirements": ["feature", "function", "capability", "user story"],
-            "non_functional_requirements": ["performance", "security", "usability", "reliability"],
-            "constraints": ["constraint", "limitation", "budget", "timeline"],
-            "success_criteria": ["success", "metric", "goal", "measure"],
-            "stakeholders": ["user", "stakeholder", "customer", "admin"]
-        }
-        
-        keywords = area_keywords.get(area, [])
+        keywords = COVERAGE_KEYWORDS.get(area, [])
         coverage_score = 0.0
         
         # Check context
@@ -1110,36 +1480,22 @@ The more details you can share, the better I can help you create a comprehensive
                 if value:
                     coverage_score += 0.3
         
-        # Check conversation history
-        for entry in conversation_history:
-            user_msg = entry.get("user_message", "").lower()
-            if any(keyword in user_msg for keyword in keywords):
-                coverage_score += 0.1
+        # User messages mentioning the area, counted as turns were summarized
+        coverage_score += 0.1 * summary["coverage"].get(area, 0)
         
         return min(coverage_score, 1.0)
     
     def _create_detailed_conversation_analysis(self, conversation_history: List[Dict[str, Any]]) -> str:
-        """Create detailed analysis of conversation history"""
+        """Quote the most recent turns; earlier ones are covered by the session summary"""
         
         if not conversation_history:
             return "No conversation history available"
         
         analysis_parts = []
         
-        analysis_parts.append(f"Total Interactions: {len(conversation_history)}")
-        
-        # Analyze intent patterns
-        intents = [entry.get("intent_analysis", {}).get("intent_type", "unknown") 
-                  for entry in conversation_history]
-        intent_counts = {}
-        for intent in intents:
-            intent_counts[intent] = intent_counts.get(intent, 0) + 1
-        
-        analysis_parts.append(f"Intent Distribution: {intent_counts}")
-        
         # Extract key user statements
         key_statements = []
-        for entry in conversation_history[-3:]:  # Last 3 interactions
+        for entry in conversation_history[-settings.SESSION_RECENT_TURNS:]:
             user_msg = entry.get("user_message", "")
             if len(user_msg) > 20:  # Only meaningful statements
                 key_statements.append(user_msg[:150] + "..." if len(user_msg) > 150 else user_msg)
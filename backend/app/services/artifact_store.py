@@ -0,0 +1,179 @@
+"""
+Content-addressed storage for generated code
+
+A generation is stored as a manifest with the same nested shape as its
+layers, where every file body is replaced by the SHA-256 of the body.
+Bodies live once in ``artifact_blobs``, so files that do not change between
+generations (deployment configs, unchanged models) cost nothing to store
+again, and single files can be read without loading the whole generation.
+"""
+
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Set, Tuple
+import hashlib
+
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import AsyncSessionLocal
+from app.models.lowcode import ArtifactBlob, GeneratedCode
+from app.services.code_archive import iter_project_files
+
+# Layers of a generation, mapped to their legacy inline columns
+LAYER_COLUMNS = {
+    "frontend": "frontend_code",
+    "backend": "backend_code",
+    "database": "database_code",
+    "deployment": "deployment_config"
+}
+
+# Blobs fetched per query when materializing or streaming
+READ_BATCH_SIZE = 200
+
+def sha256(content: str) -> str:
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+class ArtifactStore:
+    """Stores generated layers as blobs plus a path -> hash manifest"""
+
+    def split(self, layers: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, str]]:
+        """Replace every file body with its hash; return (manifest, hash -> body)"""
+        blobs: Dict[str, str] = {}
+
+        def walk(node: Any) -> Any:
+            if isinstance(node, dict):
+                return {name: walk(child) for name, child in node.items()}
+            if isinstance(node, str):
+                digest = sha256(node)
+                blobs[digest] = node
+                return digest
+            return node
+
+        return walk(layers), blobs
+
+    async def store(self, db: AsyncSession, layers: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Write the bodies not stored yet and return the manifest
+
+        Runs in the caller's transaction; concurrent writers of the same
+        body are resolved with ON CONFLICT DO NOTHING.
+        """
+        manifest, blobs = self.split(layers)
+        if not blobs:
+            return manifest
+
+        dialect = db.bind.dialect.name
+        insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+
+        existing = await self._existing(db, blobs)
+        rows = [
+            {"sha256": digest, "content": content, "size": len(content.encode("utf-8"))}
+            for digest, content in blobs.items()
+            if digest not in existing
+        ]
+        if rows:
+            await db.execute(insert(ArtifactBlob).on_conflict_do_nothing(index_elements=["sha256"]), rows)
+
+        return manifest
+
+    async def _existing(self, db: AsyncSession, digests: Iterable[str]) -> Set[str]:
+        found = set()
+        digests = list(digests)
+
+        for i in range(0, len(digests), READ_BATCH_SIZE):
+            result = await db.execute(
+                select(ArtifactBlob.sha256).where(ArtifactBlob.sha256.in_(digests[i:i + READ_BATCH_SIZE]))
+            )
+            found.update(result.scalars().all())
+
+        return found
+
+    async def fetch(self, db: AsyncSession, digests: Iterable[str]) -> Dict[str, str]:
+        """Load the bodies of ``digests``"""
+        bodies = {}
+        digests = list(dict.fromkeys(digests))
+
+        for i in range(0, len(digests), READ_BATCH_SIZE):
+            result = await db.execute(
+                select(ArtifactBlob.sha256, ArtifactBlob.content)
+                .where(ArtifactBlob.sha256.in_(digests[i:i + READ_BATCH_SIZE]))
+            )
+            bodies.update(result.tuples().all())
+
+        return bodies
+
+    async def load_layers(self, db: AsyncSession, code: GeneratedCode) -> Dict[str, Any]:
+        """Materialize every layer of a generation"""
+        return (await self.load_many(db, [code]))[0]
+
+    async def load_many(self, db: AsyncSession, codes: List[GeneratedCode]) -> List[Dict[str, Any]]:
+        """Materialize several generations with one blob lookup"""
+        digests = [digest for code in codes for digest in self._leaves(code.file_manifest or {})]
+        bodies = await self.fetch(db, digests)
+
+        def fill(node: Any) -> Any:
+            if isinstance(node, dict):
+                return {name: fill(child) for name, child in node.items()}
+            if isinstance(node, str):
+                return bodies.get(node, "")
+            return node
+
+        layers = []
+        for code in codes:
+            if code.file_manifest is None:
+                # Generated before the artifact store
+                layers.append(self._inline_layers(code))
+            else:
+                layers.append(fill(code.file_manifest))
+
+        return layers
+
+    async def read_file(self, db: AsyncSession, code: GeneratedCode, path: str) -> Optional[str]:
+        """Read one file by its layer path, e.g. ``backend/models/user.py``"""
+        if code.file_manifest is None:
+            node: Any = self._inline_layers(code)
+        else:
+            node = code.file_manifest
+
+        for part in path.strip("/").split("/"):
+            if not isinstance(node, dict) or part not in node:
+                return None
+            node = node[part]
+
+        if not isinstance(node, str):
+            return None
+
+        if code.file_manifest is None:
+            return node
+
+        return (await self.fetch(db, [node])).get(node)
+
+    async def iter_project_batches(self, code: GeneratedCode) -> AsyncIterator[List[Tuple[str, str]]]:
+        """
+        Yield the project tree of a generation as batches of (path, body)
+
+        Bodies are fetched ``READ_BATCH_SIZE`` at a time in a dedicated
+        session, so a streamed download holds one batch in memory.
+        """
+        if code.file_manifest is None:
+            yield list(iter_project_files(self._inline_layers(code)))
+            return
+
+        entries = list(iter_project_files(code.file_manifest))
+
+        async with AsyncSessionLocal() as db:
+            for i in range(0, len(entries), READ_BATCH_SIZE):
+                batch = entries[i:i + READ_BATCH_SIZE]
+                bodies = await self.fetch(db, [digest for _, digest in batch])
+                yield [(path, bodies.get(digest, "")) for path, digest in batch]
+
+    def _inline_layers(self, code: GeneratedCode) -> Dict[str, Any]:
+        return {layer: getattr(code, column) or {} for layer, column in LAYER_COLUMNS.items()}
+
+    def _leaves(self, node: Any) -> List[str]:
+        if isinstance(node, dict):
+            return [digest for child in node.values() for digest in self._leaves(child)]
+        return [node] if isinstance(node, str) else []
+
+# Create singleton instance
+artifact_store = ArtifactStore()
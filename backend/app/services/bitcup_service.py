@@ -3,11 +3,45 @@ BITCUP Modeling Language Service
 Universal semantic language that expresses "what" not "how"
 """
 
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
+from concurrent.futures import ProcessPoolExecutor
+import asyncio
 import json
-import re
+import os
 from datetime import datetime
+from app.core.cache import LRUCache, content_hash
 from app.core.config import settings
+from app.core.metrics import metrics
+from app.core.tracing import traced
+from app.models.bitcup_model import BitcupModel
+from app.services.semantic_patterns import SemanticPatternEngine
+
+# RSD sections analyzed in the map stage, in document order, with the
+# prefix their elements use in BITCUP ``source`` ids
+RSD_SECTIONS = {
+    "user_stories": "US",
+    "use_cases": "UC",
+    "business_rules": "BR",
+    "feature_requirements": "FEATURE"
+}
+
+# Sections of a BITCUP model that define its semantics; generation
+# timestamps and statistics are left out of the semantic hash
+SEMANTIC_SECTIONS = (
+    "business_context", "entities", "behaviors", "rules",
+    "flows", "events", "views", "constraints", "success_criteria"
+)
+
+# Bump when ``transform_to_implementation_spec`` changes its output, so
+# specs materialized by older code are rebuilt on next use
+IMPLEMENTATION_SPEC_VERSION = "1"
+
+# Analysis of one RSD element: (construct, dedup key, element) triples
+Partial = List[Tuple[str, str, Dict[str, Any]]]
+
+def _analyze_chunk(chunk: List[Tuple[str, Dict[str, Any]]]) -> List[Partial]:
+    """Process pool entry point: analyze a slice of RSD elements"""
+    return [bitcup_service._analyze_partial(section, element) for section, element in chunk]
 
 class BitcupService:
     """
@@ -33,6 +67,12 @@ class BitcupService:
         }
         
         self.semantic_patterns = self._initialize_semantic_patterns()
+        self.pattern_engine = SemanticPatternEngine(self.semantic_patterns)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        
+        # Element analyses keyed by content hash, shared across RSD versions
+        self.analysis_cache = LRUCache(settings.BITCUP_ANALYSIS_CACHE_SIZE)
+        metrics.track_cache("bitcup_analysis", self.analysis_cache)
     
     def _initialize_semantic_patterns(self) -> Dict[str, Any]:
         """Initialize semantic pattern recognition"""
@@ -80,16 +120,23 @@ class BitcupService:
             }
         }
     
+    @traced()
     async def generate_bitcup_model(self, rsd_document: Dict[str, Any]) -> Dict[str, Any]:
         """
         Generate BITCUP model from Requirements Specification Document
         
         This method transforms human-readable requirements into a formal,
         machine-parseable semantic model that can be used for code generation.
+        
+        Generation is incremental: each RSD element is fingerprinted and its
+        analysis cached by content hash, so a new RSD version only analyzes
+        the elements that changed. The fingerprints are recorded per
+        ``source`` id in ``metadata.element_index``; elements sharing a
+        source id (e.g. ``US_unknown``) are keyed ``<source>#2``, ``#3``...
         """
         
         # Extract semantic elements from RSD
-        semantic_analysis = self._analyze_rsd_semantics(rsd_document)
+        semantic_analysis, element_index, reused, analyzed = await self._analyze_rsd_semantics_async(rsd_document)
         
         # Generate BITCUP model structure
         bitcup_model = {
@@ -97,7 +144,12 @@ class BitcupService:
                 "version": "1.0",
                 "created_at": datetime.utcnow().isoformat(),
                 "source": "RSD_TRANSFORMATION",
-                "completeness_score": self._calculate_completeness(semantic_analysis)
+                "completeness_score": self._calculate_completeness(semantic_analysis),
+                "element_index": element_index,
+                "incremental": {
+                    "reused_elements": reused,
+                    "analyzed_elements": analyzed
+                }
             },
             "business_context": self._extract_business_context(rsd_document),
             "entities": self._generate_entities(semantic_analysis),
@@ -115,78 +167,175 @@ class BitcupService:
         
         return validated_model
     
-    def _analyze_rsd_semantics(self, rsd_document: Dict[str, Any]) -> Dict[str, Any]:
-        """Analyze RSD document to extract semantic elements"""
+    def _empty_analysis(self) -> Dict[str, List[Dict[str, Any]]]:
+        """Create an analysis with an empty list per core construct"""
         
-        semantic_analysis = {
-            "entities": [],
-            "behaviors": [],
-            "rules": [],
-            "flows": [],
-            "events": [],
-            "views": []
-        }
+        return {construct: [] for construct in self.core_constructs}
+    
+    def _collect_elements(self, rsd_document: Dict[str, Any]) -> List[Tuple[str, Dict[str, Any]]]:
+        """Flatten the functional requirements into (section, element) pairs"""
         
-        # Analyze functional requirements
         functional_reqs = rsd_document.get("functional_requirements", {})
         
-        # Extract from user stories
-        user_stories = functional_reqs.get("user_stories", [])
-        for story in user_stories:
-            semantic_analysis.update(self._analyze_user_story(story))
+        return [
+            (section, element)
+            for section in RSD_SECTIONS
+            for element in functional_reqs.get(section, [])
+        ]
+    
+    def _analyze_element(self, section: str, element: Dict[str, Any]) -> Dict[str, List[Dict[str, Any]]]:
+        """Map stage: analyze one RSD element on its own"""
+        
+        if section == "user_stories":
+            return self._analyze_user_story(element)
+        if section == "use_cases":
+            return self._analyze_use_case(element)
+        if section == "business_rules":
+            analysis = self._empty_analysis()
+            analysis["rules"] = self._analyze_business_rule(element)
+            return analysis
+        return self._analyze_feature(element)
+    
+    def _element_source(self, section: str, element: Dict[str, Any]) -> str:
+        """The ``source`` id the element's BITCUP constructs are tagged with"""
+        
+        if section == "feature_requirements":
+            return f"FEATURE_{element.get('feature', 'unknown')}"
+        return f"{RSD_SECTIONS[section]}_{element.get('id', 'unknown')}"
+    
+    def _analyze_partial(self, section: str, element: Dict[str, Any]) -> Partial:
+        """Analyze one element and precompute the dedup key of each result"""
+        
+        return [
+            (construct, content_hash(item), item)
+            for construct, items in self._analyze_element(section, element).items()
+            for item in items
+        ]
+    
+    def _merge_analyses(self, partials: List[Partial]) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Reduce stage: concatenate per-construct results in document order
         
-        # Extract from use cases
-        use_cases = functional_reqs.get("use_cases", [])
-        for use_case in use_cases:
-            semantic_analysis.update(self._analyze_use_case(use_case))
+        Identical elements (e.g. a feature listed twice) are kept once, at
+        the position they first appeared.
+        """
         
-        # Extract from business rules
-        business_rules = functional_reqs.get("business_rules", [])
-        for rule in business_rules:
-            semantic_analysis["rules"].extend(self._analyze_business_rule(rule))
+        semantic_analysis = self._empty_analysis()
+        seen = set()
         
-        # Extract from feature requirements
-        features = functional_reqs.get("feature_requirements", [])
-        for feature in features:
-            semantic_analysis.update(self._analyze_feature(feature))
+        for partial in partials:
+            for construct, key, item in partial:
+                if (construct, key) not in seen:
+                    seen.add((construct, key))
+                    semantic_analysis[construct].append(item)
         
         return semantic_analysis
     
+    def _lookup_partials(self, elements: List[Tuple[str, Dict[str, Any]]]) -> Tuple[List[str], List[Optional[Partial]]]:
+        """Fingerprint every element and fetch the analyses already cached"""
+        
+        fingerprints = [content_hash([section, element]) for section, element in elements]
+        return fingerprints, [self.analysis_cache.get(fingerprint) for fingerprint in fingerprints]
+    
+    def _element_index(self, elements: List[Tuple[str, Dict[str, Any]]], fingerprints: List[str]) -> Dict[str, str]:
+        """Map each element's source id to its content fingerprint, numbering repeated ids"""
+        
+        index = {}
+        occurrences: Dict[str, int] = {}
+        
+        for (section, element), fingerprint in zip(elements, fingerprints):
+            source = self._element_source(section, element)
+            occurrences[source] = occurrences.get(source, 0) + 1
+            key = source if occurrences[source] == 1 else f"{source}#{occurrences[source]}"
+            index[key] = fingerprint
+        
+        return index
+    
+    async def _analyze_rsd_semantics_async(
+        self,
+        rsd_document: Dict[str, Any]
+    ) -> Tuple[Dict[str, Any], Dict[str, str], int, int]:
+        """
+        Analyze an RSD, reusing cached element analyses
+        
+        Only elements whose fingerprint is not cached are analyzed. When at
+        least ``BITCUP_PARALLEL_THRESHOLD`` of them changed they are split
+        into one chunk per worker and analyzed in a process pool. Returns
+        the merged analysis, the element index and the numbers of reused
+        and analyzed elements.
+        """
+        
+        elements = self._collect_elements(rsd_document)
+        fingerprints, partials = self._lookup_partials(elements)
+        missing = [i for i, partial in enumerate(partials) if partial is None]
+        stale = [elements[i] for i in missing]
+        
+        if len(stale) < settings.BITCUP_PARALLEL_THRESHOLD:
+            analyzed = [self._analyze_partial(section, element) for section, element in stale]
+        else:
+            workers = settings.BITCUP_WORKERS or os.cpu_count() or 1
+            chunk_size = -(-len(stale) // workers)
+            chunks = [stale[i:i + chunk_size] for i in range(0, len(stale), chunk_size)]
+            
+            loop = asyncio.get_running_loop()
+            executor = self._get_executor(workers)
+            results = await asyncio.gather(*(loop.run_in_executor(executor, _analyze_chunk, chunk) for chunk in chunks))
+            analyzed = [partial for result in results for partial in result]
+        
+        for i, partial in zip(missing, analyzed):
+            partials[i] = partial
+            self.analysis_cache.set(fingerprints[i], partial)
+        
+        return (
+            self._merge_analyses(partials),
+            self._element_index(elements, fingerprints),
+            len(elements) - len(missing),
+            len(missing)
+        )
+    
+    def _get_executor(self, workers: int) -> ProcessPoolExecutor:
+        """Create the analysis process pool on first use"""
+        
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=workers)
+        return self._executor
+    
+    def shutdown(self):
+        """Stop the analysis process pool, if it was started"""
+        
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
+    
     def _analyze_user_story(self, user_story: Dict[str, Any]) -> Dict[str, Any]:
         """Analyze individual user story for semantic elements"""
         
-        analysis = {
-            "entities": [],
-            "behaviors": [],
-            "rules": [],
-            "flows": [],
-            "events": [],
-            "views": []
-        }
+        analysis = self._empty_analysis()
         
         # Extract text content
         text_content = f"{user_story.get('goal', '')} {user_story.get('benefit', '')}"
         
+        # Match every pattern category in a single pass
+        matches = self.pattern_engine.scan(text_content)
+        
         # Identify entities
-        for entity_type, pattern in self.semantic_patterns["entity_patterns"].items():
-            if re.search(pattern, text_content.lower()):
-                analysis["entities"].append({
-                    "type": entity_type,
-                    "role": user_story.get("role", "user"),
-                    "context": user_story.get("goal", ""),
-                    "source": f"US_{user_story.get('id', 'unknown')}"
-                })
+        for entity_type in matches.get("entity_patterns", []):
+            analysis["entities"].append({
+                "type": entity_type,
+                "role": user_story.get("role", "user"),
+                "context": user_story.get("goal", ""),
+                "source": f"US_{user_story.get('id', 'unknown')}"
+            })
         
         # Identify behaviors
-        for behavior_type, pattern in self.semantic_patterns["behavior_patterns"].items():
-            if re.search(pattern, text_content.lower()):
-                analysis["behaviors"].append({
-                    "type": behavior_type,
-                    "actor": user_story.get("role", "user"),
-                    "goal": user_story.get("goal", ""),
-                    "priority": user_story.get("priority", "Medium"),
-                    "source": f"US_{user_story.get('id', 'unknown')}"
-                })
+        for behavior_type in matches.get("behavior_patterns", []):
+            analysis["behaviors"].append({
+                "type": behavior_type,
+                "actor": user_story.get("role", "user"),
+                "goal": user_story.get("goal", ""),
+                "priority": user_story.get("priority", "Medium"),
+                "source": f"US_{user_story.get('id', 'unknown')}"
+            })
         
         # Extract acceptance criteria as rules
         acceptance_criteria = user_story.get("acceptance_criteria", [])
@@ -202,14 +351,7 @@ class BitcupService:
     def _analyze_use_case(self, use_case: Dict[str, Any]) -> Dict[str, Any]:
         """Analyze use case for semantic elements"""
         
-        analysis = {
-            "entities": [],
-            "behaviors": [],
-            "rules": [],
-            "flows": [],
-            "events": [],
-            "views": []
-        }
+        analysis = self._empty_analysis()
         
         # Analyze main flow for sequence
         main_flow = use_case.get("main_flow", [])
@@ -255,14 +397,7 @@ class BitcupService:
     def _analyze_feature(self, feature: Dict[str, Any]) -> Dict[str, Any]:
         """Analyze feature for semantic elements"""
         
-        analysis = {
-            "entities": [],
-            "behaviors": [],
-            "rules": [],
-            "flows": [],
-            "events": [],
-            "views": []
-        }
+        analysis = self._empty_analysis()
         
         # Feature typically represents a behavior or view
         feature_name = feature.get("feature", "").lower()
@@ -490,6 +625,62 @@ class BitcupService:
         
         return implementation_spec
     
+    def semantic_hash(self, bitcup_model: Dict[str, Any]) -> str:
+        """Content hash of the semantic sections of a BITCUP model"""
+        
+        return content_hash({section: bitcup_model.get(section) for section in SEMANTIC_SECTIONS})
+    
+    def implementation_spec_key(self, semantic_hash: str) -> str:
+        """Cache key of the implementation spec derived from a semantic model"""
+        
+        return content_hash([IMPLEMENTATION_SPEC_VERSION, semantic_hash])
+    
+    async def materialize_model(self, record: BitcupModel, bitcup_model: Dict[str, Any]):
+        """
+        Write a BITCUP model document onto its row, with its implementation spec
+        
+        The spec is derived here, once per model version, so code
+        generation reads it instead of re-deriving it.
+        """
+        
+        record.entities = bitcup_model["entities"]
+        record.behaviors = bitcup_model["behaviors"]
+        record.rules = bitcup_model["rules"]
+        record.flows = bitcup_model["flows"]
+        record.events = bitcup_model["events"]
+        record.views = bitcup_model["views"]
+        record.validation_results = bitcup_model.get("validation", {})
+        record.quality_score = bitcup_model["metadata"].get("completeness_score", 0.0)
+        record.generation_metadata = {
+            "metadata": bitcup_model["metadata"],
+            "business_context": bitcup_model.get("business_context", {}),
+            "constraints": bitcup_model.get("constraints", {}),
+            "success_criteria": bitcup_model.get("success_criteria", [])
+        }
+        record.semantic_hash = self.semantic_hash(bitcup_model)
+        
+        await self.get_implementation_spec(record)
+    
+    async def get_implementation_spec(self, record: BitcupModel) -> Dict[str, Any]:
+        """
+        Implementation spec of a stored model, from its materialized copy
+        
+        The spec is rebuilt only when it is missing or was derived from
+        other content or by another spec version; the caller persists the
+        row when that happens.
+        """
+        
+        if record.semantic_hash is None:
+            # Stored before specs were materialized
+            record.semantic_hash = self.semantic_hash(record.business_model)
+        
+        key = self.implementation_spec_key(record.semantic_hash)
+        if record.implementation_spec is None or record.implementation_spec_key != key:
+            record.implementation_spec = await self.transform_to_implementation_spec(record.business_model)
+            record.implementation_spec_key = key
+        
+        return record.implementation_spec
+    
     def _generate_architecture_spec(self, bitcup_model: Dict[str, Any]) -> Dict[str, Any]:
         """Generate architecture specification from BITCUP model"""
         
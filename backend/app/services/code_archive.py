@@ -0,0 +1,153 @@
+"""
+Streaming archives of generated code
+
+Generated layers are laid out as a project tree and written one file at a
+time into a ZIP or tar.gz stream. Each chunk is handed to the caller as
+soon as its file is compressed, so the server never holds a whole archive
+in memory.
+"""
+
+from typing import Any, AsyncIterator, Dict, Iterable, Iterator, List, Tuple
+import io
+import tarfile
+import time
+import zipfile
+
+from starlette.concurrency import run_in_threadpool
+
+# (layer, group) -> directory of the group's files in the project tree
+PROJECT_LAYOUT = {
+    ("frontend", "components"): "frontend/src/components",
+    ("backend", "models"): "backend/app/models",
+    ("backend", "endpoints"): "backend/app/api/endpoints",
+    ("database", "schemas"): "database/schemas",
+    ("database", "migrations"): "database/migrations",
+    ("database", "seed_data"): "database/seed_data",
+    ("deployment", "docker"): "",
+    ("deployment", "kubernetes"): "k8s"
+}
+
+# Groups describing the skeleton layout rather than generated files
+SKIPPED_GROUPS = {"structure"}
+
+ARCHIVE_MEDIA_TYPES = {
+    "zip": "application/zip",
+    "tar.gz": "application/gzip"
+}
+
+def iter_project_files(layers: Dict[str, Dict[str, Any]]) -> Iterator[Tuple[str, str]]:
+    """
+    Yield (path, content) for every generated file
+
+    Groups without an entry in ``PROJECT_LAYOUT`` are placed under
+    ``<layer>/<group>``; nested dicts become subdirectories.
+    """
+    for layer, groups in layers.items():
+        for group, files in (groups or {}).items():
+            if group in SKIPPED_GROUPS or not isinstance(files, dict):
+                continue
+
+            directory = PROJECT_LAYOUT.get((layer, group), f"{layer}/{group}")
+            yield from _walk(directory, files)
+
+def _walk(directory: str, files: Dict[str, Any]) -> Iterator[Tuple[str, str]]:
+    for name, content in files.items():
+        path = f"{directory}/{name}" if directory else name
+        if isinstance(content, dict):
+            yield from _walk(path, content)
+        elif isinstance(content, str):
+            yield path, content
+
+class _ChunkBuffer(io.RawIOBase):
+    """Write-only, non-seekable sink whose contents are drained per file"""
+
+    def __init__(self):
+        self._chunks = []
+        self._offset = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._offset += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._offset
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+class ArchiveWriter:
+    """
+    Incremental archive writer
+
+    ``add`` compresses one file and returns the bytes ready to send;
+    ``close`` returns the trailer. Only the current file is buffered.
+    """
+
+    def __init__(self, archive_format: str, root: str):
+        self.root = root
+        self._buffer = _ChunkBuffer()
+        self._mtime = time.time()
+
+        if archive_format == "tar.gz":
+            self._tar = tarfile.open(fileobj=self._buffer, mode="w|gz")
+            self._zip = None
+        else:
+            self._zip = zipfile.ZipFile(self._buffer, mode="w", compression=zipfile.ZIP_DEFLATED)
+            self._tar = None
+
+    def add(self, path: str, content: str) -> bytes:
+        data = content.encode("utf-8")
+        name = f"{self.root}/{path}"
+
+        if self._zip is not None:
+            info = zipfile.ZipInfo(name, date_time=time.localtime(self._mtime)[:6])
+            info.compress_type = zipfile.ZIP_DEFLATED
+            self._zip.writestr(info, data)
+        else:
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            info.mtime = self._mtime
+            self._tar.addfile(info, io.BytesIO(data))
+
+        return self._buffer.drain()
+
+    def close(self) -> bytes:
+        (self._zip or self._tar).close()
+        return self._buffer.drain()
+
+def stream_archive(files: Iterable[Tuple[str, str]], archive_format: str, root: str) -> Iterator[bytes]:
+    """Stream (path, content) pairs as an archive in the requested format"""
+    writer = ArchiveWriter(archive_format, root)
+
+    for path, content in files:
+        chunk = writer.add(path, content)
+        if chunk:
+            yield chunk
+
+    yield writer.close()
+
+async def stream_archive_batches(
+    batches: AsyncIterator[List[Tuple[str, str]]],
+    archive_format: str,
+    root: str
+) -> AsyncIterator[bytes]:
+    """
+    Stream files that are loaded asynchronously in batches
+
+    Compression runs in the threadpool so the event loop stays free.
+    """
+    writer = ArchiveWriter(archive_format, root)
+
+    async for batch in batches:
+        for path, content in batch:
+            chunk = await run_in_threadpool(writer.add, path, content)
+            if chunk:
+                yield chunk
+
+    yield writer.close()
@@ -0,0 +1,84 @@
+"""
+Compiled code templates for the low-code generator
+
+Templates live in per-framework packs under ``app/templates/codegen``:
+one directory per framework holding Jinja2 templates (``<name>.<ext>.j2``)
+and a ``pack.json`` with the generated project's ``app_structure``. Every
+template is compiled once at startup; compiled bytecode is shared across
+processes through Jinja2's filesystem bytecode cache.
+"""
+
+from pathlib import Path
+from typing import Any, Dict
+import json
+
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, StrictUndefined, Template
+
+from app.core.cache import content_hash
+from app.core.config import settings
+
+TEMPLATE_ROOT = Path(__file__).resolve().parent.parent / "templates" / "codegen"
+
+class TemplatePack:
+    """Compiled templates and project layout of one framework"""
+
+    def __init__(self, framework: str, templates: Dict[str, Template], app_structure: Dict[str, Any]):
+        self.framework = framework
+        self.templates = templates
+        self.app_structure = app_structure
+
+class CodeTemplateEngine:
+    """
+    Loads every template pack once and renders artifacts from them
+
+    ``version`` fingerprints the sources of all packs, so caches keyed on
+    it are invalidated whenever a template file changes.
+    """
+
+    def __init__(self, root: Path = TEMPLATE_ROOT):
+        self.environment = Environment(
+            loader=FileSystemLoader(str(root)),
+            bytecode_cache=FileSystemBytecodeCache() if settings.CODEGEN_TEMPLATE_BYTECODE_CACHE else None,
+            undefined=StrictUndefined,
+            keep_trailing_newline=True,
+            auto_reload=False,
+            autoescape=False
+        )
+        self.packs: Dict[str, TemplatePack] = {}
+        sources = {}
+
+        for pack_dir in sorted(path for path in root.iterdir() if path.is_dir()):
+            pack_file = pack_dir / "pack.json"
+            manifest = json.loads(pack_file.read_text(encoding="utf-8")) if pack_file.exists() else {}
+
+            templates = {}
+            for template_file in sorted(pack_dir.glob("*.j2")):
+                name = template_file.name.split(".", 1)[0]
+                templates[name] = self.environment.get_template(f"{pack_dir.name}/{template_file.name}")
+                sources[f"{pack_dir.name}/{template_file.name}"] = template_file.read_text(encoding="utf-8")
+
+            sources[f"{pack_dir.name}/pack.json"] = manifest
+            self.packs[pack_dir.name] = TemplatePack(pack_dir.name, templates, manifest.get("app_structure", {}))
+
+        self.version = content_hash(sources)
+
+    def app_structure(self, framework: str) -> Dict[str, Any]:
+        """Project layout of a framework, empty when it has no pack"""
+        pack = self.packs.get(framework)
+        return pack.app_structure if pack else {}
+
+    def render(self, framework: str, name: str, **context: Any) -> str:
+        """
+        Render template ``name`` of a framework pack
+
+        Frameworks without a pack, or packs without that template, render
+        an empty artifact.
+        """
+        pack = self.packs.get(framework)
+        if pack is None or name not in pack.templates:
+            return ""
+
+        return pack.templates[name].render(**context)
+
+# Create singleton instance
+code_template_engine = CodeTemplateEngine()
@@ -0,0 +1,149 @@
+"""
+Rolling summaries of requirement sessions
+
+Every turn is folded into a running summary stored on the session, so
+prompts carry the summary plus the last few turns instead of the whole
+dialogue. Folding is deterministic: it reuses the intent analysis already
+attached to each turn and makes no LLM call.
+"""
+
+from typing import Any, Dict, List, Optional
+import copy
+
+from app.core.config import settings
+
+# Summary lists, and where each turn's intent analysis keeps their items
+SUMMARY_LISTS = {
+    "features": ("extracted_info", "key_features"),
+    "user_types": ("extracted_info", "user_types"),
+    "constraints": ("extracted_info", "constraints"),
+    "entities": ("semantic_analysis", "entities"),
+    "success_criteria": ("semantic_analysis", "success_criteria")
+}
+
+# Keywords whose mentions in user messages are counted per requirement area
+COVERAGE_KEYWORDS = {
+    "functional_requirements": ["feature", "function", "capability", "user story"],
+    "non_functional_requirements": ["performance", "security", "usability", "reliability"],
+    "constraints": ["constraint", "limitation", "budget", "timeline"],
+    "success_criteria": ["success", "metric", "goal", "measure"],
+    "stakeholders": ["user", "stakeholder", "customer", "admin"]
+}
+
+# Intents whose user message is quoted as a requirement statement
+STATEMENT_INTENTS = {
+    "functional_requirement",
+    "non_functional_requirement",
+    "business_constraint",
+    "technical_constraint",
+    "user_story"
+}
+
+STATEMENT_LENGTH = 200
+
+def empty_summary() -> Dict[str, Any]:
+    return {
+        "turns": 0,
+        "intents": {},
+        "coverage": {},
+        **{name: [] for name in SUMMARY_LISTS},
+        "business_value": "",
+        "statements": [],
+        "missing_info": []
+    }
+
+def fold_turn(summary: Optional[Dict[str, Any]], entry: Dict[str, Any]) -> Dict[str, Any]:
+    """Return ``summary`` with one more dialogue entry folded in"""
+    folded = copy.deepcopy(summary) if summary else empty_summary()
+    _fold(folded, entry)
+    return folded
+
+def summarize_history(
+    conversation_history: List[Dict[str, Any]],
+    summary: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """
+    Bring ``summary`` up to date with ``conversation_history``
+
+    Only the turns the summary has not seen are folded; sessions stored
+    before summaries existed are summarized from scratch once.
+    """
+    if not summary or summary.get("turns", 0) > len(conversation_history):
+        summary = empty_summary()
+    elif summary["turns"] == len(conversation_history):
+        return summary
+    else:
+        summary = copy.deepcopy(summary)
+
+    for entry in conversation_history[summary["turns"]:]:
+        _fold(summary, entry)
+
+    return summary
+
+def _fold(summary: Dict[str, Any], entry: Dict[str, Any]):
+    analysis = entry.get("intent_analysis") or {}
+    intent = analysis.get("intent_type", "unknown")
+    message = entry.get("user_message", "")
+
+    summary["turns"] += 1
+    summary["intents"][intent] = summary["intents"].get(intent, 0) + 1
+
+    lowered = message.lower()
+    for area, keywords in COVERAGE_KEYWORDS.items():
+        if any(keyword in lowered for keyword in keywords):
+            summary["coverage"][area] = summary["coverage"].get(area, 0) + 1
+
+    for name, (group, field) in SUMMARY_LISTS.items():
+        values = (analysis.get(group) or {}).get(field) or []
+        _extend(summary[name], [values] if isinstance(values, str) else values)
+
+    business_value = (analysis.get("extracted_info") or {}).get("business_value")
+    if business_value and isinstance(business_value, str):
+        summary["business_value"] = business_value
+
+    # Early statements are kept: later ones remain visible as recent turns
+    text = message.strip()
+    if (intent in STATEMENT_INTENTS and len(text) > 20
+            and len(summary["statements"]) < settings.SESSION_SUMMARY_MAX_STATEMENTS):
+        if len(text) > STATEMENT_LENGTH:
+            text = text[:STATEMENT_LENGTH] + "..."
+        summary["statements"].append({"turn": summary["turns"], "intent": intent, "text": text})
+
+    if analysis.get("missing_info"):
+        summary["missing_info"] = [str(item) for item in analysis["missing_info"][:10]]
+
+def _extend(items: List[str], values: List[Any]):
+    """Append new values in first-seen order, up to the configured cap"""
+    seen = {item.lower() for item in items}
+
+    for value in values:
+        if len(items) >= settings.SESSION_SUMMARY_MAX_ITEMS:
+            return
+
+        text = str(value).strip()
+        if text and text.lower() not in seen:
+            seen.add(text.lower())
+            items.append(text)
+
+def render_summary(summary: Dict[str, Any]) -> str:
+    """Plain-text form of a summary for prompts"""
+    lines = [f"Turns so far: {summary['turns']}"]
+
+    if summary["intents"]:
+        lines.append("Intents: " + ", ".join(f"{intent}={count}" for intent, count in summary["intents"].items()))
+
+    for name in SUMMARY_LISTS:
+        if summary[name]:
+            lines.append(f"{name.replace('_', ' ').capitalize()}: {'; '.join(summary[name])}")
+
+    if summary["business_value"]:
+        lines.append(f"Business value: {summary['business_value']}")
+
+    if summary["missing_info"]:
+        lines.append(f"Still missing: {'; '.join(summary['missing_info'])}")
+
+    if summary["statements"]:
+        lines.append("Requirement statements:")
+        lines.extend(f"- [turn {s['turn']}, {s['intent']}] {s['text']}" for s in summary["statements"])
+
+    return "\n".join(lines)
@@ -0,0 +1,374 @@
+"""
+Background job service
+
+Long-running generations are submitted as jobs, stored in the ``jobs``
+table and executed by a bounded pool of in-process workers fed from a
+local asyncio queue, so no external broker is needed. Queued and
+interrupted jobs are picked up again when the application restarts.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Set, Type
+import asyncio
+import os
+import socket
+import time
+import uuid
+
+from fastapi import HTTPException
+from pydantic import BaseModel
+from sqlalchemy import or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal, persist
+from app.core.tracing import trace
+from app.models.job import Job, JobStatus
+
+# progress(fraction, message) reported by handlers while they run
+ProgressCallback = Callable[[float, str], None]
+
+# handler(request, db, progress) -> JSON-compatible result
+JobHandler = Callable[[BaseModel, AsyncSession, ProgressCallback], Awaitable[Dict[str, Any]]]
+
+# load_result(stored result, db) -> response body, for results stored by reference
+ResultLoader = Callable[[Dict[str, Any], AsyncSession], Awaitable[Any]]
+
+@dataclass
+class JobKind:
+    """A registered job type"""
+    request_model: Type[BaseModel]
+    handler: JobHandler
+    load_result: Optional[ResultLoader] = None
+
+def job_event(job: Job) -> Dict[str, Any]:
+    """Public state of a job, as reported by the API and the event stream"""
+    return {
+        "id": job.id,
+        "kind": job.kind,
+        "status": job.status.value if isinstance(job.status, JobStatus) else job.status,
+        "progress": job.progress or 0.0,
+        "message": job.message,
+        "error": job.error
+    }
+
+class JobService:
+    """
+    Job submission, execution and progress events
+
+    Endpoint modules register a handler per job kind; ``submit`` stores
+    the job and queues its id, and ``JOB_WORKERS`` worker tasks execute
+    jobs one at a time each. A job is claimed with a conditional UPDATE
+    from ``queued`` to ``running``, so a job is never executed twice even
+    if its id is queued twice.
+
+    A claimed job carries its owner process and a lease that the owner
+    renews every ``JOB_HEARTBEAT_INTERVAL``. Only running jobs whose lease
+    expired (their process died or hung) are requeued, so several worker
+    processes can share one database, including during rolling restarts.
+    """
+
+    def __init__(self):
+        self.kinds: Dict[str, JobKind] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = {}
+        self._pending_writes: Set[asyncio.Task] = set()
+        self._heartbeat: Optional[asyncio.Task] = None
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+    def register(
+        self,
+        kind: str,
+        request_model: Type[BaseModel],
+        handler: JobHandler,
+        load_result: Optional[ResultLoader] = None
+    ):
+        """
+        Register the handler executing jobs of ``kind``
+
+        Handlers whose output is already stored elsewhere can return a
+        reference and pass ``load_result`` to build the response body from
+        it when the result is fetched.
+        """
+        self.kinds[kind] = JobKind(request_model=request_model, handler=handler, load_result=load_result)
+
+    async def load_result(self, db: AsyncSession, job: Job) -> Any:
+        """The response body of a succeeded job"""
+        kind = self.kinds.get(job.kind)
+        if kind is None or kind.load_result is None or job.result is None:
+            return job.result
+        return await kind.load_result(job.result, db)
+
+    async def start(self):
+        """Start the workers and requeue jobs whose owner is gone"""
+        self._queue = asyncio.Queue()
+
+        async with AsyncSessionLocal() as db:
+            await self._requeue_expired(db)
+
+            result = await db.execute(
+                select(Job.id).where(Job.status == JobStatus.QUEUED).order_by(Job.created_at)
+            )
+            pending = result.scalars().all()
+
+        for job_id in pending:
+            self._queue.put_nowait(job_id)
+
+        self._workers = [asyncio.create_task(self._worker()) for _ in range(settings.JOB_WORKERS)]
+        self._heartbeat = asyncio.create_task(self._heartbeat_loop())
+        print(f"✅ Job workers started ({len(self._workers)} workers, {len(pending)} jobs resumed)")
+
+    async def stop(self):
+        """Cancel the workers and release their jobs for the next process to resume"""
+        tasks = self._workers + ([self._heartbeat] if self._heartbeat else [])
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._workers = []
+        self._heartbeat = None
+
+        try:
+            async with AsyncSessionLocal() as db:
+                await db.execute(
+                    update(Job)
+                    .where(Job.owner == self.owner, Job.status == JobStatus.RUNNING)
+                    .values(status=JobStatus.QUEUED, owner=None, lease_expires_at=None, message="Resumed after restart")
+                )
+                await db.commit()
+        except Exception as e:
+            print(f"Job release error: {e}")
+
+    def _lease_expiry(self) -> datetime:
+        return datetime.now() + timedelta(seconds=settings.JOB_LEASE_SECONDS)
+
+    async def _requeue_expired(self, db: AsyncSession) -> List[str]:
+        """Move running jobs whose lease expired back to queued and return their ids"""
+        result = await db.execute(
+            update(Job)
+            .where(
+                Job.status == JobStatus.RUNNING,
+                # Rows claimed before leases existed have none
+                or_(Job.lease_expires_at.is_(None), Job.lease_expires_at < datetime.now())
+            )
+            .values(status=JobStatus.QUEUED, owner=None, lease_expires_at=None, message="Resumed after its worker stopped")
+            .returning(Job.id)
+        )
+        requeued = result.scalars().all()
+        await db.commit()
+        return requeued
+
+    async def _heartbeat_loop(self):
+        """Renew the leases of this process's jobs and pick up jobs whose owner died"""
+        while True:
+            await asyncio.sleep(settings.JOB_HEARTBEAT_INTERVAL)
+            try:
+                async with AsyncSessionLocal() as db:
+                    await db.execute(
+                        update(Job)
+                        .where(Job.owner == self.owner, Job.status == JobStatus.RUNNING)
+                        .values(lease_expires_at=self._lease_expiry())
+                    )
+                    await db.commit()
+
+                    for job_id in await self._requeue_expired(db):
+                        self._queue.put_nowait(job_id)
+            except Exception as e:
+                print(f"Job heartbeat error: {e}")
+
+    async def submit(self, db: AsyncSession, kind: str, payload: Dict[str, Any]) -> Job:
+        """Validate and store a job, then queue it for execution"""
+        request = self.kinds[kind].request_model.model_validate(payload)
+
+        job = Job(kind=kind, payload=request.model_dump(mode="json"), status=JobStatus.QUEUED)
+        await persist(db, job)
+
+        if self._queue is not None:
+            self._queue.put_nowait(job.id)
+
+        return job
+
+    async def _worker(self):
+        """Execute queued jobs until cancelled"""
+        while True:
+            job_id = await self._queue.get()
+            try:
+                await self._execute(job_id)
+            except Exception as e:
+                print(f"Job worker error: {e}")
+            finally:
+                self._queue.task_done()
+
+    async def _claim(self, db: AsyncSession, job_id: str) -> Optional[Job]:
+        """Move a queued job to running; None if another worker has it"""
+        result = await db.execute(
+            update(Job)
+            .where(Job.id == job_id, Job.status == JobStatus.QUEUED)
+            .values(
+                status=JobStatus.RUNNING,
+                attempts=Job.attempts + 1,
+                started_at=datetime.now(),
+                owner=self.owner,
+                lease_expires_at=self._lease_expiry()
+            )
+        )
+        await db.commit()
+
+        if result.rowcount != 1:
+            return None
+
+        job = await db.get(Job, job_id, populate_existing=True)
+        self._publish(job)
+        return job
+
+    async def _execute(self, job_id: str):
+        """Run one job and record its outcome"""
+        async with AsyncSessionLocal() as db:
+            job = await self._claim(db, job_id)
+            if job is None:
+                return
+
+            if job.attempts > settings.JOB_MAX_ATTEMPTS:
+                await self._finish(db, job, JobStatus.FAILED, error="Job was interrupted too many times")
+                return
+
+            kind = self.kinds.get(job.kind)
+            if kind is None:
+                await self._finish(db, job, JobStatus.FAILED, error=f"Unknown job kind: {job.kind}")
+                return
+
+            last_write = 0.0
+
+            def progress(fraction: float, message: str):
+                nonlocal last_write
+                job.progress = round(min(max(fraction, 0.0), 1.0), 4)
+                job.message = message[:255]
+                self._publish(job)
+
+                # Persist progress for pollers in other processes, throttled
+                now = time.monotonic()
+                if now - last_write >= settings.JOB_PROGRESS_INTERVAL:
+                    last_write = now
+                    task = asyncio.create_task(self._store_progress(job.id, job.progress, job.message))
+                    self._pending_writes.add(task)
+                    task.add_done_callback(self._pending_writes.discard)
+
+            # The handler works in its own session so a failure cannot
+            # leave the job row in a rolled back state
+            async with AsyncSessionLocal() as work_db:
+                try:
+                    with trace(f"job {job.kind}", job_id=job.id):
+                        result = await kind.handler(kind.request_model.model_validate(job.payload), work_db, progress)
+                except HTTPException as e:
+                    await work_db.rollback()
+                    await self._finish(db, job, JobStatus.FAILED, error=str(e.detail))
+                    return
+                except Exception as e:
+                    print(f"Job {job.id} ({job.kind}) error: {e}")
+                    await work_db.rollback()
+                    await self._finish(db, job, JobStatus.FAILED, error="Job failed unexpectedly")
+                    return
+
+            await self._finish(db, job, JobStatus.SUCCEEDED, result=result)
+
+    async def _store_progress(self, job_id: str, fraction: float, message: str):
+        async with AsyncSessionLocal() as db:
+            await db.execute(
+                update(Job)
+                .where(Job.id == job_id, Job.status == JobStatus.RUNNING, Job.owner == self.owner)
+                .values(progress=fraction, message=message)
+            )
+            await db.commit()
+
+    async def _finish(
+        self,
+        db: AsyncSession,
+        job: Job,
+        status: JobStatus,
+        result: Optional[Dict[str, Any]] = None,
+        error: Optional[str] = None
+    ):
+        """
+        Record the outcome of a job this process still owns
+
+        The write is conditional on the owner and the running status. A
+        worker whose lease expired (an event loop stall, failing
+        heartbeats) may finish after the job was requeued and claimed
+        elsewhere; its outcome is dropped instead of overwriting the new
+        owner's.
+        """
+        values = {
+            "status": status,
+            "result": result,
+            "error": error,
+            "finished_at": datetime.now(),
+            "lease_expires_at": None
+        }
+        if status == JobStatus.SUCCEEDED:
+            values.update(progress=1.0, message="Completed")
+
+        # Progress is tracked on the object in memory; detach it so committing
+        # cannot flush those changes unconditionally
+        db.expunge(job)
+        outcome = await db.execute(
+            update(Job)
+            .where(Job.id == job.id, Job.owner == self.owner, Job.status == JobStatus.RUNNING)
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
+        await db.commit()
+
+        if outcome.rowcount != 1:
+            print(f"Job {job.id} ({job.kind}) lost its lease, {status.value} outcome dropped")
+            return
+
+        for name, value in values.items():
+            setattr(job, name, value)
+        self._publish(job)
+
+    async def _poll(self, job_id: str) -> Optional[Dict[str, Any]]:
+        async with AsyncSessionLocal() as db:
+            job = await db.get(Job, job_id)
+            return job_event(job) if job is not None else None
+
+    def _publish(self, job: Job):
+        """Push the job state to every event stream following it"""
+        event = job_event(job)
+        for queue in self._subscribers.get(job.id, ()):
+            queue.put_nowait(event)
+
+    async def events(self, job_id: str) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Yield job states until the job finishes
+
+        Events published by this process arrive immediately; the database
+        is polled every ``JOB_EVENT_POLL_INTERVAL`` seconds to follow jobs
+        executed by another process.
+        """
+        queue: asyncio.Queue = asyncio.Queue()
+        self._subscribers.setdefault(job_id, set()).add(queue)
+
+        try:
+            last = None
+            event = await self._poll(job_id)
+
+            while event is not None:
+                if event != last:
+                    last = event
+                    yield event
+
+                if event["status"] in (JobStatus.SUCCEEDED.value, JobStatus.FAILED.value):
+                    return
+
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=settings.JOB_EVENT_POLL_INTERVAL)
+                except asyncio.TimeoutError:
+                    event = await self._poll(job_id)
+        finally:
+            self._subscribers[job_id].discard(queue)
+            if not self._subscribers[job_id]:
+                del self._subscribers[job_id]
+
+# Create singleton instance
+job_service = JobService()
@@ -5,12 +5,31 @@ This service is responsible for generating code from BITCUP models
 and providing a low-code development environment.
 """
 
-from typing import Dict, Any, List, Optional
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, Any, List, Optional
 from datetime import datetime
+from functools import partial
 import json
 import os
 import asyncio
+from app.core.cache import LRUCache, content_hash
+from app.core.concurrency import GenerationScheduler
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.core.tracing import traced
 from app.services.ai_service import ai_service
+from app.services.code_templates import code_template_engine
+
+# Bump when the inline generators change output for the same input
+CODEGEN_VERSION = "1"
+
+@dataclass
+class Artifact:
+    """One generated file and the model element it is rendered from"""
+    path: str
+    framework: str
+    element: Dict[str, Any]
+    render: Callable[[], Awaitable[str]]
 
 class LowCodeService:
     """
@@ -28,376 +47,325 @@ class LowCodeService:
             "database": ["postgresql", "mongodb", "mysql", "sqlite"]
         }
         
-        self.code_templates = {
-            "vue": self._load_template("vue"),
-            "fastapi": self._load_template("fastapi"),
-            "postgresql": self._load_template("postgresql")
-        }
+        # Compiled per-framework template packs
+        self.templates = code_template_engine
         
         self.default_stack = {
             "frontend": "vue",
             "backend": "fastapi",
             "database": "postgresql"
         }
-    
-    def _load_template(self, framework: str) -> Dict[str, Any]:
-        """Load code template for a framework"""
-        
-        # In a real implementation, this would load from files
-        # For now, we'll use hardcoded templates
-        
-        templates = {
-            "vue": {
-                "app_structure": {
-                    "src": {
-                        "components": {},
-                        "views": {},
-                        "store": {},
-                        "router": {},
-                        "assets": {},
-                        "App.vue": "",
-                        "main.js": ""
-                    },
-                    "public": {
-                        "index.html": ""
-                    },
-                    "package.json": "",
-                    "vite.config.js": ""
-                },
-                "component_template": """
-<template>
-  <div class="{component_name}">
-    <h1>{component_title}</h1>
-    <div class="content">
-      {component_content}
-    </div>
-  </div>
-</template>
-
-<script>
-export default {
-  name: '{component_name}',
-  props: {
-    {component_props}
-  },
-  data() {
-    return {
-      {component_data}
-    }
-  },
-  methods: {
-    {component_methods}
-  }
-}
-</script>
-
-<style scoped>
-{component_styles}
-</style>
-"""
-            },
-            "fastapi": {
-                "app_structure": {
-                    "app": {
-                        "api": {
-                            "endpoints": {},
-                            "routes.py": ""
-                        },
-                        "core": {
-                            "config.py": "",
-                            "database.py": ""
-                        },
-                        "models": {},
-                        "schemas": {},
-                        "services": {},
-                        "main.py": ""
-                    },
-                    "requirements.txt": ""
-                },
-                "model_template": """
-from sqlalchemy import Column, String, Integer, Float, Boolean, ForeignKey, DateTime, Text, JSON
-from sqlalchemy.orm import relationship
-from sqlalchemy.sql import func
-from app.core.database import Base
-import uuid
-
-class {model_name}(Base):
-    __tablename__ = "{table_name}"
-    
-    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
-    {model_fields}
-    created_at = Column(DateTime, server_default=func.now())
-    updated_at = Column(DateTime, onupdate=func.now())
-    
-    {model_relationships}
-"""
-            },
-            "postgresql": {
-                "schema_template": """
-CREATE TABLE IF NOT EXISTS {table_name} (
-    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
-    {table_fields}
-    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
-    updated_at TIMESTAMP WITH TIME ZONE
-);
-
-{table_indexes}
-"""
-            }
-        }
         
-        return templates.get(framework, {})
+        # Rendered artifacts keyed by (template version, element hash, framework)
+        self.template_version = content_hash([CODEGEN_VERSION, self.templates.version])
+        self.artifact_cache = LRUCache(settings.CODEGEN_ARTIFACT_CACHE_SIZE)
+        metrics.track_cache("codegen_artifacts", self.artifact_cache)
     
+    @traced()
     async def generate_code_from_model(
         self, 
         implementation_model: Dict[str, Any],
-        tech_stack: Optional[Dict[str, str]] = None
+        tech_stack: Optional[Dict[str, str]] = None,
+        on_progress: Optional[Callable[[int, int, str], None]] = None
     ) -> Dict[str, Any]:
         """
         Generate code from BITCUP implementation model
         
+        The files of all layers are listed first and looked up in the
+        artifact cache; every artifact that has to be rebuilt is then
+        rendered as its own task, at most ``CODEGEN_MAX_CONCURRENCY`` at a
+        time, so total time tracks the slowest artifacts rather than the
+        sum of all of them.
+        
         Args:
             implementation_model: The implementation specification from BITCUP
             tech_stack: Optional technology stack configuration
+            on_progress: Optional callback receiving (completed, total, path)
+                as each rebuilt artifact finishes
             
         Returns:
-            Dictionary containing generated code artifacts
+            Dictionary containing generated code artifacts, with the files
+            reused from the artifact cache and the files rebuilt listed in
+            ``metadata.manifest``
         """
         
         # Use default stack if none provided
         stack = tech_stack or self.default_stack
+        manifest = {"reused": [], "rebuilt": []}
         
-        # Generate code for each layer
-        frontend_code = await self._generate_frontend_code(implementation_model, stack["frontend"])
-        backend_code = await self._generate_backend_code(implementation_model, stack["backend"])
-        database_code = await self._generate_database_code(implementation_model, stack["database"])
+        # Collect the files of every layer, then render the ones not cached
+        artifacts = [
+            *self._frontend_artifacts(implementation_model, stack["frontend"]),
+            *self._backend_artifacts(implementation_model, stack["backend"]),
+            *self._database_artifacts(implementation_model, stack["database"])
+        ]
+        files = await self._build_artifacts(artifacts, manifest, on_progress)
         
         # Combine all generated code
         generated_code = {
             "metadata": {
                 "generated_at": datetime.utcnow().isoformat(),
                 "tech_stack": stack,
-                "source_model": implementation_model.get("metadata", {})
+                "source_model": implementation_model.get("metadata", {}),
+                "manifest": manifest
+            },
+            "frontend": {
+                "components": self._files_in(files, "frontend/components/"),
+                "structure": self.templates.app_structure(stack["frontend"])
+            },
+            "backend": {
+                "models": self._files_in(files, "backend/models/"),
+                "endpoints": self._files_in(files, "backend/endpoints/"),
+                "structure": self.templates.app_structure(stack["backend"])
+            },
+            "database": {
+                "schemas": self._files_in(files, "database/schemas/"),
+                "migrations": {},
+                "seed_data": {}
             },
-            "frontend": frontend_code,
-            "backend": backend_code,
-            "database": database_code,
             "deployment": self._generate_deployment_config(stack)
         }
         
         return generated_code
     
-    async def _generate_frontend_code(
-        self, 
-        implementation_model: Dict[str, Any],
-        framework: str
-    ) -> Dict[str, Any]:
-        """Generate frontend code based on implementation model"""
+    async def _build_artifacts(
+        self,
+        artifacts: List[Artifact],
+        manifest: Dict[str, List[str]],
+        on_progress: Optional[Callable[[int, int, str], None]] = None
+    ) -> Dict[str, str]:
+        """
+        Return path -> rendered code, rebuilding only artifacts whose inputs changed
         
-        ui_spec = implementation_model.get("user_interface", {})
-        components = ui_spec.get("components", [])
+        The cache key covers the template version, the framework and the
+        content hash of the model element the file is generated from.
+        Every lookup happens before the first render, so progress is
+        reported against the real number of rebuilds.
+        """
         
-        # Get template for the selected framework
-        template = self.code_templates.get(framework, {})
-        component_template = template.get("component_template", "")
+        files: Dict[str, Optional[str]] = {}
+        rebuilds = []
         
-        # Generate components
-        generated_components = {}
-        for component in components:
-            component_name = component.get("name", "UnknownComponent")
-            
-            # Use AI service to generate component code
-            prompt = f"""
-            Generate a {framework} component for '{component_name}' with the following description:
-            {component.get('description', 'No description')}
-            
-            The component should handle these data elements:
-            {json.dumps(component.get('data_elements', []))}
-            
-            And implement these behaviors:
-            {json.dumps(component.get('behaviors', []))}
-            """
+        for artifact in artifacts:
+            key = content_hash([self.template_version, artifact.framework, artifact.path, artifact.element])
+            code = self.artifact_cache.get(key)
             
-            # In a real implementation, we would use the AI service
-            # For now, we'll use a template
-            component_code = component_template.format(
-                component_name=component_name,
-                component_title=component_name.replace("_", " ").title(),
-                component_content=f"<!-- Content for {component_name} -->",
-                component_props="// Props go here",
-                component_data="// Data properties go here",
-                component_methods="// Methods go here",
-                component_styles="/* Styles go here */"
-            )
+            if code is None:
+                manifest["rebuilt"].append(artifact.path)
+                rebuilds.append((key, artifact))
+            else:
+                manifest["reused"].append(artifact.path)
             
-            generated_components[f"{component_name}.vue"] = component_code
+            # Placeholder keeps the file in model order until it is rendered
+            files[artifact.path] = code
         
-        return {
-            "components": generated_components,
-            "structure": template.get("app_structure", {})
-        }
+        scheduler = GenerationScheduler(settings.CODEGEN_MAX_CONCURRENCY, len(rebuilds), on_progress)
+        rendered = await asyncio.gather(*(scheduler.run(artifact.path, artifact.render) for _, artifact in rebuilds))
+        
+        for (key, artifact), code in zip(rebuilds, rendered):
+            self.artifact_cache.set(key, code)
+            files[artifact.path] = code
+        
+        return files
     
-    async def _generate_backend_code(
-        self, 
-        implementation_model: Dict[str, Any],
-        framework: str
-    ) -> Dict[str, Any]:
-        """Generate backend code based on implementation model"""
+    def _files_in(self, files: Dict[str, str], directory: str) -> Dict[str, str]:
+        """Files directly under ``directory``, keyed by file name"""
         
-        data_model = implementation_model.get("data_model", {})
-        api_spec = implementation_model.get("api_specification", {})
+        return {path[len(directory):]: code for path, code in files.items() if path.startswith(directory)}
+    
+    def _frontend_artifacts(self, implementation_model: Dict[str, Any], framework: str) -> List[Artifact]:
+        """Frontend files: one component per UI component"""
         
-        # Get template for the selected framework
-        template = self.code_templates.get(framework, {})
-        model_template = template.get("model_template", "")
+        components = implementation_model.get("user_interface", {}).get("components", [])
         
-        # Generate models
-        generated_models = {}
-        for model in data_model.get("models", []):
-            model_name = model.get("name", "UnknownModel")
-            table_name = model_name.lower() + "s"
-            
-            # Generate model fields
-            fields = []
-            for field in model.get("fields", []):
-                field_name = field.get("name", "unknown_field")
-                field_type = field.get("type", "String")
-                field_nullable = "nullable=True" if field.get("nullable", True) else "nullable=False"
-                
-                # Map field type to SQLAlchemy type
-                sa_type = {
-                    "string": "String",
-                    "integer": "Integer",
-                    "float": "Float",
-                    "boolean": "Boolean",
-                    "datetime": "DateTime",
-                    "text": "Text",
-                    "json": "JSON"
-                }.get(field_type.lower(), "String")
-                
-                fields.append(f"{field_name} = Column({sa_type}, {field_nullable})")
-            
-            # Generate relationships
-            relationships = []
-            for rel in model.get("relationships", []):
-                rel_name = rel.get("name", "unknown_relation")
-                rel_model = rel.get("model", "UnknownModel")
-                rel_type = rel.get("type", "one_to_many")
-                
-                if rel_type == "one_to_many":
-                    relationships.append(f"{rel_name} = relationship(\"{rel_model}\")")
-                elif rel_type == "many_to_one":
-                    relationships.append(f"{rel_name}_id = Column(String, ForeignKey(\"{rel_model.lower()}s.id\"))")
-                    relationships.append(f"{rel_name} = relationship(\"{rel_model}\")")
-            
-            # Format model code
-            model_code = model_template.format(
-                model_name=model_name,
-                table_name=table_name,
-                model_fields="\n    ".join(fields),
-                model_relationships="\n    ".join(relationships)
+        return [
+            Artifact(
+                f"frontend/components/{component.get('name', 'UnknownComponent')}.vue",
+                framework,
+                component,
+                partial(self._render_component, component, framework)
             )
-            
-            generated_models[f"{model_name.lower()}.py"] = model_code
-        
-        # Generate API endpoints
-        generated_endpoints = {}
-        for endpoint in api_spec.get("endpoints", []):
-            endpoint_name = endpoint.get("name", "unknown_endpoint")
-            endpoint_path = endpoint.get("path", "/")
-            endpoint_method = endpoint.get("method", "GET")
-            
-            # In a real implementation, we would generate actual endpoint code
-            # For now, we'll use a placeholder
-            endpoint_code = f"""
-\"\"\"
-{endpoint_name} API endpoint
-\"\"\"
-
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.ext.asyncio import AsyncSession
-from app.core.database import get_db
-from app.models.{endpoint_name.lower()} import {endpoint_name.capitalize()}
-
-router = APIRouter()
-
-@router.{endpoint_method.lower()}("{endpoint_path}")
-async def {endpoint_name.lower()}(db: AsyncSession = Depends(get_db)):
-    \"\"\"
-    {endpoint_name.replace("_", " ").capitalize()} endpoint
-    \"\"\"
-    # Implementation goes here
-    pass
-"""
-            
-            generated_endpoints[f"{endpoint_name.lower()}.py"] = endpoint_code
+            for component in components
+        ]
+    
+    async def _render_component(self, component: Dict[str, Any], framework: str) -> str:
+        """Render one frontend component"""
         
-        return {
-            "models": generated_models,
-            "endpoints": generated_endpoints,
-            "structure": template.get("app_structure", {})
-        }
+        component_name = component.get("name", "UnknownComponent")
+        
+        # Use AI service to generate component code
+        prompt = f"""
+        Generate a {framework} component for '{component_name}' with the following description:
+        {component.get('description', 'No description')}
+        
+        The component should handle these data elements:
+        {json.dumps(component.get('data_elements', []))}
+        
+        And implement these behaviors:
+        {json.dumps(component.get('behaviors', []))}
+        """
+        
+        # In a real implementation, we would use the AI service
+        # For now, we'll use a template
+        component_code = self.templates.render(
+            framework,
+            "component",
+            component_name=component_name,
+            component_title=component_name.replace("_", " ").title(),
+            component_content=f"<!-- Content for {component_name} -->",
+            component_props="// Props go here",
+            component_data="// Data properties go here",
+            component_methods="// Methods go here",
+            component_styles="/* Styles go here */"
+        )
+        
+        return component_code
     
-    async def _generate_database_code(
-        self, 
-        implementation_model: Dict[str, Any],
-        database: str
-    ) -> Dict[str, Any]:
-        """Generate database code based on implementation model"""
+    def _backend_artifacts(self, implementation_model: Dict[str, Any], framework: str) -> List[Artifact]:
+        """Backend files: one ORM model per data model and one module per API endpoint"""
         
-        data_model = implementation_model.get("data_model", {})
+        models = implementation_model.get("data_model", {}).get("models", [])
+        endpoints = implementation_model.get("api_specification", {}).get("endpoints", [])
         
-        # Get template for the selected database
-        template = self.code_templates.get(database, {})
-        schema_template = template.get("schema_template", "")
+        return [
+            *(
+                Artifact(
+                    f"backend/models/{model.get('name', 'UnknownModel').lower()}.py",
+                    framework,
+                    model,
+                    partial(self._render_model, model, framework)
+                )
+                for model in models
+            ),
+            *(
+                Artifact(
+                    f"backend/endpoints/{endpoint.get('name', 'unknown_endpoint').lower()}.py",
+                    framework,
+                    endpoint,
+                    partial(self._render_endpoint, endpoint, framework)
+                )
+                for endpoint in endpoints
+            )
+        ]
+    
+    async def _render_model(self, model: Dict[str, Any], framework: str) -> str:
+        """Render one backend ORM model"""
         
-        # Generate schemas
-        generated_schemas = {}
-        for model in data_model.get("models", []):
-            model_name = model.get("name", "UnknownModel")
-            table_name = model_name.lower() + "s"
+        model_name = model.get("name", "UnknownModel")
+        table_name = model_name.lower() + "s"
+        
+        # Generate model fields
+        fields = []
+        for field in model.get("fields", []):
+            field_name = field.get("name", "unknown_field")
+            field_type = field.get("type", "String")
+            field_nullable = "nullable=True" if field.get("nullable", True) else "nullable=False"
             
-            # Generate table fields
-            fields = []
-            for field in model.get("fields", []):
-                field_name = field.get("name", "unknown_field")
-                field_type = field.get("type", "text")
-                field_nullable = "NULL" if field.get("nullable", True) else "NOT NULL"
-                
-                # Map field type to SQL type
-                sql_type = {
-                    "string": "VARCHAR(255)",
-                    "integer": "INTEGER",
-                    "float": "FLOAT",
-                    "boolean": "BOOLEAN",
-                    "datetime": "TIMESTAMP WITH TIME ZONE",
-                    "text": "TEXT",
-                    "json": "JSONB"
-                }.get(field_type.lower(), "TEXT")
-                
-                fields.append(f"{field_name} {sql_type} {field_nullable}")
+            # Map field type to SQLAlchemy type
+            sa_type = {
+                "string": "String",
+                "integer": "Integer",
+                "float": "Float",
+                "boolean": "Boolean",
+                "datetime": "DateTime",
+                "text": "Text",
+                "json": "JSON"
+            }.get(field_type.lower(), "String")
             
-            # Generate indexes
-            indexes = []
-            for field in model.get("fields", []):
-                if field.get("indexed", False):
-                    field_name = field.get("name", "unknown_field")
-                    indexes.append(f"CREATE INDEX IF NOT EXISTS idx_{table_name}_{field_name} ON {table_name}({field_name});")
+            fields.append(f"{field_name} = Column({sa_type}, {field_nullable})")
+        
+        # Generate relationships
+        relationships = []
+        for rel in model.get("relationships", []):
+            rel_name = rel.get("name", "unknown_relation")
+            rel_model = rel.get("model", "UnknownModel")
+            rel_type = rel.get("type", "one_to_many")
             
-            # Format schema code
-            schema_code = schema_template.format(
-                table_name=table_name,
-                table_fields=",\n    ".join(fields),
-                table_indexes="\n".join(indexes)
+            if rel_type == "one_to_many":
+                relationships.append(f"{rel_name} = relationship(\"{rel_model}\")")
+            elif rel_type == "many_to_one":
+                relationships.append(f"{rel_name}_id = Column(String, ForeignKey(\"{rel_model.lower()}s.id\"))")
+                relationships.append(f"{rel_name} = relationship(\"{rel_model}\")")
+        
+        # Render model code
+        return self.templates.render(
+            framework,
+            "model",
+            model_name=model_name,
+            table_name=table_name,
+            model_fields=fields,
+            model_relationships=relationships
+        )
+    
+    async def _render_endpoint(self, endpoint: Dict[str, Any], framework: str) -> str:
+        """Render one backend API endpoint module"""
+        
+        # In a real implementation, we would generate actual endpoint code
+        # For now, we'll use a placeholder
+        return self.templates.render(
+            framework,
+            "endpoint",
+            endpoint_name=endpoint.get("name", "unknown_endpoint"),
+            endpoint_path=endpoint.get("path", "/"),
+            endpoint_method=endpoint.get("method", "GET")
+        )
+    
+    def _database_artifacts(self, implementation_model: Dict[str, Any], database: str) -> List[Artifact]:
+        """Database files: one table schema per data model"""
+        
+        models = implementation_model.get("data_model", {}).get("models", [])
+        
+        return [
+            Artifact(
+                f"database/schemas/{model.get('name', 'UnknownModel').lower()}s.sql",
+                database,
+                model,
+                partial(self._render_schema, model, database)
             )
+            for model in models
+        ]
+    
+    async def _render_schema(self, model: Dict[str, Any], database: str) -> str:
+        """Render one SQL table schema"""
+        
+        model_name = model.get("name", "UnknownModel")
+        table_name = model_name.lower() + "s"
+        
+        # Generate table fields
+        fields = []
+        for field in model.get("fields", []):
+            field_name = field.get("name", "unknown_field")
+            field_type = field.get("type", "text")
+            field_nullable = "NULL" if field.get("nullable", True) else "NOT NULL"
             
-            generated_schemas[f"{table_name}.sql"] = schema_code
+            # Map field type to SQL type
+            sql_type = {
+                "string": "VARCHAR(255)",
+                "integer": "INTEGER",
+                "float": "FLOAT",
+                "boolean": "BOOLEAN",
+                "datetime": "TIMESTAMP WITH TIME ZONE",
+                "text": "TEXT",
+                "json": "JSONB"
+            }.get(field_type.lower(), "TEXT")
+            
+            fields.append(f"{field_name} {sql_type} {field_nullable}")
         
-        return {
-            "schemas": generated_schemas,
-            "migrations": {},
-            "seed_data": {}
-        }
+        # Generate indexes
+        indexes = []
+        for field in model.get("fields", []):
+            if field.get("indexed", False):
+                field_name = field.get("name", "unknown_field")
+                indexes.append(f"CREATE INDEX IF NOT EXISTS idx_{table_name}_{field_name} ON {table_name}({field_name});")
+        
+        # Render schema code
+        return self.templates.render(
+            database,
+            "schema",
+            table_name=table_name,
+            table_fields=fields,
+            table_indexes=indexes
+        )
     
     def _generate_deployment_config(self, stack: Dict[str, str]) -> Dict[str, Any]:
         """Generate deployment configuration"""
@@ -9,7 +9,20 @@ import hashlib
 from datetime import datetime, timedelta
 from collections import defaultdict
 import re
+import time
 from app.core.config import settings
+from app.core.metrics import metrics
+from app.core.tracing import traced
+
+MEMORY_GRAPH_SIZE = metrics.gauge(
+    "uplus_memory_graph_size",
+    "Entries in the knowledge graph by collection (nodes, edges, patterns, insights)",
+    ("collection",)
+)
+MEMORY_INGESTION_LAG_SECONDS = metrics.histogram(
+    "uplus_memory_ingestion_lag_seconds",
+    "Time from receiving an interaction until it is linked, matched and analyzed in the graph"
+)
 
 class MemoryService:
     """
@@ -36,6 +49,7 @@ class MemoryService:
         self.pattern_recognition = PatternRecognition()
         self.insight_engine = InsightEngine()
         
+    @traced()
     async def store_interaction(self, interaction_data: Dict[str, Any]) -> str:
         """
         Store interaction in the temporal knowledge graph
@@ -44,6 +58,7 @@ class MemoryService:
         temporal relationships to other interactions.
         """
         
+        received = time.perf_counter()
         interaction_id = self._generate_interaction_id(interaction_data)
         timestamp = datetime.utcnow()
         
@@ -71,8 +86,12 @@ class MemoryService:
         # Generate insights
         await self._generate_insights(interaction_id, interaction_node)
         
+        MEMORY_INGESTION_LAG_SECONDS.observe(time.perf_counter() - received)
+        self._record_graph_size()
+        
         return interaction_id
     
+    @traced()
     async def store_decision(self, decision_data: Dict[str, Any]) -> str:
         """
         Store decision with full context and rationale
@@ -109,8 +128,11 @@ class MemoryService:
         # Link to related interactions and decisions
         await self._link_decision_to_context(decision_id, decision_node)
         
+        self._record_graph_size()
+        
         return decision_id
     
+    @traced()
     async def store_outcome(self, outcome_data: Dict[str, Any]) -> str:
         """
         Store outcome and link to related decisions
@@ -143,6 +165,8 @@ class MemoryService:
         # Learn from the outcome
         await self._learn_from_outcome(outcome_id, outcome_node)
         
+        self._record_graph_size()
+        
         return outcome_id
     
     async def query_memory(self, query: Dict[str, Any]) -> Dict[str, Any]:
@@ -221,6 +245,11 @@ class MemoryService:
         
         return predictions
     
+    def _record_graph_size(self):
+        """Publish the size of the knowledge graph to the metrics registry"""
+        for collection in ("nodes", "edges", "patterns", "insights"):
+            MEMORY_GRAPH_SIZE.set(len(self.knowledge_graph[collection]), collection=collection)
+    
     def _generate_interaction_id(self, interaction_data: Dict[str, Any]) -> str:
         """Generate unique ID for interaction"""
         content = json.dumps(interaction_data, sort_keys=True)
@@ -0,0 +1,127 @@
+"""
+Model routing for LLM calls
+
+Each task type is served by a named profile (``fast``, ``balanced``,
+``strong``) with its own model, API base, timeout, concurrency limit and
+fallback profiles, so frequent short calls such as intent analysis can go
+to a quick model while RSD generation gets the most capable one.
+"""
+
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+import asyncio
+
+from app.core.config import settings
+
+PROFILE_NAMES = ("fast", "balanced", "strong")
+
+@dataclass
+class ModelProfile:
+    """One model configuration calls can be routed to"""
+    name: str
+    model: str
+    api_base: Optional[str]
+    timeout: float
+    max_concurrency: int
+    fallbacks: List[str] = field(default_factory=list)
+
+def load_profiles() -> Dict[str, ModelProfile]:
+    """Build the profiles from the ``AI_PROFILE_<NAME>_*`` settings"""
+    profiles = {}
+
+    for name in PROFILE_NAMES:
+        prefix = f"AI_PROFILE_{name.upper()}_"
+        profiles[name] = ModelProfile(
+            name=name,
+            model=getattr(settings, prefix + "MODEL") or settings.LITELLM_MODEL,
+            api_base=getattr(settings, prefix + "API_BASE") or settings.LITELLM_API_BASE or None,
+            timeout=getattr(settings, prefix + "TIMEOUT"),
+            max_concurrency=max(1, getattr(settings, prefix + "CONCURRENCY")),
+            fallbacks=list(getattr(settings, prefix + "FALLBACKS"))
+        )
+
+    return profiles
+
+class ModelRouter:
+    """
+    Picks the profiles a task is tried with and limits calls per profile
+
+    Unknown profile names in the task map or in fallbacks are ignored, so a
+    typo in the configuration degrades to the default profile.
+    """
+
+    def __init__(self, profiles: Optional[Dict[str, ModelProfile]] = None):
+        self.profiles = profiles or load_profiles()
+        self.task_profiles = dict(settings.AI_TASK_PROFILES)
+        self.default_profile = settings.AI_DEFAULT_PROFILE
+        self._semaphores = {
+            name: asyncio.Semaphore(profile.max_concurrency) for name, profile in self.profiles.items()
+        }
+        self.stats: Dict[str, Dict[str, int]] = {}
+
+    def profile_for(self, task: str) -> ModelProfile:
+        """The primary profile of ``task``"""
+        name = self.task_profiles.get(task, self.default_profile)
+        return self.profiles.get(name) or self.profiles[self.default_profile]
+
+    def chain(self, task: str) -> List[ModelProfile]:
+        """The primary profile of ``task`` followed by its fallbacks, without repeats"""
+        chain = [self.profile_for(task)]
+
+        for name in chain[0].fallbacks:
+            profile = self.profiles.get(name)
+            if profile is not None and profile not in chain:
+                chain.append(profile)
+
+        return chain
+
+    @asynccontextmanager
+    async def slot(self, profile: ModelProfile):
+        """Hold one of the concurrent call slots of ``profile``"""
+        stats = self._stats(profile.name)
+
+        async with self._semaphores[profile.name]:
+            stats["in_flight"] += 1
+            try:
+                yield
+            finally:
+                stats["in_flight"] -= 1
+
+    def record(self, profile: ModelProfile, outcome: str):
+        """Count a call of ``profile`` as ``succeeded``, ``failed`` or ``timed_out``"""
+        stats = self._stats(profile.name)
+        stats[outcome] = stats.get(outcome, 0) + 1
+
+    def record_fallback(self, profile: ModelProfile):
+        """Count a call handed to ``profile`` after an earlier profile failed"""
+        self._stats(profile.name)["fallback_calls"] += 1
+
+    def _stats(self, name: str) -> Dict[str, int]:
+        return self.stats.setdefault(name, {
+            "succeeded": 0,
+            "failed": 0,
+            "timed_out": 0,
+            "fallback_calls": 0,
+            "in_flight": 0
+        })
+
+    def report(self) -> Dict[str, Any]:
+        """Routing table, profiles and call counters, safe to serialize"""
+        return {
+            "tasks": {task: self.profile_for(task).name for task in self.task_profiles},
+            "default_profile": self.default_profile,
+            "profiles": {
+                name: {
+                    "model": profile.model,
+                    "timeout": profile.timeout,
+                    "max_concurrency": profile.max_concurrency,
+                    "fallbacks": profile.fallbacks,
+                    **self._stats(name)
+                }
+                for name, profile in self.profiles.items()
+            }
+        }
+
+# Create singleton instance
+model_router = ModelRouter()
@@ -0,0 +1,231 @@
+"""
+Token budgets for LLM prompts
+
+Prompts are assembled from named sections (persona, instructions, context,
+history) instead of one formatted string. Every section is counted, and
+when a prompt exceeds the budget of its task the lowest-priority sections
+are swapped for their compact form and then trimmed line by line until it
+fits. Required sections, such as the output schema and the user input,
+are never touched.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+import math
+import re
+import textwrap
+
+# Characters that BPE tokenizers encode as roughly one token each
+WIDE_CHARACTERS = re.compile("[\u2e80-\u9fff\uac00-\ud7af\uf900-\ufaff\uff00-\uffef]")
+
+# Average characters per token for the remaining text
+CHARS_PER_TOKEN = 4
+
+TRIM_MARKERS = {
+    "head": "[... truncated]",
+    "tail": "[... earlier entries omitted]"
+}
+
+def estimate_tokens(text: str) -> int:
+    """
+    Approximate token count of ``text``
+
+    A fast stand-in for the provider tokenizer: one token per CJK character
+    and one per ``CHARS_PER_TOKEN`` characters of everything else.
+    """
+    if not text:
+        return 0
+
+    wide = len(WIDE_CHARACTERS.findall(text))
+    return wide + math.ceil((len(text) - wide) / CHARS_PER_TOKEN)
+
+def normalize(text: str) -> str:
+    """Strip the indentation and blank edges that triple-quoted prompts carry"""
+    return textwrap.dedent(text).strip()
+
+@dataclass
+class PromptSection:
+    """
+    One named part of a prompt
+
+    Sections with a higher ``priority`` are trimmed last. ``keep`` picks
+    the end that survives trimming: ``head`` for summaries that lead with
+    the essentials, ``tail`` for histories where the latest turns matter.
+    """
+    name: str
+    content: str
+    priority: int = 0
+    role: str = "system"
+    required: bool = False
+    compact: Optional[str] = None
+    keep: str = "head"
+
+@dataclass
+class BudgetedPrompt:
+    """A prompt fitted to its budget, with per-section token counts"""
+    system_prompt: str
+    messages: List[Dict[str, str]]
+    budget: int
+    tokens: Dict[str, int] = field(default_factory=dict)
+    original_tokens: int = 0
+    trimmed: List[str] = field(default_factory=list)
+
+    @property
+    def total_tokens(self) -> int:
+        return sum(self.tokens.values())
+
+def fit_prompt(sections: List[PromptSection], budget: int) -> BudgetedPrompt:
+    """
+    Assemble ``sections`` into a system prompt and a user message within ``budget``
+
+    A prompt whose required sections alone exceed the budget is returned
+    with every optional section trimmed away rather than failing.
+    """
+    texts = {section.name: normalize(section.content) for section in sections}
+    tokens = {name: estimate_tokens(text) for name, text in texts.items()}
+    original = sum(tokens.values())
+    trimmed = []
+
+    excess = original - budget
+    for section in sorted((s for s in sections if not s.required), key=lambda s: s.priority):
+        if excess <= 0:
+            break
+
+        name = section.name
+        if section.compact is not None:
+            compact = normalize(section.compact)
+            compact_tokens = estimate_tokens(compact)
+            if compact_tokens < tokens[name]:
+                excess -= tokens[name] - compact_tokens
+                texts[name], tokens[name] = compact, compact_tokens
+                trimmed.append(name)
+
+        if excess > 0:
+            text = _truncate(texts[name], max(tokens[name] - excess, 0), section.keep)
+            excess -= tokens[name] - estimate_tokens(text)
+            texts[name], tokens[name] = text, estimate_tokens(text)
+            if name not in trimmed:
+                trimmed.append(name)
+
+    def join(role: str) -> str:
+        return "\n\n".join(texts[s.name] for s in sections if s.role == role and texts[s.name])
+
+    user_message = join("user")
+
+    return BudgetedPrompt(
+        system_prompt=join("system"),
+        messages=[{"role": "user", "content": user_message}] if user_message else [],
+        budget=budget,
+        tokens=tokens,
+        original_tokens=original,
+        trimmed=trimmed
+    )
+
+def _truncate(text: str, allowance: int, keep: str) -> str:
+    """Keep whole lines from the ``keep`` end of ``text`` within ``allowance`` tokens"""
+    marker = TRIM_MARKERS[keep]
+    remaining = allowance - estimate_tokens(marker)
+    if remaining <= 0:
+        return ""
+
+    lines = text.splitlines()
+    if keep == "tail":
+        lines.reverse()
+
+    kept = []
+    for line in lines:
+        cost = estimate_tokens(line) + 1
+        if cost > remaining:
+            break
+        kept.append(line)
+        remaining -= cost
+
+    if not kept:
+        # Not even one line fits, e.g. a single-line JSON context: cut the line itself
+        piece = _cut(lines[0], remaining - 1, keep)
+        if not piece:
+            return ""
+        kept = [piece]
+
+    if keep == "tail":
+        kept.reverse()
+        return "\n".join([marker] + kept)
+
+    return "\n".join(kept + [marker])
+
+def _cut(line: str, allowance: int, keep: str) -> str:
+    """The longest prefix (``head``) or suffix (``tail``) of ``line`` within ``allowance`` tokens"""
+    if allowance <= 0:
+        return ""
+
+    # Start from the average ratio and shrink proportionally; CJK text needs fewer characters
+    size = min(len(line), allowance * CHARS_PER_TOKEN)
+    while size > 0:
+        piece = line[:size] if keep == "head" else line[len(line) - size:]
+        tokens = estimate_tokens(piece)
+        if tokens <= allowance:
+            return piece
+        size = min(size - 1, size * allowance // tokens)
+
+    return ""
+
+class TokenUsage:
+    """
+    Token counters per LLM task
+
+    Prompt counts come from the provider's usage report when the call
+    reaches the API, and from ``estimate_tokens`` for fallback responses.
+    """
+
+    def __init__(self):
+        self.tasks: Dict[str, Dict[str, Any]] = {}
+
+    def _task(self, task: str) -> Dict[str, Any]:
+        return self.tasks.setdefault(task, {
+            "calls": 0,
+            "fallback_calls": 0,
+            "prompt_tokens": 0,
+            "completion_tokens": 0,
+            "budgeted_prompts": 0,
+            "trimmed_prompts": 0,
+            "tokens_trimmed": 0,
+            "structured_output": {"parsed": 0, "repaired": 0, "failed": 0, "fallback": 0},
+            "last_call": None
+        })
+
+    def record_prompt(self, task: str, prompt: BudgetedPrompt):
+        """Record how a prompt was fitted to its budget"""
+        stats = self._task(task)
+        stats["budgeted_prompts"] += 1
+        if prompt.trimmed:
+            stats["trimmed_prompts"] += 1
+            stats["tokens_trimmed"] += prompt.original_tokens - prompt.total_tokens
+
+    def record_call(self, task: str, prompt_tokens: int, completion_tokens: int, fallback: bool = False):
+        """Record the token counts of one LLM call"""
+        stats = self._task(task)
+        stats["calls"] += 1
+        stats["fallback_calls"] += int(fallback)
+        stats["prompt_tokens"] += prompt_tokens
+        stats["completion_tokens"] += completion_tokens
+        stats["last_call"] = {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "fallback": fallback
+        }
+
+    def record_parse(self, task: str, outcome: str):
+        """Record whether a structured response parsed cleanly, after repair, not at all, or came from the fallback"""
+        outcomes = self._task(task)["structured_output"]
+        outcomes[outcome] = outcomes.get(outcome, 0) + 1
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Copy of the counters, safe to serialize"""
+        return {
+            task: {
+                **stats,
+                "structured_output": dict(stats["structured_output"]),
+                "last_call": dict(stats["last_call"]) if stats["last_call"] else None
+            }
+            for task, stats in self.tasks.items()
+        }
@@ -0,0 +1,66 @@
+"""
+Compiled semantic pattern matching for BITCUP analysis
+"""
+
+from typing import Dict, List, Pattern, Tuple
+import re
+
+# Patterns of the form \b(word|word|...)\b can be merged into one keyword scan
+_KEYWORD_ALTERNATION = re.compile(r"^\\b\((?P<keywords>[\w|]+)\)\\b$")
+
+class SemanticPatternEngine:
+    """
+    Single-pass matcher over every semantic pattern category
+
+    Each keyword is indexed to the (category, type) pairs whose pattern
+    contains it, and all keywords are compiled into one alternation. A text
+    is lowercased once and scanned once, however many categories exist.
+    Patterns that are not plain keyword alternations are compiled on their
+    own and searched individually.
+    """
+
+    def __init__(self, semantic_patterns: Dict[str, Dict[str, str]]):
+        # (category, type) pairs in declaration order, for stable results
+        self._declared: List[Tuple[str, str]] = []
+        self._keyword_index: Dict[str, List[Tuple[str, str]]] = {}
+        self._standalone: List[Tuple[str, str, Pattern]] = []
+
+        for category, patterns in semantic_patterns.items():
+            for pattern_type, pattern in patterns.items():
+                self._declared.append((category, pattern_type))
+
+                match = _KEYWORD_ALTERNATION.match(pattern)
+                if match:
+                    for keyword in match.group("keywords").split("|"):
+                        self._keyword_index.setdefault(keyword, []).append((category, pattern_type))
+                else:
+                    self._standalone.append((category, pattern_type, re.compile(pattern)))
+
+        # Longest keywords first so prefixes never shadow a longer match
+        keywords = sorted(self._keyword_index, key=len, reverse=True)
+        self._matcher = re.compile(r"\b(?:" + "|".join(map(re.escape, keywords)) + r")\b") if keywords else None
+
+    def scan(self, text: str) -> Dict[str, List[str]]:
+        """
+        Return the matched pattern types per category
+
+        Types are listed in the order the patterns were declared, matching
+        the order a per-pattern ``re.search`` loop would produce.
+        """
+        lowered = text.lower()
+        hits = set()
+
+        if self._matcher is not None:
+            for keyword in set(self._matcher.findall(lowered)):
+                hits.update(self._keyword_index[keyword])
+
+        for category, pattern_type, compiled in self._standalone:
+            if compiled.search(lowered):
+                hits.add((category, pattern_type))
+
+        result: Dict[str, List[str]] = {}
+        for category, pattern_type in self._declared:
+            if (category, pattern_type) in hits:
+                result.setdefault(category, []).append(pattern_type)
+
+        return result
@@ -0,0 +1,230 @@
+"""
+Structured output parsing for LLM responses
+
+Responses are expected to be JSON, but models wrap it in code fences, add
+prose around it, leave trailing commas or stop mid-object when they hit
+the token limit. ``extract_json`` recovers the JSON value from such text,
+and ``parse_structured`` validates it against a Pydantic schema, dropping
+only the fields that fail validation so one bad value does not discard
+the whole response.
+"""
+
+from typing import Annotated, Any, ClassVar, Dict, List, Optional, Tuple, Type
+import json
+import re
+
+from pydantic import BaseModel, BeforeValidator, ConfigDict, Field, ValidationError
+
+CODE_FENCE = re.compile(r"```(?:json|JSON)?\s*(.*?)(?:```|$)", re.DOTALL)
+TRAILING_COMMA = re.compile(r",\s*([}\]])")
+
+# Commas tried, from the end, as cut points for a truncated response
+MAX_CUT_POINTS = 50
+
+# Validation rounds, each dropping the fields that failed the previous one
+MAX_REPAIR_ROUNDS = 3
+
+_DROP = object()
+
+def extract_json(text: Optional[str]) -> Any:
+    """
+    Extract the first JSON object or array from model output
+
+    Returns None when no JSON value can be recovered.
+    """
+    if not text:
+        return None
+
+    fence = CODE_FENCE.search(text)
+    candidate = fence.group(1) if fence else text
+
+    starts = [index for index in (candidate.find("{"), candidate.find("[")) if index >= 0]
+    if not starts:
+        return None
+    start = min(starts)
+
+    try:
+        # Ignores whatever follows the value
+        value, _ = json.JSONDecoder().raw_decode(candidate, start)
+        return value
+    except json.JSONDecodeError:
+        return _complete(candidate[start:])
+
+def _complete(fragment: str) -> Any:
+    """Parse a truncated or slightly malformed JSON value by closing it"""
+    closers: List[str] = []
+    cut_points: List[Tuple[int, List[str]]] = []
+    in_string = escaped = False
+
+    for index, char in enumerate(fragment):
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char in "{[":
+            closers.append("}" if char == "{" else "]")
+        elif char in "}]":
+            if closers:
+                closers.pop()
+            if not closers:
+                # The value ended; anything after it is not ours
+                fragment = fragment[:index + 1]
+                break
+        elif char == ",":
+            cut_points.append((index, list(closers)))
+
+    tail = fragment.rstrip()
+    if in_string:
+        tail += '"'
+    elif tail.endswith(":"):
+        tail += " null"
+
+    candidates = [tail + "".join(reversed(closers))]
+    candidates += [
+        fragment[:index] + "".join(reversed(stack))
+        for index, stack in reversed(cut_points[-MAX_CUT_POINTS:])
+    ]
+
+    for candidate in candidates:
+        try:
+            return json.loads(TRAILING_COMMA.sub(r"\1", candidate))
+        except json.JSONDecodeError:
+            continue
+
+    return None
+
+def parse_structured(text: Optional[str], schema: Type[BaseModel]) -> Tuple[Optional[Dict[str, Any]], str]:
+    """
+    Parse model output into a dict validated by ``schema``
+
+    Returns the data, with only the fields the model actually set, and the
+    outcome: ``parsed``, ``repaired`` (invalid fields were dropped) or
+    ``failed``.
+    """
+    data = extract_json(text)
+    if data is None:
+        return None, "failed"
+
+    list_field = getattr(schema, "list_field", None)
+    if list_field and isinstance(data, list):
+        data = {list_field: data}
+
+    outcome = "parsed"
+    for _ in range(MAX_REPAIR_ROUNDS):
+        try:
+            model = schema.model_validate(data)
+            return model.model_dump(exclude_unset=True), outcome
+        except ValidationError as e:
+            if not isinstance(data, (dict, list)):
+                break
+            for error in e.errors():
+                data = _mark(data, error["loc"])
+            data = _sweep(data)
+            outcome = "repaired"
+
+    return None, "failed"
+
+def _mark(data: Any, location: Tuple[Any, ...]) -> Any:
+    """Replace the value at ``location`` with the drop marker"""
+    if not location:
+        return _DROP
+
+    head, rest = location[0], location[1:]
+    if isinstance(data, dict) and head in data:
+        data[head] = _mark(data[head], rest)
+    elif isinstance(data, list) and isinstance(head, int) and 0 <= head < len(data):
+        data[head] = _mark(data[head], rest)
+
+    return data
+
+def _sweep(data: Any) -> Any:
+    """Remove marked values; dropped keys fall back to their schema default"""
+    if isinstance(data, dict):
+        return {key: _sweep(value) for key, value in data.items() if value is not _DROP}
+    if isinstance(data, list):
+        return [_sweep(value) for value in data if value is not _DROP]
+    return data
+
+def _as_list(value: Any) -> Any:
+    if value is None:
+        return []
+    if isinstance(value, (str, dict)):
+        return [value]
+    return value
+
+def _as_text(value: Any) -> Any:
+    if isinstance(value, dict):
+        for key in ("name", "title", "description", "text"):
+            if isinstance(value.get(key), str):
+                return value[key]
+        return json.dumps(value, ensure_ascii=False)
+    if isinstance(value, (int, float)):
+        return str(value)
+    return value
+
+def _as_object(value: Any) -> Any:
+    return {"description": value} if isinstance(value, str) else value
+
+# Lenient field types: a lone value becomes a one-item list, and items are
+# coerced to the expected shape before validation
+Text = Annotated[str, BeforeValidator(_as_text)]
+TextList = Annotated[List[Text], BeforeValidator(_as_list)]
+ObjectList = Annotated[List[Annotated[Dict[str, Any], BeforeValidator(_as_object)]], BeforeValidator(_as_list)]
+Score = Annotated[float, Field(ge=0.0, le=1.0)]
+
+class LenientModel(BaseModel):
+    """Schema base that keeps fields the schema does not know about"""
+    model_config = ConfigDict(extra="allow")
+
+class SemanticAnalysis(LenientModel):
+    entities: TextList = []
+    relationships: TextList = []
+    success_criteria: TextList = []
+    assumptions: TextList = []
+
+class ExtractedInfo(LenientModel):
+    summary: Text = ""
+    key_features: TextList = []
+    user_types: TextList = []
+    business_value: Text = ""
+    constraints: TextList = []
+
+class IntentAnalysis(LenientModel):
+    """Response of ``AIService.analyze_intent``"""
+    intent_type: Text = "clarification_needed"
+    confidence: Score = 0.5
+    semantic_analysis: SemanticAnalysis = SemanticAnalysis()
+    extracted_info: ExtractedInfo = ExtractedInfo()
+    completeness_score: Score = 0.0
+    missing_info: TextList = []
+    follow_up_questions: TextList = []
+    next_discovery_areas: TextList = []
+
+class SocraticQuestions(BaseModel):
+    """Response of ``AIService.generate_socratic_questions``, as an object or a bare array"""
+    list_field: ClassVar[str] = "questions"
+
+    questions: TextList = []
+
+class FunctionalRequirements(LenientModel):
+    user_stories: ObjectList = []
+    use_cases: ObjectList = []
+    business_rules: ObjectList = []
+    feature_requirements: ObjectList = []
+
+class RSDContent(LenientModel):
+    """Response of ``AIService.generate_rsd``"""
+    project_overview: Dict[str, Any] = {}
+    stakeholders: Dict[str, Any] = {}
+    functional_requirements: FunctionalRequirements = FunctionalRequirements()
+    non_functional_requirements: Dict[str, Any] = {}
+    constraints: Dict[str, Any] = {}
+    success_criteria: Dict[str, Any] = {}
+    assumptions: ObjectList = []
+    risks: ObjectList = []
+    integration_requirements: ObjectList = []
@@ -0,0 +1 @@
+# Benchmarks for 一键升级-uplus backend
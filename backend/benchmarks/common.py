@@ -0,0 +1,79 @@
+"""
+Shared helpers for backend benchmarks
+"""
+
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+import json
+import math
+import statistics
+import time
+
+def measure(name: str, fn: Callable[[], Any], number: int = 100, repeat: int = 5) -> Dict[str, Any]:
+    """Time ``fn`` and return per-call statistics in milliseconds"""
+    fn()  # warm up caches and lazy imports
+
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        samples.append((time.perf_counter() - start) * 1000 / number)
+
+    return {
+        "name": name,
+        "number": number,
+        "repeat": repeat,
+        "best_ms": min(samples),
+        "median_ms": statistics.median(samples),
+        "mean_ms": statistics.mean(samples)
+    }
+
+async def measure_async(
+    name: str,
+    fn: Callable[[], Awaitable[Any]],
+    number: int = 10,
+    repeat: int = 3
+) -> Dict[str, Any]:
+    """Time the coroutine function ``fn`` and return per-call statistics in milliseconds"""
+    await fn()  # warm up caches and lazy imports
+
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            await fn()
+        samples.append((time.perf_counter() - start) * 1000 / number)
+
+    return {
+        "name": name,
+        "number": number,
+        "repeat": repeat,
+        "best_ms": min(samples),
+        "median_ms": statistics.median(samples),
+        "mean_ms": statistics.mean(samples)
+    }
+
+def summarize(name: str, samples_ms: List[float]) -> Dict[str, Any]:
+    """Statistics of individually timed calls, including the nearest-rank p95"""
+    ordered = sorted(samples_ms)
+
+    return {
+        "name": name,
+        "number": len(ordered),
+        "repeat": 1,
+        "best_ms": ordered[0],
+        "median_ms": statistics.median(ordered),
+        "mean_ms": statistics.mean(ordered),
+        "p95_ms": ordered[max(0, math.ceil(0.95 * len(ordered)) - 1)]
+    }
+
+def report(results: List[Dict[str, Any]], json_path: Optional[str] = None):
+    """Print a results table and optionally write it to a JSON file"""
+    width = max(len(result["name"]) for result in results)
+    print(f"{'benchmark'.ljust(width)}  {'best ms':>10}  {'median ms':>10}")
+    for result in results:
+        print(f"{result['name'].ljust(width)}  {result['best_ms']:>10.3f}  {result['median_ms']:>10.3f}")
+
+    if json_path:
+        with open(json_path, "w") as f:
+            json.dump(results, f, indent=2)
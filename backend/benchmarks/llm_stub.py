@@ -0,0 +1,401 @@
+"""
+Local OpenAI-compatible LLM stub
+
+Serves ``/v1/chat/completions`` with schema-valid JSON for the AI-PM
+prompts (intent analysis, Socratic questions, RSD generation), so the
+real ``AIService`` code path can be load-tested without network access.
+Latency is drawn from configurable distributions, responses can be
+streamed token by token, and errors, hangs and truncated responses can be
+injected at given rates.
+
+Response content depends only on the prompt; latencies and injected
+faults come from one RNG seeded with ``--seed``, so a run with the same
+request sequence is reproducible.
+
+Usage:
+    python -m benchmarks.llm_stub [--port 8001] [--latency lognormal:0.4,0.5]
+        [--task-latency generate_rsd=lognormal:3,0.3] [--per-token 0.002]
+        [--token-interval 0.01] [--error-rate 0.02] [--error-status 500]
+        [--hang-rate 0.01] [--truncate-rate 0.05] [--rsd-stories 8] [--seed 0]
+
+Point the backend at it with:
+    LITELLM_MODEL=openai/stub LITELLM_API_BASE=http://127.0.0.1:8001/v1 OPENAI_API_KEY=stub
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Dict, List, Optional
+import argparse
+import asyncio
+import hashlib
+import json
+import random
+import re
+import time
+import uuid
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from app.services.prompt_budget import estimate_tokens
+
+# Markers of the AI-PM instructions, checked in order
+TASK_MARKERS = [
+    ("analyze_intent", "TASK: Analyze user input"),
+    ("generate_socratic_questions", "TASK: Generate intelligent Socratic questions"),
+    ("generate_rsd", "TASK: Generate a comprehensive Requirements Specification Document")
+]
+
+FEATURE_WORDS = [
+    "order", "inventory", "customer", "invoice", "payment", "report", "dashboard", "notification",
+    "schedule", "booking", "product", "shipment", "account", "approval", "task", "project"
+]
+
+QUESTIONS = [
+    "Who are the primary users of this system, and what are they trying to achieve?",
+    "Which workflow should the first release support end to end?",
+    "How will you measure whether this project is a success?",
+    "What data needs to be stored, and who may see or change it?",
+    "Are there deadlines, budget limits or regulations we must respect?",
+    "What should happen when something goes wrong during the main workflow?",
+    "Which existing systems does this need to exchange data with?",
+    "How many people will use the system at the same time at peak?"
+]
+
+# Seconds a hung request waits before answering, long enough to hit any deadline
+HANG_SECONDS = 600
+
+@dataclass
+class Latency:
+    """
+    Latency distribution parsed from ``kind:params``
+
+    ``fixed:S``, ``uniform:LOW,HIGH``, ``exponential:MEAN`` or
+    ``lognormal:MEDIAN,SIGMA``, all in seconds.
+    """
+    kind: str
+    params: List[float]
+
+    @classmethod
+    def parse(cls, spec: str) -> "Latency":
+        kind, _, params = spec.partition(":")
+        values = [float(value) for value in params.split(",") if value]
+        expected = {"fixed": 1, "uniform": 2, "exponential": 1, "lognormal": 2}
+        if expected.get(kind) != len(values):
+            raise ValueError(f"Invalid latency spec: {spec}")
+        return cls(kind, values)
+
+    def sample(self, rng: random.Random) -> float:
+        if self.kind == "fixed":
+            return self.params[0]
+        if self.kind == "uniform":
+            return rng.uniform(*self.params)
+        if self.kind == "exponential":
+            return rng.expovariate(1 / self.params[0]) if self.params[0] > 0 else 0.0
+        median, sigma = self.params
+        return median * rng.lognormvariate(0, sigma)
+
+@dataclass
+class StubConfig:
+    latency: Latency = field(default_factory=lambda: Latency("fixed", [0.0]))
+    task_latency: Dict[str, Latency] = field(default_factory=dict)
+    per_token: float = 0.0
+    token_interval: float = 0.0
+    error_rate: float = 0.0
+    error_status: int = 500
+    hang_rate: float = 0.0
+    truncate_rate: float = 0.0
+    rsd_stories: int = 8
+    seed: int = 0
+
+def detect_task(messages: List[Dict[str, Any]]) -> str:
+    text = "\n".join(str(message.get("content", "")) for message in messages)
+    for task, marker in TASK_MARKERS:
+        if marker in text:
+            return task
+    return "chat"
+
+def _prompt_rng(messages: List[Dict[str, Any]]) -> random.Random:
+    """RNG seeded by the prompt, so the same prompt gets the same answer"""
+    digest = hashlib.sha256(json.dumps(messages, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+    return random.Random(int(digest[:16], 16))
+
+def _features(text: str, rng: random.Random) -> List[str]:
+    lowered = text.lower()
+    found = [word for word in FEATURE_WORDS if word in lowered]
+    return found or rng.sample(FEATURE_WORDS, 3)
+
+def _user_text(messages: List[Dict[str, Any]]) -> str:
+    return "\n".join(str(m.get("content", "")) for m in messages if m.get("role") == "user")
+
+def intent_analysis(messages: List[Dict[str, Any]], rng: random.Random) -> Dict[str, Any]:
+    text = _user_text(messages)
+    match = re.search(r'USER INPUT: "(.*)"', text, re.DOTALL)
+    user_input = match.group(1) if match else text[-300:]
+    features = _features(user_input, rng)[:4]
+
+    return {
+        "intent_type": rng.choice(["functional_requirement", "user_story", "business_constraint", "non_functional_requirement"]),
+        "confidence": round(rng.uniform(0.7, 0.95), 2),
+        "semantic_analysis": {
+            "entities": [feature.capitalize() for feature in features],
+            "relationships": [f"{features[0].capitalize()} belongs to Customer"],
+            "success_criteria": [f"{features[0].capitalize()} handled without manual steps"],
+            "assumptions": ["Users access the system from a browser"]
+        },
+        "extracted_info": {
+            "summary": f"manage {', '.join(features)}",
+            "key_features": [f"{feature}_management" for feature in features],
+            "user_types": ["customer", "admin"],
+            "business_value": "Less manual work and faster turnaround",
+            "constraints": rng.sample(["mobile_compatibility", "gdpr", "three_month_timeline", "fixed_budget"], 1)
+        },
+        "completeness_score": round(rng.uniform(0.3, 0.8), 2),
+        "missing_info": rng.sample(["success metrics", "user roles", "integrations", "data retention"], 2),
+        "follow_up_questions": rng.sample(QUESTIONS, 2),
+        "next_discovery_areas": ["workflows", "constraints"]
+    }
+
+def socratic_questions(messages: List[Dict[str, Any]], rng: random.Random) -> Dict[str, Any]:
+    return {"questions": rng.sample(QUESTIONS, 3)}
+
+def rsd(messages: List[Dict[str, Any]], rng: random.Random, stories: int) -> Dict[str, Any]:
+    text = _user_text(messages)
+    match = re.search(r"^Features: (.*)$", text, re.MULTILINE)
+    features = [item.strip() for item in match.group(1).split(";")] if match else _features(text, rng)
+    features = [feature for feature in features if feature] or ["core_workflow"]
+
+    def feature(i: int) -> str:
+        return features[i % len(features)].replace("_", " ")
+
+    return {
+        "project_overview": {
+            "name": "Stub Project",
+            "description": f"A system for {', '.join(feature(i) for i in range(min(3, len(features))))}",
+            "business_context": "Replace spreadsheets and email with one system",
+            "success_vision": "Every request is handled in the system end to end"
+        },
+        "stakeholders": {
+            "primary_users": ["customer", "admin"],
+            "secondary_users": ["support"],
+            "stakeholders": ["operations"],
+            "decision_makers": ["product owner"]
+        },
+        "functional_requirements": {
+            "user_stories": [
+                {
+                    "id": f"US{i + 1:03d}",
+                    "role": rng.choice(["customer", "admin"]),
+                    "goal": f"manage {feature(i)} records",
+                    "benefit": "keep information current",
+                    "acceptance_criteria": [f"{feature(i).capitalize()} can be created", "Changes are saved"],
+                    "priority": rng.choice(["High", "Medium", "Low"])
+                }
+                for i in range(stories)
+            ],
+            "use_cases": [
+                {
+                    "id": f"UC{i + 1:03d}",
+                    "name": f"Process {feature(i)}",
+                    "description": f"A user processes a {feature(i)} from start to finish",
+                    "actors": ["customer"],
+                    "preconditions": ["User is signed in"],
+                    "main_flow": ["Open the list", "Select an item", "Submit changes"],
+                    "alternative_flows": ["Validation fails and the user corrects the input"],
+                    "postconditions": ["The change is stored"]
+                }
+                for i in range(max(1, stories // 2))
+            ],
+            "business_rules": [
+                {"id": "BR001", "rule": "Only admins can delete records", "rationale": "Audit", "impact": "Data loss"}
+            ],
+            "feature_requirements": [
+                {
+                    "feature": feature(i),
+                    "description": f"Create, view and update {feature(i)} records",
+                    "priority": "High",
+                    "dependencies": [],
+                    "acceptance_criteria": ["CRUD operations work"]
+                }
+                for i in range(len(features))
+            ]
+        },
+        "non_functional_requirements": {
+            "performance": {"response_time": "500ms", "concurrent_users": "100"},
+            "security": {"authentication": "Email and password", "authorization": "Role based"}
+        },
+        "constraints": {"technical": ["Web browser"], "business": ["Three month timeline"]},
+        "success_criteria": {"business_metrics": ["Manual work halved"]},
+        "assumptions": [{"description": "Users have internet access"}],
+        "risks": [{"description": "Scope creep", "mitigation": "Fixed first release"}],
+        "integration_requirements": []
+    }
+
+def respond(task: str, messages: List[Dict[str, Any]], config: StubConfig) -> str:
+    """Content of the answer to ``messages``"""
+    rng = _prompt_rng(messages)
+
+    if task == "analyze_intent":
+        return json.dumps(intent_analysis(messages, rng), ensure_ascii=False)
+    if task == "generate_socratic_questions":
+        return json.dumps(socratic_questions(messages, rng), ensure_ascii=False)
+    if task == "generate_rsd":
+        return json.dumps(rsd(messages, rng, config.rsd_stories), ensure_ascii=False)
+    return "Hello from the LLM stub."
+
+def create_app(config: StubConfig) -> FastAPI:
+    app = FastAPI(title="LLM stub")
+    rng = random.Random(config.seed)
+    stats: Dict[str, Dict[str, int]] = {}
+
+    def count(task: str, outcome: str):
+        task_stats = stats.setdefault(task, {})
+        task_stats[outcome] = task_stats.get(outcome, 0) + 1
+
+    async def chat_completions(request: Request):
+        body = await request.json()
+        messages = body.get("messages") or []
+        model = body.get("model", "stub")
+        task = detect_task(messages)
+        count(task, "requests")
+
+        # Draw everything random up front so concurrency does not reorder the RNG
+        latency = config.task_latency.get(task, config.latency).sample(rng)
+        fault = rng.random()
+
+        if fault < config.error_rate:
+            count(task, "errors")
+            await asyncio.sleep(latency)
+            return JSONResponse(
+                status_code=config.error_status,
+                content={"error": {"message": "Injected error", "type": "server_error", "code": config.error_status}}
+            )
+
+        if fault < config.error_rate + config.hang_rate:
+            count(task, "hangs")
+            await asyncio.sleep(HANG_SECONDS)
+
+        content = respond(task, messages, config)
+        if rng.random() < config.truncate_rate:
+            count(task, "truncated")
+            content = content[:max(1, len(content) * 2 // 3)]
+
+        max_tokens = body.get("max_tokens")
+        completion_tokens = estimate_tokens(content)
+        finish_reason = "stop"
+        if max_tokens and completion_tokens > max_tokens:
+            content = content[:max_tokens * 4]
+            completion_tokens = max_tokens
+            finish_reason = "length"
+
+        usage = {
+            "prompt_tokens": sum(estimate_tokens(str(m.get("content", ""))) + 4 for m in messages),
+            "completion_tokens": completion_tokens
+        }
+        usage["total_tokens"] = usage["prompt_tokens"] + usage["completion_tokens"]
+
+        if body.get("stream"):
+            return StreamingResponse(
+                _stream(model, content, finish_reason, latency),
+                media_type="text/event-stream"
+            )
+
+        await asyncio.sleep(latency + config.per_token * completion_tokens)
+        return {
+            "id": f"chatcmpl-{uuid.uuid4().hex}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [
+                {
+                    "index": 0,
+                    "message": {"role": "assistant", "content": content},
+                    "finish_reason": finish_reason
+                }
+            ],
+            "usage": usage
+        }
+
+    async def _stream(model: str, content: str, finish_reason: str, latency: float) -> AsyncIterator[bytes]:
+        completion_id = f"chatcmpl-{uuid.uuid4().hex}"
+        created = int(time.time())
+
+        def chunk(delta: Dict[str, Any], finish: Optional[str] = None) -> bytes:
+            payload = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": created,
+                "model": model,
+                "choices": [{"index": 0, "delta": delta, "finish_reason": finish}]
+            }
+            return f"data: {json.dumps(payload, ensure_ascii=False)}\n\n".encode("utf-8")
+
+        # Time to first token
+        await asyncio.sleep(latency)
+        yield chunk({"role": "assistant", "content": ""})
+
+        for piece in re.findall(r"\s*\S{1,8}", content):
+            if config.token_interval:
+                await asyncio.sleep(config.token_interval)
+            yield chunk({"content": piece})
+
+        yield chunk({}, finish_reason)
+        yield b"data: [DONE]\n\n"
+
+    app.add_api_route("/v1/chat/completions", chat_completions, methods=["POST"])
+    app.add_api_route("/chat/completions", chat_completions, methods=["POST"])
+
+    @app.get("/v1/models")
+    async def list_models():
+        return {"object": "list", "data": [{"id": "stub", "object": "model", "owned_by": "benchmarks"}]}
+
+    @app.get("/stats")
+    async def get_stats():
+        """Requests and injected faults per detected task"""
+        return stats
+
+    return app
+
+def parse_config(args: argparse.Namespace) -> StubConfig:
+    task_latency = {}
+    for item in args.task_latency:
+        task, _, spec = item.partition("=")
+        task_latency[task] = Latency.parse(spec)
+
+    return StubConfig(
+        latency=Latency.parse(args.latency),
+        task_latency=task_latency,
+        per_token=args.per_token,
+        token_interval=args.token_interval,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        hang_rate=args.hang_rate,
+        truncate_rate=args.truncate_rate,
+        rsd_stories=args.rsd_stories,
+        seed=args.seed
+    )
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--latency", default="fixed:0", help="Default latency distribution, e.g. lognormal:0.4,0.5")
+    parser.add_argument("--task-latency", action="append", default=[], metavar="TASK=SPEC",
+                        help="Latency distribution of one task, e.g. generate_rsd=lognormal:3,0.3")
+    parser.add_argument("--per-token", type=float, default=0.0, help="Seconds added per completion token")
+    parser.add_argument("--token-interval", type=float, default=0.0, help="Seconds between streamed chunks")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with an error")
+    parser.add_argument("--error-status", type=int, default=500)
+    parser.add_argument("--hang-rate", type=float, default=0.0, help="Fraction of requests that never answer in time")
+    parser.add_argument("--truncate-rate", type=float, default=0.0, help="Fraction of responses cut short")
+    parser.add_argument("--rsd-stories", type=int, default=8, help="User stories per generated RSD")
+    parser.add_argument("--seed", type=int, default=0)
+    return parser
+
+def main():
+    import uvicorn
+
+    args = build_parser().parse_args()
+    uvicorn.run(create_app(parse_config(args)), host=args.host, port=args.port, log_level="warning")
+
+if __name__ == "__main__":
+    main()
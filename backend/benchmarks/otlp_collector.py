@@ -0,0 +1,125 @@
+"""
+Local OTLP/HTTP trace collector stub
+
+Accepts the JSON encoding of ``POST /v1/traces`` as sent by the backend
+with ``TRACING_EXPORTER=otlp`` (or any OTLP/HTTP JSON exporter), keeps
+the spans in memory and optionally appends them to a JSONL file in the
+same shape as the backend's ``jsonl`` exporter. ``/stages`` reports the
+latency distribution of every span name, which is where a regression in
+a single stage (an LLM task, a query type, the session commit) shows up.
+
+Usage:
+    python -m benchmarks.otlp_collector [--port 4318] [--output spans.jsonl] [--max-spans 100000]
+
+Point the backend at it with:
+    TRACING_EXPORTER=otlp TRACING_OTLP_ENDPOINT=http://127.0.0.1:4318
+"""
+
+from collections import deque
+from typing import Any, Dict, List, Optional
+import argparse
+import json
+
+from fastapi import FastAPI, HTTPException, Request
+
+from benchmarks.common import summarize
+
+def _attribute_value(value: Dict[str, Any]) -> Any:
+    if "intValue" in value:
+        return int(value["intValue"])
+    for key in ("stringValue", "boolValue", "doubleValue"):
+        if key in value:
+            return value[key]
+    return None
+
+def flatten(payload: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Spans of an OTLP ``ExportTraceServiceRequest`` as flat dicts"""
+    spans = []
+
+    for resource_spans in payload.get("resourceSpans", []):
+        resource = {
+            attribute["key"]: _attribute_value(attribute["value"])
+            for attribute in resource_spans.get("resource", {}).get("attributes", [])
+        }
+        for scope_spans in resource_spans.get("scopeSpans", []):
+            for span in scope_spans.get("spans", []):
+                start, end = int(span["startTimeUnixNano"]), int(span["endTimeUnixNano"])
+                status = span.get("status", {})
+                spans.append({
+                    "trace_id": span["traceId"],
+                    "span_id": span["spanId"],
+                    "parent_id": span.get("parentSpanId") or None,
+                    "name": span["name"],
+                    "start_time_ns": start,
+                    "duration_ms": round((end - start) / 1e6, 3),
+                    "attributes": {
+                        attribute["key"]: _attribute_value(attribute["value"])
+                        for attribute in span.get("attributes", [])
+                    },
+                    "error": status.get("message") if status.get("code") == 2 else None,
+                    "service": resource.get("service.name")
+                })
+
+    return spans
+
+def create_app(output: Optional[str] = None, max_spans: int = 100000) -> FastAPI:
+    app = FastAPI(title="OTLP collector stub")
+    spans: deque = deque(maxlen=max_spans)
+
+    @app.post("/v1/traces")
+    async def receive(request: Request):
+        try:
+            received = flatten(await request.json())
+        except (ValueError, KeyError, TypeError) as e:
+            raise HTTPException(status_code=400, detail=f"Invalid OTLP payload: {e}")
+
+        spans.extend(received)
+        if output:
+            with open(output, "a", encoding="utf-8") as file:
+                for span in received:
+                    file.write(json.dumps(span, ensure_ascii=False) + "\n")
+
+        return {"partialSuccess": {}}
+
+    @app.get("/traces/{trace_id}")
+    async def get_trace(trace_id: str):
+        found = sorted((span for span in spans if span["trace_id"] == trace_id), key=lambda span: span["start_time_ns"])
+        if not found:
+            raise HTTPException(status_code=404, detail="Trace not found")
+        return found
+
+    @app.get("/stages")
+    async def stages(root: Optional[str] = None):
+        """Duration statistics per span name, optionally only within traces whose root span is ``root``"""
+        selected = list(spans)
+        if root:
+            traces = {span["trace_id"] for span in selected if span["parent_id"] is None and span["name"] == root}
+            selected = [span for span in selected if span["trace_id"] in traces]
+
+        durations: Dict[str, List[float]] = {}
+        for span in selected:
+            durations.setdefault(span["name"], []).append(span["duration_ms"])
+
+        return [summarize(name, samples) for name, samples in sorted(durations.items())]
+
+    @app.delete("/traces")
+    async def clear():
+        spans.clear()
+        return {"cleared": True}
+
+    return app
+
+def main():
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=4318)
+    parser.add_argument("--output", help="Append received spans to this JSONL file")
+    parser.add_argument("--max-spans", type=int, default=100000, help="Spans kept in memory for /stages")
+    args = parser.parse_args()
+
+    uvicorn.run(create_app(args.output, args.max_spans), host=args.host, port=args.port, log_level="warning")
+
+if __name__ == "__main__":
+    main()
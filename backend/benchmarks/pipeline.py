@@ -0,0 +1,234 @@
+"""
+End-to-end requirement-to-code benchmark
+
+Drives the whole flow through the ASGI app with httpx: create project ->
+session -> N ``/ai-pm/interact`` turns -> ``/ai-pm/generate-rsd`` ->
+``/bitcup/generate-model`` -> ``/lowcode/generate-code``. AIService talks to
+the local LLM stub (``benchmarks.llm_stub``), started on a free port in a
+background thread, and the database is a fresh SQLite file migrated to
+head. Each stage is reported with its p95 alongside the usual statistics.
+
+Microbenchmarks cover ``MemoryService.store_interaction`` at growing graph
+sizes, ``BitcupService.generate_bitcup_model`` on synthetic RSDs and code
+generation at 10/100/1000 entities, each cold (caches emptied before every
+call) and warm.
+
+Usage:
+    python -m benchmarks.pipeline [--runs 5] [--turns 8] [--concurrency 1]
+        [--stub-latency fixed:0.05] [--graph-sizes 100 250 500]
+        [--stories 100 1000] [--entities 10 100 1000] [--only flow|micro] [--json out.json]
+"""
+
+from typing import Any, Dict, List
+import argparse
+import asyncio
+import itertools
+import os
+import socket
+import tempfile
+import threading
+import time
+
+from benchmarks.common import measure_async, report, summarize
+from benchmarks.llm_stub import Latency, StubConfig, create_app
+from benchmarks.synthetic import GOALS, make_implementation_model, make_rsd
+
+# Sessions need 7 turns before an RSD may be generated
+MIN_TURNS = 7
+
+MESSAGES = [
+    "We want a portal where customers place orders and track their shipments.",
+    "Admins approve large orders and manage the product catalogue.",
+    "Customers should get an email notification when an order ships.",
+    "We need a dashboard with daily sales reports for managers.",
+    "Invoices are generated for every order and can be paid online.",
+    "The system must work on mobile phones and comply with GDPR.",
+    "Success means orders are processed in under a day without spreadsheets.",
+    "Support agents can view any order and add notes for the customer."
+]
+
+def start_stub(config: StubConfig) -> int:
+    """Serve the LLM stub on a free port in a daemon thread and return the port"""
+    import uvicorn
+
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+
+    server = uvicorn.Server(uvicorn.Config(create_app(config), host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+
+    while not server.started:
+        time.sleep(0.05)
+
+    return port
+
+def configure_environment(port: int, database_path: str):
+    """Point settings at the stub and a scratch database; must run before app modules are imported"""
+    os.environ.update({
+        "DATABASE_URL": f"sqlite:///{database_path}",
+        "DEBUG": "false",
+        "LITELLM_MODEL": "openai/stub",
+        "LITELLM_API_BASE": f"http://127.0.0.1:{port}/v1",
+        "OPENAI_API_KEY": "stub"
+    })
+
+async def run_flow(client, turns: int, timings: Dict[str, List[float]]):
+    """Take one project from its first message to generated code"""
+
+    async def call(stage: str, path: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        start = time.perf_counter()
+        response = await client.post(f"/api/v1{path}", json=payload)
+        timings.setdefault(stage, []).append((time.perf_counter() - start) * 1000)
+        response.raise_for_status()
+        return response.json()
+
+    start = time.perf_counter()
+    project = await call("create_project", "/projects/", {"name": "Benchmark shop", "description": "Orders and invoices"})
+    session = await call("create_session", "/sessions/", {"project_id": project["id"]})
+
+    for turn in range(turns):
+        await call("interact", "/ai-pm/interact", {"session_id": session["id"], "message": MESSAGES[turn % len(MESSAGES)]})
+
+    rsd = await call("generate_rsd", "/ai-pm/generate-rsd", {"session_id": session["id"]})
+    model = await call("generate_model", "/bitcup/generate-model", {"rsd_id": rsd["id"]})
+    await call("generate_code", "/lowcode/generate-code", {"bitcup_id": model["id"]})
+    timings.setdefault("total", []).append((time.perf_counter() - start) * 1000)
+
+async def bench_flow(app, runs: int, turns: int, concurrency: int) -> List[Dict[str, Any]]:
+    import httpx
+
+    timings: Dict[str, List[float]] = {}
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://benchmark", timeout=None) as client:
+        # Warm up imports, template compilation and the SQLite file
+        await run_flow(client, MIN_TURNS, {})
+
+        async def limited():
+            async with semaphore:
+                await run_flow(client, turns, timings)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(limited() for _ in range(runs)))
+        elapsed = time.perf_counter() - start
+
+    results = {stage: summarize(f"flow/{stage}", samples) for stage, samples in timings.items()}
+    results["total"]["flows_per_second"] = runs / elapsed
+    return list(results.values())
+
+def make_interaction(i: int) -> Dict[str, Any]:
+    return {
+        "project_id": f"project-{i % 10}",
+        "session_id": f"session-{i % 50}",
+        "user_id": f"user-{i % 5}",
+        "type": "requirement_gathering",
+        "user_message": f"{GOALS[i % len(GOALS)]} ({i})",
+        "ai_response": "Who else takes part in this workflow?"
+    }
+
+async def bench_memory(graph_sizes: List[int], number: int) -> List[Dict[str, Any]]:
+    from app.services.memory_service import MemoryService
+
+    results = []
+    for size in graph_sizes:
+        service = MemoryService()
+        counter = itertools.count()
+        for _ in range(size):
+            await service.store_interaction(make_interaction(next(counter)))
+
+        results.append(await measure_async(
+            f"memory/store_interaction@{size} nodes",
+            lambda: service.store_interaction(make_interaction(next(counter))),
+            number
+        ))
+
+    return results
+
+async def bench_bitcup(stories: List[int], number: int) -> List[Dict[str, Any]]:
+    from app.services.bitcup_service import bitcup_service
+
+    results = []
+    for count in stories:
+        rsd = make_rsd(stories=count, use_cases=count // 5, rules=count // 5, features=count // 5)
+
+        async def generate_cold():
+            bitcup_service.analysis_cache.clear()
+            await bitcup_service.generate_bitcup_model(rsd)
+
+        results.append(await measure_async(f"bitcup/generate_model@{count} stories/cold", generate_cold, number))
+        results.append(await measure_async(
+            f"bitcup/generate_model@{count} stories/warm",
+            lambda: bitcup_service.generate_bitcup_model(rsd),
+            number
+        ))
+
+    bitcup_service.shutdown()
+    return results
+
+async def bench_codegen(entities: List[int], number: int) -> List[Dict[str, Any]]:
+    from app.services.lowcode_service import lowcode_service
+
+    results = []
+    for count in entities:
+        model = make_implementation_model(count)
+
+        async def generate_cold():
+            lowcode_service.artifact_cache.clear()
+            await lowcode_service.generate_code_from_model(model)
+
+        results.append(await measure_async(f"codegen/{count} entities/cold", generate_cold, number))
+        results.append(await measure_async(
+            f"codegen/{count} entities/warm",
+            lambda: lowcode_service.generate_code_from_model(model),
+            number
+        ))
+
+    return results
+
+async def run(app, args: argparse.Namespace) -> List[Dict[str, Any]]:
+    results = []
+
+    if args.only in (None, "flow"):
+        results += await bench_flow(app, args.runs, args.turns, args.concurrency)
+
+    if args.only in (None, "micro"):
+        results += await bench_memory(args.graph_sizes, args.number)
+        results += await bench_bitcup(args.stories, args.number)
+        results += await bench_codegen(args.entities, args.number)
+
+    return results
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the requirement-to-code pipeline")
+    parser.add_argument("--runs", type=int, default=5, help="flows measured")
+    parser.add_argument("--turns", type=int, default=8, help=f"interactions per flow (at least {MIN_TURNS})")
+    parser.add_argument("--concurrency", type=int, default=1, help="flows in flight at once")
+    parser.add_argument("--stub-latency", default="fixed:0.05", help="LLM stub latency distribution")
+    parser.add_argument("--graph-sizes", type=int, nargs="+", default=[100, 250, 500])
+    parser.add_argument("--stories", type=int, nargs="+", default=[100, 1000])
+    parser.add_argument("--entities", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--number", type=int, default=3, help="calls per microbenchmark repeat")
+    parser.add_argument("--only", choices=["flow", "micro"])
+    parser.add_argument("--json", dest="json_path", help="write results to this JSON file")
+    args = parser.parse_args(argv)
+
+    if args.turns < MIN_TURNS:
+        parser.error(f"--turns must be at least {MIN_TURNS} for the session to reach RSD generation")
+
+    port = start_stub(StubConfig(latency=Latency.parse(args.stub_latency)))
+
+    with tempfile.TemporaryDirectory() as directory:
+        configure_environment(port, os.path.join(directory, "benchmark.db"))
+
+        from app.core import migrations
+        migrations.main(["upgrade"])
+
+        # Imported outside the event loop: AIService probes the API with its own loop
+        from app.main import app
+        results = asyncio.run(run(app, args))
+
+    report(results, args.json_path)
+
+if __name__ == "__main__":
+    main()
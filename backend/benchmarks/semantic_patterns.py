@@ -0,0 +1,52 @@
+"""
+Semantic pattern matching throughput benchmark
+
+Compares the previous per-pattern ``re.search`` loop with the compiled
+SemanticPatternEngine on the user stories of large synthetic RSDs.
+
+Usage:
+    python -m benchmarks.semantic_patterns [--stories 1000 5000] [--json out.json]
+"""
+
+import argparse
+import re
+
+from app.services.bitcup_service import bitcup_service
+from benchmarks.common import measure, report
+from benchmarks.synthetic import make_rsd
+
+def legacy_scan(text: str):
+    """Previous approach: lowercase and search once per pattern"""
+    hits = {}
+    for category, patterns in bitcup_service.semantic_patterns.items():
+        for pattern_type, pattern in patterns.items():
+            if re.search(pattern, text.lower()):
+                hits.setdefault(category, []).append(pattern_type)
+    return hits
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark semantic pattern matching")
+    parser.add_argument("--stories", type=int, nargs="+", default=[1000, 5000])
+    parser.add_argument("--number", type=int, default=5)
+    parser.add_argument("--json", dest="json_path", help="write results to this JSON file")
+    args = parser.parse_args(argv)
+
+    engine = bitcup_service.pattern_engine
+    results = []
+
+    for count in args.stories:
+        stories = make_rsd(stories=count)["functional_requirements"]["user_stories"]
+        texts = [f"{story['goal']} {story['benefit']}" for story in stories]
+
+        # Both matchers must agree before timing them
+        assert all(engine.scan(text) == legacy_scan(text) for text in texts[:200])
+
+        for name, scan in (("legacy", legacy_scan), ("engine", engine.scan)):
+            result = measure(f"{count} stories/{name}", lambda: [scan(text) for text in texts], args.number)
+            result["stories_per_second"] = count / (result["best_ms"] / 1000)
+            results.append(result)
+
+    report(results, args.json_path)
+
+if __name__ == "__main__":
+    main()
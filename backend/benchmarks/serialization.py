@@ -0,0 +1,116 @@
+"""
+Response serialization benchmark
+
+Compares the previous response path (hand-built Pydantic model, FastAPI
+revalidation against ``response_model``, ``jsonable_encoder`` and stdlib
+``json``) with ``orm_response`` on the endpoints that return large JSON
+blobs: session dialogue histories and RSD documents.
+
+Usage:
+    python -m benchmarks.serialization [--turns 200] [--stories 300] [--json out.json]
+"""
+
+from datetime import datetime
+from types import SimpleNamespace
+import argparse
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from app.api.serialization import orm_response
+from app.api.endpoints.sessions import SessionResponse
+from app.api.endpoints.ai_pm import RSDResponse
+from app.models.session import SessionStatus
+from benchmarks.common import measure, report
+
+def make_session(turns: int) -> SimpleNamespace:
+    """Build a session row with a long dialogue history"""
+    history = [
+        {
+            "timestamp": datetime.now().isoformat(),
+            "user_message": f"Turn {i}: we need customers to track orders and receive email alerts " * 3,
+            "intent_analysis": {
+                "intent_type": "functional_requirement",
+                "confidence": 0.8,
+                "extracted_info": {
+                    "summary": "Order tracking with notifications",
+                    "key_features": ["order_tracking", "notifications", "reporting"],
+                    "user_types": ["customer", "admin"],
+                    "constraints": ["mobile_compatibility"]
+                },
+                "follow_up_questions": ["Who receives alerts?", "How often are orders updated?"]
+            },
+            "metadata": {"source": "benchmark"}
+        }
+        for i in range(turns)
+    ]
+
+    return SimpleNamespace(
+        id="session-1",
+        project_id="project-1",
+        user_id="user-1",
+        status=SessionStatus.ACTIVE,
+        context={"project_name": "Benchmark", "key_features": ["order_tracking"] * 10},
+        dialogue_history=history,
+        completeness_score=0.9,
+        created_at=datetime.now(),
+        updated_at=None
+    )
+
+def make_rsd(stories: int) -> SimpleNamespace:
+    """Build an RSD row with many user stories"""
+    return SimpleNamespace(
+        id="rsd-1",
+        session_id="session-1",
+        project_id="project-1",
+        functional_requirements={
+            "user_stories": [
+                {
+                    "id": f"US{i:04d}",
+                    "role": "customer",
+                    "goal": f"view and update order {i} from the dashboard",
+                    "benefit": "keep track of my purchases",
+                    "acceptance_criteria": ["Order is listed", "Status is current", "Changes are saved"],
+                    "priority": "High"
+                }
+                for i in range(stories)
+            ]
+        },
+        non_functional_requirements={"performance": {"response_time": "200ms"}},
+        constraints={"technical": [], "business": []},
+        success_criteria={"business_metrics": []},
+        completeness_score=0.85,
+        created_at=datetime.now()
+    )
+
+def legacy_response(schema, obj):
+    """Previous path: manual model, response_model revalidation, stdlib json"""
+    values = {name: getattr(obj, name) for name in schema.model_fields}
+    if values.get("updated_at") is None and "updated_at" in values:
+        values["updated_at"] = values["created_at"]
+    model = schema(**values)
+    revalidated = schema.model_validate(model.model_dump())
+    return JSONResponse(content=jsonable_encoder(revalidated))
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark API response serialization")
+    parser.add_argument("--turns", type=int, default=200, help="dialogue turns per session")
+    parser.add_argument("--stories", type=int, default=300, help="user stories per RSD")
+    parser.add_argument("--number", type=int, default=20)
+    parser.add_argument("--json", dest="json_path", help="write results to this JSON file")
+    args = parser.parse_args(argv)
+
+    session = make_session(args.turns)
+    rsd = make_rsd(args.stories)
+
+    results = [
+        measure("session/legacy", lambda: legacy_response(SessionResponse, session), args.number),
+        measure("session/orm_response", lambda: orm_response(SessionResponse, session), args.number),
+        measure("rsd/legacy", lambda: legacy_response(RSDResponse, rsd), args.number),
+        measure("rsd/orm_response", lambda: orm_response(RSDResponse, rsd), args.number)
+    ]
+
+    report(results, args.json_path)
+
+if __name__ == "__main__":
+    main()
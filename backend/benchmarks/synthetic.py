@@ -0,0 +1,132 @@
+"""
+Synthetic Requirements Specification Documents for benchmarks
+"""
+
+from typing import Any, Dict
+import random
+
+ROLES = ["customer", "administrator", "support agent", "manager", "auditor"]
+GOALS = [
+    "create a new order record and notify the warehouse by email",
+    "view and filter the list of customer documents on the dashboard",
+    "update my profile information and validate the changes",
+    "delete obsolete files from the shared workspace",
+    "search archived records by date, status and owner",
+    "approve pending requests before they are processed",
+    "export the monthly report and share it with stakeholders",
+    "receive an alert when a scheduled task fails"
+]
+BENEFITS = [
+    "keep the process transparent for every person involved",
+    "save time when handling daily tasks",
+    "comply with the company policy and access rules",
+    "make better decisions with accurate information"
+]
+
+def make_rsd(stories: int = 100, use_cases: int = 20, rules: int = 20, features: int = 20, seed: int = 42) -> Dict[str, Any]:
+    """Build a deterministic RSD with the requested number of elements"""
+    rng = random.Random(seed)
+
+    return {
+        "project_overview": {
+            "name": "Synthetic Enterprise Platform",
+            "description": "Generated for benchmarking",
+            "business_context": "Large enterprise requirements",
+            "success_vision": "Every requirement is modeled"
+        },
+        "stakeholders": {
+            "primary_users": ROLES[:2],
+            "stakeholders": ROLES[2:],
+            "decision_makers": ["CTO"]
+        },
+        "functional_requirements": {
+            "user_stories": [
+                {
+                    "id": f"US{i:05d}",
+                    "role": rng.choice(ROLES),
+                    "goal": f"{rng.choice(GOALS)} for item {i}",
+                    "benefit": rng.choice(BENEFITS),
+                    "acceptance_criteria": [f"Criterion {i}.{j}" for j in range(3)],
+                    "priority": rng.choice(["High", "Medium", "Low"])
+                }
+                for i in range(stories)
+            ],
+            "use_cases": [
+                {
+                    "id": f"UC{i:05d}",
+                    "name": f"Use case {i}",
+                    "actors": rng.sample(ROLES, 2),
+                    "preconditions": ["User is authenticated"],
+                    "main_flow": ["Open the page", "Fill in the form", "Submit", "System confirms"],
+                    "alternative_flows": ["Validation fails", "Session expires"]
+                }
+                for i in range(use_cases)
+            ],
+            "business_rules": [
+                {
+                    "id": f"BR{i:05d}",
+                    "rule": f"Orders above limit {i} require manager approval",
+                    "rationale": "Financial control",
+                    "impact": "Unapproved spending"
+                }
+                for i in range(rules)
+            ],
+            "feature_requirements": [
+                {
+                    "feature": f"{rng.choice(['Order form', 'Report page', 'Notification engine', 'Search service'])} {i}",
+                    "description": "Synthetic feature",
+                    "priority": "Medium",
+                    "dependencies": [],
+                    "acceptance_criteria": ["Works as specified"]
+                }
+                for i in range(features)
+            ]
+        },
+        "non_functional_requirements": {"performance": {"response_time": "200ms"}},
+        "constraints": {"technical": [], "business": [], "regulatory": []},
+        "success_criteria": {"metrics": [], "acceptance_tests": [], "business_outcomes": []}
+    }
+
+FIELD_TYPES = ["string", "integer", "float", "boolean", "datetime", "text"]
+
+def make_implementation_model(entities: int, seed: int = 42) -> Dict[str, Any]:
+    """Build a deterministic BITCUP implementation spec with ``entities`` models, endpoints and components"""
+    rng = random.Random(seed)
+    names = [f"Entity{i:04d}" for i in range(entities)]
+
+    return {
+        "metadata": {"version": "1.0", "source": "benchmark"},
+        "data_model": {
+            "models": [
+                {
+                    "name": name,
+                    "fields": [
+                        {"name": f"field_{j}", "type": rng.choice(FIELD_TYPES), "nullable": j > 0}
+                        for j in range(6)
+                    ],
+                    "relationships": [
+                        {"name": f"{names[i - 1].lower()}_id", "model": names[i - 1], "type": "many_to_one"}
+                    ] if i else []
+                }
+                for i, name in enumerate(names)
+            ]
+        },
+        "api_specification": {
+            "endpoints": [
+                {"name": f"{name.lower()}_{method.lower()}", "path": f"/{name.lower()}s", "method": method}
+                for name in names
+                for method in ("GET", "POST")
+            ]
+        },
+        "user_interface": {
+            "components": [
+                {
+                    "name": f"{name}List",
+                    "description": f"List and edit {name} records",
+                    "data_elements": [f"field_{j}" for j in range(3)],
+                    "behaviors": ["create", "update", "delete"]
+                }
+                for name in names
+            ]
+        }
+    }
@@ -0,0 +1,112 @@
+"""
+Code template rendering benchmark
+
+Renders thousands of backend models, SQL schemas and Vue components with
+the compiled template packs, and compares models against the previous
+``str.format`` templates (Vue components could not be rendered with
+``str.format`` at all because of their literal braces).
+
+Usage:
+    python -m benchmarks.templates [--artifacts 5000] [--json out.json]
+"""
+
+import argparse
+
+from app.services.code_templates import code_template_engine
+from benchmarks.common import measure, report
+
+# Model template as previously embedded in LowCodeService
+LEGACY_MODEL_TEMPLATE = """
+from sqlalchemy import Column, String, Integer, Float, Boolean, ForeignKey, DateTime, Text, JSON
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+from app.core.database import Base
+import uuid
+
+class {model_name}(Base):
+    __tablename__ = "{table_name}"
+    
+    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    {model_fields}
+    created_at = Column(DateTime, server_default=func.now())
+    updated_at = Column(DateTime, onupdate=func.now())
+    
+    {model_relationships}
+"""
+
+FIELDS = ["title = Column(String, nullable=True)", "count = Column(Integer, nullable=False)"]
+RELATIONSHIPS = ["owner_id = Column(String, ForeignKey(\"users.id\"))", "owner = relationship(\"User\")"]
+
+def render_legacy_models(count: int):
+    return [
+        LEGACY_MODEL_TEMPLATE.format(
+            model_name=f"Entity{i}",
+            table_name=f"entity{i}s",
+            model_fields="\n    ".join(FIELDS),
+            model_relationships="\n    ".join(RELATIONSHIPS)
+        )
+        for i in range(count)
+    ]
+
+def render_models(count: int):
+    return [
+        code_template_engine.render(
+            "fastapi",
+            "model",
+            model_name=f"Entity{i}",
+            table_name=f"entity{i}s",
+            model_fields=FIELDS,
+            model_relationships=RELATIONSHIPS
+        )
+        for i in range(count)
+    ]
+
+def render_schemas(count: int):
+    return [
+        code_template_engine.render(
+            "postgresql",
+            "schema",
+            table_name=f"entity{i}s",
+            table_fields=["title VARCHAR(255) NULL", "count INTEGER NOT NULL"],
+            table_indexes=[f"CREATE INDEX IF NOT EXISTS idx_entity{i}s_title ON entity{i}s(title);"]
+        )
+        for i in range(count)
+    ]
+
+def render_components(count: int):
+    return [
+        code_template_engine.render(
+            "vue",
+            "component",
+            component_name=f"component_{i}",
+            component_title=f"Component {i}",
+            component_content=f"<!-- Content for component_{i} -->",
+            component_props="// Props go here",
+            component_data="// Data properties go here",
+            component_methods="// Methods go here",
+            component_styles="/* Styles go here */"
+        )
+        for i in range(count)
+    ]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark code template rendering")
+    parser.add_argument("--artifacts", type=int, default=5000, help="artifacts rendered per run")
+    parser.add_argument("--number", type=int, default=5)
+    parser.add_argument("--json", dest="json_path", help="write results to this JSON file")
+    args = parser.parse_args(argv)
+
+    count = args.artifacts
+    assert render_models(1) == render_legacy_models(1)
+
+    results = [
+        measure(f"{count} models/str.format", lambda: render_legacy_models(count), args.number),
+        measure(f"{count} models/compiled", lambda: render_models(count), args.number),
+        measure(f"{count} schemas/compiled", lambda: render_schemas(count), args.number),
+        measure(f"{count} vue components/compiled", lambda: render_components(count), args.number)
+    ]
+
+    report(results, args.json_path)
+
+if __name__ == "__main__":
+    main()
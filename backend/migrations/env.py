@@ -0,0 +1,64 @@
+"""
+Alembic migration environment wired to the async SQLAlchemy engine
+"""
+
+import asyncio
+from logging.config import fileConfig
+
+from alembic import context
+from sqlalchemy import pool
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core.database import Base, async_database_url, import_models
+
+config = context.config
+
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name)
+
+# Register every model on Base.metadata for autogenerate
+import_models()
+target_metadata = Base.metadata
+
+def _configure_options() -> dict:
+    """Options shared by offline and online migrations"""
+    return {
+        "target_metadata": target_metadata,
+        "compare_type": True,
+        # SQLite cannot ALTER most column properties in place
+        "render_as_batch": async_database_url.startswith("sqlite"),
+    }
+
+def run_migrations_offline() -> None:
+    """Emit migration SQL without a database connection"""
+    context.configure(
+        url=async_database_url,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+        **_configure_options()
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+def do_run_migrations(connection: Connection) -> None:
+    """Run migrations on a sync connection proxied from the async engine"""
+    context.configure(connection=connection, **_configure_options())
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+async def run_migrations_online() -> None:
+    """Run migrations against the configured async database"""
+    connectable = create_async_engine(async_database_url, poolclass=pool.NullPool)
+
+    async with connectable.connect() as connection:
+        await connection.run_sync(do_run_migrations)
+
+    await connectable.dispose()
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    asyncio.run(run_migrations_online())